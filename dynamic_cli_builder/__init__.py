@@ -2,34 +2,92 @@
 
 Expose the high-level :pyfunc:`run_builder` helper that glues together
 configuration loading, CLI construction and command execution.
+
+The re-exported names are imported on first access, so light entry points
+such as the zygote client (:pymod:`dynamic_cli_builder.zygote`) do not pay
+for importing the builder.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Callable
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Callable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dynamic_cli_builder.cli import build_cli, execute_command  # noqa: F401
+    from dynamic_cli_builder.loader import load_config  # noqa: F401
+    from dynamic_cli_builder.spec import ArgSpec, CommandSpec, ConfigSpec, compile_config  # noqa: F401
+
+_EXPORTS = {
+    "build_cli": "dynamic_cli_builder.cli",
+    "execute_command": "dynamic_cli_builder.cli",
+    "load_config": "dynamic_cli_builder.loader",
+    "ArgSpec": "dynamic_cli_builder.spec",
+    "CommandSpec": "dynamic_cli_builder.spec",
+    "ConfigSpec": "dynamic_cli_builder.spec",
+    "compile_config": "dynamic_cli_builder.spec",
+}
+
 
-from dynamic_cli_builder.cli import build_cli, execute_command
-from dynamic_cli_builder.loader import load_config
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 
-def run_builder(config_path: str, ACTIONS: Dict[str, Callable[..., Any]]) -> None:
+def run_builder(
+    config_path: str | Dict[str, Any] | ConfigSpec | None,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    parser: str = "argparse",
+    resources: Dict[str, Callable[..., Any]] | None = None,
+) -> Any:
     """Entry point for quickly wiring the builder into a script.
 
     Parameters
     ----------
-    config_path : str
-        Path to YAML/JSON configuration describing the CLI structure.
+    config_path : str | dict | ConfigSpec | None
+        Path to YAML/JSON configuration describing the CLI structure, or an
+        already loaded config (dicts are validated, specs used as-is).
     ACTIONS : dict[str, Callable[..., Any]]
         Mapping of *action name* to callable implementing the logic.
+    parser : {"argparse", "fast"}
+        Parser engine; ``"fast"`` parses straight from the compiled config
+        and falls back to ``argparse`` for help and errors.
+    resources : dict[str, Callable[..., Any]], optional
+        ``RESOURCES`` factories; installed as the process-wide pool so that
+        actions receive them by parameter name.
+
+    Returns
+    -------
+    Any
+        Whatever the executed action returned.
     """
-    # Load the YAML configuration
-    config = load_config(config_path)
+    from dynamic_cli_builder.builder import execute_command
+    from dynamic_cli_builder.fastparse import make_parser
+    from dynamic_cli_builder.loader import _validate_config_structure, load_config
+    from dynamic_cli_builder.resources import use_resources
+    from dynamic_cli_builder.spec import ConfigSpec, compile_config
+
+    # Load the YAML configuration and compile it once for the hot paths
+    if isinstance(config_path, ConfigSpec):
+        config = config_path
+    elif isinstance(config_path, dict):
+        _validate_config_structure(config_path)
+        config = compile_config(config_path)
+    else:
+        config = compile_config(load_config(config_path))
     
     # Build the CLI
-    parser = build_cli(config)
+    cli = make_parser(config, parser)
     
     # Parse the CLI arguments
-    parsed_args = parser.parse_args()
+    parsed_args = cli.parse_args()
     
+    if resources:
+        use_resources(resources)
+
     # Execute the appropriate command
-    execute_command(parsed_args, config, ACTIONS)
\ No newline at end of file
+    return execute_command(parsed_args, config, ACTIONS)
@@ -22,16 +22,35 @@ from __future__ import annotations
 
 import argparse
 import importlib.util
+import os
+import signal
 import sys
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
 
 from dynamic_cli_builder import run_builder
-from dynamic_cli_builder.generator import generate_config, dump_config
+from dynamic_cli_builder.batch import run_batch
+from dynamic_cli_builder.builder import build_cli
+from dynamic_cli_builder.bundle import Bundle, build_bundle, load_bundle
+from dynamic_cli_builder.distributed import run_coordinator, run_worker
+from dynamic_cli_builder.fastparse import PARSER_ENGINES
+from dynamic_cli_builder.generator import IncrementalGenerator, dump_config, generate_config, load_module
+from dynamic_cli_builder.journal import Journal, default_journal_path
+from dynamic_cli_builder.helpcache import _VALUE_FLAGS, HelpCache, command_from_argv, render_command_help, render_help
+from dynamic_cli_builder.loader import find_config, load_config
+from dynamic_cli_builder.output import OUTPUT_FORMATS, write_result
+from dynamic_cli_builder.pipeline import PIPE, run_pipeline, split_pipeline
+from dynamic_cli_builder.profiling import TRACKER, format_summary
+from dynamic_cli_builder.resources import use_resources
+from dynamic_cli_builder.shell import run_shell
+from dynamic_cli_builder.spec import ConfigSpec, compile_config
+from dynamic_cli_builder.sweep import SWEEP_MODES, parse_sweep, run_sweep
+from dynamic_cli_builder.zygote import serve_zygote
 
 
-def _import_actions(path: Path) -> Dict[str, Any]:
+def _import_actions(path: Path) -> ModuleType:
+    """Import the actions module, which must define ``ACTIONS`` (and may define ``RESOURCES``)."""
     if not path.exists():
         raise FileNotFoundError(f"Actions file not found: {path}")
 
@@ -42,27 +61,131 @@ def _import_actions(path: Path) -> Dict[str, Any]:
     module = ModuleType("actions")
     spec.loader.exec_module(module)  # type: ignore[arg-type]
 
-    try:
-        return getattr(module, "ACTIONS")
-    except AttributeError as exc:
+    if not hasattr(module, "ACTIONS"):
         raise AttributeError(
             f"{path} must define a top-level 'ACTIONS' dictionary"
-        ) from exc
+        )
+    return module
 
 
-def _import_module(path: Path) -> ModuleType:
-    if not path.exists():
-        raise FileNotFoundError(f"Module file not found: {path}")
-    spec = importlib.util.spec_from_file_location("actions", str(path))
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Unable to import module at {path}")
-    module = ModuleType("actions")
-    spec.loader.exec_module(module)  # type: ignore[arg-type]
-    return module
+def _actions(args: argparse.Namespace, bundle: Optional[Bundle]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """``ACTIONS`` and ``RESOURCES`` from the bundle, or from ``--actions``."""
+    if bundle is not None:
+        return bundle.actions, bundle.resources
+    module = _import_actions(Path(args.actions).resolve())
+    return module.ACTIONS, getattr(module, "RESOURCES", None)
+
+
+def _load(args: argparse.Namespace, bundle: Optional[Bundle]) -> ConfigSpec:
+    """Compile the bundled config, or load ``--config`` from disk."""
+    if bundle is not None:
+        return compile_config(bundle.config)
+    return compile_config(load_config(args.config))
+
+
+def _run_batch_file(args: argparse.Namespace, run: Callable[[TextIO, TextIO, Optional[Journal]], int]) -> None:
+    """Open ``--batch``, its report and journal, call ``run(source, report, journal)`` and exit on failures."""
+    journal_path = args.journal or default_journal_path(args.batch)
+    if args.resume and journal_path is None:
+        raise ValueError("--resume needs --journal when the batch is read from stdin")
+    journal = Journal(journal_path, resume=args.resume) if journal_path is not None else None
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    try:
+        if args.batch_report == "-":
+            failures = run(source, sys.stdout, journal)
+        else:
+            mode = "a" if args.resume else "w"
+            with open(args.batch_report, mode, encoding="utf-8") as report:
+                failures = run(source, report, journal)  # type: ignore[arg-type]
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if journal is not None:
+            journal.close()
+    _memory_summary()
+    if failures:
+        sys.exit(1)
+
+
+def _memory_summary() -> None:
+    """After repeated invocations, show per-action RSS growth if ``--memprofile`` was used."""
+    if TRACKER:
+        print(format_summary(), file=sys.stderr)
+
+
+def _print_help(args: argparse.Namespace, tokens: list[str], runner: argparse.ArgumentParser, bundle: Optional[Bundle]) -> None:
+    """Print ``--help`` for the command in *tokens* (or the top level) from pre-rendered text.
+
+    Outside a bundle, top-level ``--help`` describes the runner options.
+    """
+    command = command_from_argv(tokens)
+    if bundle is None and command is None:
+        runner.print_help()
+        return
+    prog = os.path.basename(sys.argv[0])
+    if bundle is not None:
+        text = bundle.help_text(command, prog)
+        if text is None:
+            spec = _load(args, bundle)
+            text = render_help(spec, prog) if command is None else render_command_help(spec, command, prog)
+    else:
+        text = HelpCache(find_config(args.config)).get(command, prog)
+    if text is None:
+        # Unknown command: argparse reports it (and exits)
+        build_cli(_load(args, bundle)).parse_args([*tokens, "--help"])
+    sys.stdout.write(text)  # type: ignore[arg-type]
+
+
+def _split_argv(runner: argparse.ArgumentParser, tokens: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Split *tokens* into the runner's options and the command line.
+
+    Runner options are only read before the command word, so a command
+    argument that shares a runner option's name (``run --batch 5``) reaches
+    the command. The CLI's own global options (``-v DEBUG``) may be mixed in
+    with them and stay on the command line.
+    """
+    options = runner._option_string_actions
+    own: List[str] = []
+    rest: List[str] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token[:1] != "-" or token in ("-", "--"):
+            break
+        action = options.get(token)
+        if action is not None:
+            own.append(token)
+            if action.nargs != 0 and i + 1 < len(tokens):
+                i += 1
+                own.append(tokens[i])
+        else:
+            # --name=value, or a short option with its value attached (-cFILE)
+            action = options.get(token.partition("=")[0] if token[:2] == "--" else token[:2])
+            if action is not None and (token[:2] == "--" or action.nargs != 0):
+                own.append(token)
+            else:
+                rest.append(token)
+                if token in _VALUE_FLAGS and i + 1 < len(tokens):
+                    i += 1
+                    rest.append(tokens[i])
+        i += 1
+    return own, rest + list(tokens[i:])
+
+
+def _help_requested(tokens: Sequence[str]) -> bool:
+    """Whether the command line asks for ``--help`` (argparse honours it anywhere before ``--``)."""
+    for token in tokens:
+        if token == "--":
+            return False
+        if token in ("-h", "--help"):
+            return True
+    return False
 
 
 def main(argv: list[str] | None = None) -> None:  # noqa: D401
-    parser = argparse.ArgumentParser(description="Run Dynamic CLI Builder")
+    parser = argparse.ArgumentParser(description="Run Dynamic CLI Builder", add_help=False, allow_abbrev=False)
+    # Handled by _print_help so that `COMMAND --help` reaches the command's help
+    parser.add_argument("-h", "--help", action="store_true", help="show this help message and exit")
     parser.add_argument(
         "--config", "-c", type=str, default=None, 
         help="Path to config file (default: looks for config.yaml, config.yml, or config.json in current directory)"
@@ -83,40 +206,211 @@ def main(argv: list[str] | None = None) -> None:  # noqa: D401
         "--output", "-o", default="-",
         help="Output path for generated config (default: '-' for stdout)"
     )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="With --generate --output FILE: regenerate the file whenever the actions change"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Validate the config against the schema, report every error and exit"
+    )
+    parser.add_argument(
+        "--shell", action="store_true",
+        help="Start an interactive shell that loads config and actions once and runs commands in a loop"
+    )
+    parser.add_argument(
+        "--bundle", metavar="OUTPUT",
+        help="Write a single-file zipapp with the package, compiled actions and pre-parsed config"
+    )
+
+    parser.add_argument(
+        "--sweep", action="append", metavar="NAME=V1,V2",
+        help="Run the command once per value combination of the swept argument (repeatable)"
+    )
+    parser.add_argument(
+        "--sweep-mode", choices=SWEEP_MODES, default="product",
+        help="Combine swept values as a cartesian product or zip them position-wise"
+    )
+    parser.add_argument(
+        "--sweep-jobs", type=int, default=4, metavar="N",
+        help="Maximum number of sweep combinations running concurrently (default: 4)"
+    )
+    parser.add_argument(
+        "--sweep-report", default="-", metavar="PATH",
+        help="JSON-lines report of sweep results (default: '-' for stdout)"
+    )
+
+    parser.add_argument(
+        "--batch", metavar="FILE",
+        help="Run one command line per line of FILE ('-' for stdin) under the configured schedule policies"
+    )
+    parser.add_argument(
+        "--batch-jobs", type=int, default=4, metavar="N",
+        help="Worker threads shared by all batch commands (default: 4)"
+    )
+    parser.add_argument(
+        "--batch-report", default="-", metavar="PATH",
+        help="JSON-lines report of batch results (default: '-' for stdout)"
+    )
+    parser.add_argument(
+        "--journal", metavar="PATH",
+        help="Append-only progress journal for --batch (default: FILE.journal; none for stdin)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip batch lines the journal records as completed"
+    )
+
+    parser.add_argument(
+        "--coordinator", metavar="ADDRESS",
+        help="Serve the --batch lines to workers listening on HOST:PORT or unix:PATH instead of running them"
+    )
+    parser.add_argument(
+        "--worker", metavar="ADDRESS",
+        help="Run batch lines pulled from the coordinator at HOST:PORT or unix:PATH (uses --batch-jobs threads)"
+    )
+
+    parser.add_argument(
+        "--zygote", metavar="unix:PATH",
+        help="Serve invocations from a pre-warmed fork server; run commands with "
+        "'python -m dynamic_cli_builder.zygote unix:PATH COMMAND ...'"
+    )
+    parser.add_argument(
+        "--preload", action="store_true",
+        help="With --zygote, import the actions once in the server instead of in every child"
+    )
+
+    parser.add_argument(
+        "--parser", choices=PARSER_ENGINES, default="argparse",
+        help="Command-line parser engine: argparse, or the spec-driven fast parser (same syntax and errors)"
+    )
+    parser.add_argument(
+        "--stream", choices=OUTPUT_FORMATS, default=None,
+        help="Write the action's return value to stdout; iterables/generators are streamed row by row"
+    )
+
+    # Inside a bundle the config and actions come from the archive
+    try:
+        bundle = load_bundle()
+    except (ImportError, AttributeError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
 
     # If no arguments are provided, show help
     if len(sys.argv) == 1 and (argv is None or len(argv) == 0):
-        parser.print_help()
+        _print_help(parser.parse_args([]), [], parser, bundle)
         sys.exit(0)
 
-    args, unknown = parser.parse_known_intermixed_args(argv)
+    own, unknown = _split_argv(parser, sys.argv[1:] if argv is None else argv)
+    args = parser.parse_args(own)
 
     try:
-        actions_path = Path(args.actions).resolve()
+        if args.help or _help_requested(unknown):
+            _print_help(args, unknown, parser, bundle)
+            return
+
+        if args.bundle:
+            output = build_bundle(args.bundle, args.config, args.actions)
+            print(f"Bundle written to {output}")
+            return
+
+        if args.check:
+            config = _load(args, bundle)
+            print(f"OK: {len(config)} command(s)")
+            return
+
+        if args.coordinator:
+            if not args.batch:
+                raise ValueError("--coordinator needs --batch FILE")
+            # The coordinator never runs actions: workers load config and ACTIONS
+            _run_batch_file(args, lambda source, report, journal: run_coordinator(source, args.coordinator, report, journal))
+            return
+
+        if args.zygote:
+            # Children run in the client's directory
+            args.actions = str(Path(args.actions).resolve())
+            try:
+                serve_zygote(args.zygote, _load(args, bundle), lambda: _actions(args, bundle), args.preload, args.parser)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if args.watch and (not args.generate or args.output == "-"):
+            raise ValueError("--watch needs --generate --output FILE")
 
         if args.generate:
-            module = _import_module(actions_path)
-            actions_mapping = getattr(module, "ACTIONS", None)
-            cfg = generate_config(module, actions_mapping)
-            content = dump_config(cfg, args.format)
             if args.output == "-":
-                print(content)
+                module, _ = load_module(Path(args.actions).resolve())
+                print(dump_config(generate_config(module, getattr(module, "ACTIONS", None)), args.format))
+                return
+            # Only changed functions are introspected; hand edits of the output are kept
+            generator = IncrementalGenerator(args.actions, args.output, args.format)
+            if not args.watch:
+                generator.run()
+                return
+            try:
+                generator.watch()
+            except KeyboardInterrupt:
+                pass
+            return
+
+        actions_mapping, resources = _actions(args, bundle)
+        # Shared by every invocation of this process; torn down at exit
+        use_resources(resources)
+        if args.shell:
+            run_shell(_load(args, bundle), actions_mapping)
+            _memory_summary()
+            return
+
+        if args.sweep:
+            sweep = parse_sweep(args.sweep)
+            config = _load(args, bundle)
+            if args.sweep_report == "-":
+                failures = run_sweep(unknown, sweep, config, actions_mapping, sys.stdout, args.sweep_mode, args.sweep_jobs)
             else:
-                Path(args.output).write_text(content, encoding="utf-8")
+                with open(args.sweep_report, "w", encoding="utf-8") as report:
+                    failures = run_sweep(unknown, sweep, config, actions_mapping, report, args.sweep_mode, args.sweep_jobs)
+            _memory_summary()
+            if failures:
+                sys.exit(1)
+            return
+
+        if args.worker:
+            run_worker(args.worker, _load(args, bundle), actions_mapping, args.batch_jobs, args.parser)
+            _memory_summary()
+            return
+
+        if args.batch:
+            config = _load(args, bundle)
+            _run_batch_file(
+                args,
+                lambda source, report, journal: run_batch(
+                    source, config, actions_mapping, report, args.batch_jobs, journal, args.parser
+                ),
+            )
+            return
+
+        if PIPE in unknown:
+            result = run_pipeline(split_pipeline(unknown), _load(args, bundle), actions_mapping)
+            write_result(result, args.stream or "text")
             return
 
-        actions_mapping = _import_actions(actions_path)
         # Pass through any additional CLI args to the command
         if unknown and unknown[0] not in ["--help", "-h"]:
             # If there's a command, pass it through
             sys.argv = [sys.argv[0], *unknown]
-            run_builder(args.config, actions_mapping)
+            result = run_builder(_load(args, bundle), actions_mapping, args.parser)
+            if args.stream:
+                write_result(result, args.stream)
         else:
             # If no command provided, show help
-            parser.print_help()
+            _print_help(args, [], parser, bundle)
             sys.exit(0)
 
-    except (FileNotFoundError, ImportError, AttributeError, ValueError) as e:
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into `head`): exit like a SIGPIPE'd process
+        sys.exit(128 + getattr(signal, "SIGPIPE", 13))
+    except (FileNotFoundError, ImportError, AttributeError, ValueError, ConnectionError) as e:
         print(f"Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
 
@@ -0,0 +1,131 @@
+"""Batch execution: run many command lines in one process.
+
+``dcb --batch jobs.txt`` reads one command line per line (``#`` comments and
+blank lines are skipped; ``-`` reads stdin), parses each with the built CLI
+and hands them to the :class:`~dynamic_cli_builder.scheduler.Scheduler`, which
+applies the per-command ``schedule`` policies. One JSON object per line is
+written to the report as each invocation finishes (JSON lines).
+
+With a :class:`~dynamic_cli_builder.journal.Journal` every finished line is
+also journaled, and lines the journal already records as completed are
+skipped, so an interrupted run can be resumed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import shlex
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from dynamic_cli_builder.fastparse import make_parser
+from dynamic_cli_builder.journal import Journal
+from dynamic_cli_builder.scheduler import Outcome, Scheduler
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["run_batch"]
+
+
+def _write(report: TextIO, entry: Dict[str, Any]) -> None:
+    report.write(json.dumps(entry, default=str) + "\n")
+
+
+def _numbered(lines: Iterable[str], journal: Optional[Journal], skipped: Counter) -> Iterator[Tuple[int, str]]:
+    """``(line number, text)`` of every line to run; counts journal skips in ``skipped["journal"]``."""
+    for index, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if journal is not None and journal.done(index, line):
+            skipped["journal"] += 1
+            continue
+        yield index, line
+
+
+def _parse_line(cli: Any, line: str) -> Tuple[Optional[argparse.Namespace], Optional[str]]:
+    """Parse one batch line; return the namespace or the error to report."""
+    try:
+        return cli.parse_args(shlex.split(line)), None
+    except (SystemExit, ValueError) as exc:
+        # argparse has already printed the reason to stderr
+        return None, "invalid command line" if isinstance(exc, SystemExit) else str(exc)
+
+
+def _outcome_entry(outcome: Outcome) -> Dict[str, Any]:
+    """Report fields describing *outcome* (everything but ``index`` and ``line``)."""
+    entry: Dict[str, Any] = {"status": outcome.status}
+    if outcome.error is None:
+        entry["result"] = outcome.result
+    else:
+        entry["error"] = f"{type(outcome.error).__name__}: {outcome.error}"
+    entry.update(attempts=outcome.attempts, elapsed_ms=round(outcome.elapsed_ms, 3))
+    return entry
+
+
+def run_batch(
+    lines: Iterable[str],
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    report: TextIO,
+    jobs: int = 4,
+    journal: Optional[Journal] = None,
+    parser: str = "argparse",
+) -> int:
+    """Run every command line in *lines* through the scheduler.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Command lines (``COMMAND --arg value ...``), read lazily.
+    report : TextIO
+        Receives ``{"index", "line", "status", "result"|"error", "attempts",
+        "elapsed_ms"}`` per invocation in completion order; ``index`` is the
+        1-based line number.
+    jobs : int
+        Worker threads shared by all commands.
+    journal : Journal, optional
+        Records every finished line; lines it already lists as completed are
+        skipped without being parsed.
+    parser : {"argparse", "fast"}
+        Parser engine used for every line.
+
+    Returns
+    -------
+    int
+        Number of lines that failed to parse or whose action raised.
+    """
+    spec = as_spec(config)
+    cli = make_parser(spec, parser)
+    scheduler = Scheduler(spec, ACTIONS, jobs)
+    failures = 0
+    skipped: Counter = Counter()
+    texts: Dict[int, str] = {}
+
+    def _parsed() -> Iterator[Tuple[int, argparse.Namespace]]:
+        nonlocal failures
+        for index, line in _numbered(lines, journal, skipped):
+            parsed_args, message = _parse_line(cli, line)
+            if parsed_args is None:
+                failures += 1
+                _write(report, {"index": index, "line": line, "status": "error", "error": message, "attempts": 0})
+                if journal is not None:
+                    journal.record(index, line, "error")
+                continue
+            texts[index] = line
+            yield index, parsed_args
+
+    for outcome in scheduler.run(_parsed()):
+        line = texts.pop(outcome.key)
+        if journal is not None:
+            journal.record(outcome.key, line, outcome.status, outcome.result)
+        if outcome.error is not None:
+            failures += 1
+        _write(report, {"index": outcome.key, "line": line, **_outcome_entry(outcome)})
+    report.flush()
+    if skipped:
+        logger.info("Skipped %d line(s) already completed according to the journal", skipped["journal"])
+    logger.info("Batch finished with %d failure(s)", failures)
+    return failures
@@ -3,127 +3,131 @@ from __future__ import annotations
 
 import argparse
 import logging
-from typing import Any, Dict, Callable, Callable as _Callable
-
-import json
+import sys
+from typing import Any, Callable, Container, Dict, Optional, Tuple
 
+from dynamic_cli_builder.logconfig import LOG_FORMATS, configure_logging
+from dynamic_cli_builder.profiling import format_report, memory_profile
+from dynamic_cli_builder.resources import ResourcePool, current_pool
+from dynamic_cli_builder.spec import CommandSpec, ConfigSpec, as_spec, _str2bool, _type_converter  # noqa: F401
 from dynamic_cli_builder.validators import validate_arg
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["build_cli", "prompt_for_missing_args", "execute_command", "configure_logging"]
-
-
-def configure_logging(level: str = "WARNING") -> None:
-    """Configure root logger according to *level* string."""
-    logging.basicConfig(level=getattr(logging, level), format="%(asctime)s - %(levelname)s - %(message)s")
-
-def _str2bool(val: str) -> bool:
-    truthy = {"1", "true", "t", "yes", "y", "on"}
-    falsy = {"0", "false", "f", "no", "n", "off"}
-    v = val.strip().lower()
-    if v in truthy:
-        return True
-    if v in falsy:
-        return False
-    raise argparse.ArgumentTypeError(f"Invalid boolean value: {val}")
-
-
-def _type_converter(type_name: str) -> _Callable[[str], Any]:
-    """Return a safe converter function for a configured type name."""
-    mapping: Dict[str, _Callable[[str], Any]] = {
-        "str": str,
-        "int": int,
-        "float": float,
-        "bool": _str2bool,
-        # For complex types, expect JSON literals (e.g. '[1,2]' or '{"a":1}')
-        "json": lambda s: json.loads(s),
-        "list": lambda s: json.loads(s),
-        "dict": lambda s: json.loads(s),
-    }
-    return mapping.get(type_name, str)
-
-
-def build_cli(config: Dict[str, Any]) -> argparse.ArgumentParser:
-    """Construct an `argparse.ArgumentParser` based on *config*."""
-    parser = argparse.ArgumentParser(description=config.get("description", "Dynamic CLI"))
-    parser.add_argument("-log", action="store_true", help="(Deprecated) enable INFO logging")
-    parser.add_argument("-v", "--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], default="WARNING", help="Set log verbosity level")
-    parser.add_argument("-im", action="store_true", help="Enable Interactive Mode")
+__all__ = ["GLOBAL_OPTIONS", "add_command_arguments", "build_cli", "build_command_cli", "prompt_for_missing_args", "execute_command", "configure_logging"]
+
+# Options accepted before the command name, as ``add_argument`` parameters.
+# ``fastparse.FastParser`` reads the same table.
+GLOBAL_OPTIONS: Tuple[Tuple[Tuple[str, ...], Dict[str, Any]], ...] = (
+    (("-log",), {"action": "store_true", "help": "(Deprecated) enable INFO logging"}),
+    (
+        ("-v", "--log-level"),
+        {"choices": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], "default": "WARNING", "help": "Set log verbosity level"},
+    ),
+    (("--log-format",), {"choices": LOG_FORMATS, "default": "text", "help": "Log record format (json for structured logs)"}),
+    (("--log-queue",), {"action": "store_true", "help": "Write logs from a background thread instead of the calling thread"}),
+    (("-im",), {"action": "store_true", "help": "Enable Interactive Mode"}),
+    (("--memprofile",), {"action": "store_true", "help": "Report peak memory, RSS and top allocation sites of the action"}),
+)
+
+
+def build_cli(config: Dict[str, Any] | ConfigSpec) -> argparse.ArgumentParser:
+    """Construct an `argparse.ArgumentParser` based on *config* (dict or :class:`ConfigSpec`)."""
+    spec = as_spec(config)
+    parser = argparse.ArgumentParser(description=spec.description)
+    for flags, options in GLOBAL_OPTIONS:
+        parser.add_argument(*flags, **options)
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    for command in config["commands"]:
-        logger.debug("Adding command: %s", command["name"])
-        subparser = subparsers.add_parser(command["name"], description=command["description"])
-        for arg in command["args"]:
-            target_type = _type_converter(arg.get("type", "str"))
-
-            # Build a converter that validates (if rules present) and then coerces
-            def make_converter(rules: Dict[str, Any] | None, to_type: _Callable[[str], Any]):
-                def _convert(raw: str) -> Any:
-                    # Always validate against string input first
-                    if rules is not None:
-                        validate_arg(raw, rules)
-                    # Then coerce to target type
-                    try:
-                        return to_type(raw)
-                    except Exception as exc:  # pragma: no cover - argparse surfaces message
-                        raise argparse.ArgumentTypeError(str(exc)) from exc
-                return _convert
-
-            converter = make_converter(arg.get("rules"), target_type)
-
-            # Coerce choices to the same type argparse will compare against
-            coerced_choices = None
-            if "choices" in arg and arg["choices"] is not None:
-                coerced_choices = []
-                for c in arg["choices"]:
-                    try:
-                        coerced_choices.append(target_type(c) if isinstance(c, str) else c)
-                    except Exception:  # keep original if cannot coerce
-                        coerced_choices.append(c)
-
-            subparser.add_argument(
-                f"--{arg['name']}",
-                type=converter,
-                help=arg.get("help"),
-                required=arg.get("required", False),
-                choices=coerced_choices,
-                default=arg.get("default"),
-            )
+    for command in spec.commands:
+        logger.debug("Adding command: %s", command.name)
+        add_command_arguments(subparsers.add_parser(command.name, description=command.description), command)
+    return parser
+
+
+def build_command_cli(command: CommandSpec, optional: Container[str] = ()) -> argparse.ArgumentParser:
+    """Parser for *command* alone, behind the global options; names in *optional* are never required.
+
+    It accepts the same command lines for *command* as :pyfunc:`build_cli`.
+    """
+    parser = argparse.ArgumentParser()
+    for flags, options in GLOBAL_OPTIONS:
+        parser.add_argument(*flags, **options)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_command_arguments(subparsers.add_parser(command.name, description=command.description), command, optional)
     return parser
 
 
-def prompt_for_missing_args(parsed_args: argparse.Namespace, config: Dict[str, Any]) -> None:
+def add_command_arguments(parser: argparse.ArgumentParser, command: CommandSpec, optional: Container[str] = ()) -> None:
+    """Add the ``--arg`` options of *command* to *parser*; names in *optional* are never required."""
+    for arg in command.args:
+        parser.add_argument(
+            arg.flag,
+            type=arg.converter,
+            help=arg.help,
+            required=arg.required and arg.name not in optional,
+            choices=arg.choices,
+            default=arg.default,
+        )
+
+
+def prompt_for_missing_args(parsed_args: argparse.Namespace, config: Dict[str, Any] | ConfigSpec) -> None:
     """Interactively ask for values missing on the CLI (when `-im` is supplied)."""
-    for command in config["commands"]:
-        if parsed_args.command == command["name"]:
-            for arg in command["args"]:
-                if getattr(parsed_args, arg["name"]) is None:
-                    while True:
-                        value = input(f"Please enter a value for {arg['name']}: ")
-                        try:
-                            validate_arg(value, arg["rules"])
-                            break
-                        except argparse.ArgumentTypeError as exc:
-                            print(exc)
-                    setattr(parsed_args, arg["name"], value)
-
-
-def execute_command(parsed_args: argparse.Namespace, config: Dict[str, Any], ACTIONS: Dict[str, Callable[..., Any]]) -> None:
-    """Execute the python function mapped to *parsed_args.command*."""
+    command = as_spec(config).command(parsed_args.command)
+    if command is None:
+        return
+    for arg in command.args:
+        if getattr(parsed_args, arg.name) is None:
+            while True:
+                value = input(f"Please enter a value for {arg.name}: ")
+                try:
+                    validate_arg(value, arg.rules or {})
+                    break
+                except argparse.ArgumentTypeError as exc:
+                    print(exc)
+            setattr(parsed_args, arg.name, value)
+
+
+def execute_command(
+    parsed_args: argparse.Namespace,
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    resources: Optional[ResourcePool] = None,
+) -> Any:
+    """Execute the python function mapped to *parsed_args.command* and return its result.
+
+    Action parameters named after a resource of *resources* (default: the
+    process-wide pool, see :pymod:`~dynamic_cli_builder.resources`) receive
+    that shared resource.
+    """
     effective_level = "INFO" if parsed_args.log else parsed_args.log_level
-    configure_logging(effective_level)
+    configure_logging(
+        effective_level,
+        fmt=getattr(parsed_args, "log_format", "text"),
+        queue=getattr(parsed_args, "log_queue", False),
+    )
 
+    spec = as_spec(config)
     if parsed_args.im:
-        prompt_for_missing_args(parsed_args, config)
-
-    for command in config["commands"]:
-        if parsed_args.command == command["name"]:
-            func = ACTIONS.get(command["action"])
-            if func is None:
-                raise ValueError(f"Action '{command['action']}' not defined.")
-            args = {arg["name"]: getattr(parsed_args, arg["name"], None) for arg in command["args"]}
-            logger.debug("Executing action %s with args %s", command["action"], args)
-            func(**args)
+        prompt_for_missing_args(parsed_args, spec)
+
+    command = spec.command(parsed_args.command)
+    if command is None:
+        return None
+    action = command.action
+    func = ACTIONS.get(action) if action is not None else None
+    if action is None or func is None:
+        raise ValueError(f"Action '{action}' not defined.")
+    args = {name: getattr(parsed_args, name, None) for name in command.arg_names}
+    logger.debug("Executing action %s with args %s", action, args)
+    pool = resources if resources is not None else current_pool()
+    if pool is not None:
+        for name in pool.wanted_by(func, command.arg_names):
+            args[name] = pool.get(name)
+    if not getattr(parsed_args, "memprofile", False):
+        return func(**args)
+    with memory_profile(action) as profile:
+        result = func(**args)
+    print(format_report(profile.report), file=sys.stderr)  # type: ignore[arg-type]
+    return result
@@ -0,0 +1,193 @@
+"""Single-file deployable bundles (zipapps).
+
+:pyfunc:`build_bundle` writes an executable ``.pyz`` archive that contains
+
+* the ``dynamic_cli_builder`` package as sourceless ``.pyc`` files,
+* the actions module compiled to ``__dcb__/actions.pyc``,
+* the config, already parsed and validated, marshalled to
+  ``__dcb__/config.marshal``,
+* the help text of the CLI and of every command, rendered at build time, in
+  ``__dcb__/help.marshal``,
+* a ``__main__.py`` that calls :pyfunc:`dynamic_cli_builder.__main__.main`.
+
+At runtime :pyfunc:`load_bundle` detects that the package is being imported
+from such an archive and hands back the config and ``ACTIONS`` directly, so a
+cold start neither parses YAML/JSON nor compiles any source. ``ACTIONS`` are
+only executed on first access, so ``--help`` never imports them. Bytecode and
+marshal data are tied to the Python minor version used to build the bundle.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import marshal
+import os
+import py_compile
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from dynamic_cli_builder.helpcache import render_all
+from dynamic_cli_builder.loader import load_config
+
+__all__ = ["Bundle", "build_bundle", "load_bundle"]
+
+BUNDLE_DIR = "__dcb__"
+MANIFEST = f"{BUNDLE_DIR}/manifest.json"
+CONFIG_DATA = f"{BUNDLE_DIR}/config.marshal"
+ACTIONS_PYC = f"{BUNDLE_DIR}/actions.pyc"
+HELP_DATA = f"{BUNDLE_DIR}/help.marshal"
+BUNDLE_FORMAT = 1
+
+_MAIN_PY = "from dynamic_cli_builder.__main__ import main\n\nmain()\n"
+
+
+class Bundle(NamedTuple):
+    """Config, pre-rendered help and (lazily) actions of a running bundle."""
+
+    archive: str
+    config: Dict[str, Any]
+    help: Optional[Dict[str, Any]]
+    actions_name: str
+
+    def _module(self) -> ModuleType:
+        module = _MODULES.get(self.archive)
+        if module is None:
+            module = _MODULES[self.archive] = _exec_actions(self.archive, self.actions_name)
+        return module
+
+    @property
+    def actions(self) -> Dict[str, Callable[..., Any]]:
+        """The bundled ``ACTIONS``, executed on first access."""
+        return self._module().ACTIONS  # type: ignore[no-any-return]
+
+    @property
+    def resources(self) -> Optional[Dict[str, Callable[..., Any]]]:
+        """The bundled actions module's ``RESOURCES``, if it defines any."""
+        return getattr(self._module(), "RESOURCES", None)
+
+    def help_text(self, command: Optional[str], prog: str) -> Optional[str]:
+        """Stored help for *command* (``None``: top level), if rendered for *prog*."""
+        if not self.help or self.help.get("prog") != prog:
+            return None
+        return self.help["text"].get(command or "")
+
+
+_MODULES: Dict[str, ModuleType] = {}
+
+# Bundled help is wrapped for a standard 80-column terminal
+_HELP_COLUMNS = "80"
+
+
+def _compile_to(source: Path, target: Path, dfile: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    py_compile.compile(str(source), cfile=str(target), dfile=dfile, doraise=True)
+
+
+def build_bundle(
+    output: str | Path,
+    config_path: str | Path | None,
+    actions_path: str | Path,
+    interpreter: str | None = "/usr/bin/env python3",
+) -> Path:
+    """Create an executable zipapp at *output* and return its path.
+
+    The config is loaded and validated now, so errors surface at build time
+    rather than on the deployment target.
+    """
+    actions_path = Path(actions_path)
+    if not actions_path.exists():
+        raise FileNotFoundError(f"Actions file not found: {actions_path}")
+    config = load_config(config_path)
+    try:
+        config_data = marshal.dumps(config)
+    except ValueError as exc:
+        raise ValueError(f"Config contains values that cannot be bundled: {exc}") from exc
+
+    package_dir = Path(__file__).resolve().parent
+    output = Path(output)
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp)
+        for source in package_dir.glob("*.py"):
+            _compile_to(
+                source,
+                staging / "dynamic_cli_builder" / f"{source.stem}.pyc",
+                f"dynamic_cli_builder/{source.name}",
+            )
+        if (package_dir / "py.typed").exists():
+            (staging / "dynamic_cli_builder" / "py.typed").write_bytes(b"")
+        _compile_to(actions_path, staging / ACTIONS_PYC, actions_path.name)
+        (staging / CONFIG_DATA).write_bytes(config_data)
+        (staging / HELP_DATA).write_bytes(marshal.dumps(_render_help(config, output.name)))
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "python": list(sys.version_info[:2]),
+            "magic": importlib.util.MAGIC_NUMBER.hex(),
+            "actions": actions_path.name,
+        }
+        (staging / MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+        (staging / "__main__.py").write_text(_MAIN_PY, encoding="utf-8")
+        zipapp.create_archive(staging, target=output, interpreter=interpreter)
+    return output
+
+
+def _render_help(config: Dict[str, Any], prog: str) -> Dict[str, Any]:
+    saved = os.environ.get("COLUMNS")
+    os.environ["COLUMNS"] = _HELP_COLUMNS
+    try:
+        return {"prog": prog, "text": render_all(config, prog)}
+    finally:
+        if saved is None:
+            del os.environ["COLUMNS"]
+        else:
+            os.environ["COLUMNS"] = saved
+
+
+def _bundle_loader() -> Any:
+    """Return the zipimporter this package was loaded by, if any."""
+    loader = globals().get("__loader__")
+    if loader is None or type(loader).__name__ != "zipimporter":
+        return None
+    return loader
+
+
+def load_bundle() -> Optional[Bundle]:
+    """Return the config and ``ACTIONS`` of the running bundle (``None`` outside one)."""
+    loader = _bundle_loader()
+    if loader is None:
+        return None
+    archive = loader.archive
+    try:
+        manifest = json.loads(loader.get_data(os.path.join(archive, MANIFEST)))
+    except OSError:
+        return None
+
+    if manifest.get("magic") != importlib.util.MAGIC_NUMBER.hex():
+        built = ".".join(str(v) for v in manifest.get("python", ()))
+        raise ImportError(
+            f"Bundle {archive} was built for Python {built}; "
+            f"running Python {sys.version_info[0]}.{sys.version_info[1]}"
+        )
+
+    config = marshal.loads(loader.get_data(os.path.join(archive, CONFIG_DATA)))
+    try:
+        help_data = marshal.loads(loader.get_data(os.path.join(archive, HELP_DATA)))
+    except OSError:  # bundles built before help was stored
+        help_data = None
+    return Bundle(archive, config, help_data, manifest.get("actions", "actions.py"))
+
+
+def _exec_actions(archive: str, name: str) -> ModuleType:
+    loader = _bundle_loader()
+    pyc = loader.get_data(os.path.join(archive, ACTIONS_PYC))
+    # 16-byte pyc header: magic, flags, mtime/hash, size
+    code = marshal.loads(pyc[16:])
+    module = ModuleType("actions")
+    module.__file__ = os.path.join(archive, name)
+    exec(code, module.__dict__)  # noqa: S102 - the bundle's own compiled actions
+    if not hasattr(module, "ACTIONS"):
+        raise AttributeError(f"{module.__file__} must define a top-level 'ACTIONS' dictionary")
+    return module
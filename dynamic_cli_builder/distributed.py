@@ -0,0 +1,479 @@
+"""Batch runs spread over worker processes (``--coordinator`` / ``--worker``).
+
+A coordinator owns the batch file, the report and the journal; workers own
+the config and ``ACTIONS``::
+
+    dcb --batch jobs.txt --coordinator 0.0.0.0:7070      # on one host
+    dcb --worker coordinator:7070 --batch-jobs 8         # on each worker host
+
+Workers load the config and import the actions once, connect (over TCP, or
+a Unix socket with ``unix:/path``), pull chunks of command lines, run them
+through their local :class:`~dynamic_cli_builder.scheduler.Scheduler` and
+stream every result back as soon as it is known. The coordinator writes the
+same JSON-lines report as ``--batch`` (plus the ``worker`` number).
+
+Workers pull their next chunk before running dry, so a worker never waits on
+the network between lines. When the coordinator has no lines left and a
+worker asks for more, it steals: it asks the worker with the most outstanding
+lines to hand back half of those it has not started yet. Slow lines therefore
+do not leave the other workers idle at the end of a run. If a worker
+disconnects, the lines it had not reported are handed out again.
+
+Messages are JSON objects, one per line, with an ``op`` field:
+
+* worker to coordinator: ``hello``, ``pull`` (``want``), ``results`` (report
+  entries without ``line``) and ``returned`` (``items`` given back for a steal)
+* coordinator to worker: ``chunk`` (``items``: ``[index, line]`` pairs),
+  ``steal`` (``count``) and ``done``
+
+Schedule policies (concurrency caps, rate limits) apply per worker. There is
+no authentication: workers run whatever the coordinator sends, so only listen
+on trusted networks.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from dynamic_cli_builder.batch import _numbered, _outcome_entry, _parse_line, _write
+from dynamic_cli_builder.fastparse import make_parser
+from dynamic_cli_builder.journal import Journal
+from dynamic_cli_builder.scheduler import Scheduler
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["parse_address", "run_coordinator", "run_worker"]
+
+_UNIX_PREFIX = "unix:"
+
+
+def parse_address(address: str) -> Tuple[int, Any]:
+    """Return ``(family, sockaddr)`` for ``HOST:PORT`` or ``unix:PATH``."""
+    if address.startswith(_UNIX_PREFIX):
+        path = address[len(_UNIX_PREFIX):]
+        if not path:
+            raise ValueError(f"Invalid address '{address}': missing socket path")
+        return socket.AF_UNIX, path
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid address '{address}'; use HOST:PORT or unix:PATH")
+    return socket.AF_INET6 if ":" in host else socket.AF_INET, (host.strip("[]") or "0.0.0.0", int(port))
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall((json.dumps(message, default=str) + "\n").encode("utf-8"))
+
+
+def _listen(address: str) -> socket.socket:
+    family, sockaddr = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(sockaddr):
+            os.unlink(sockaddr)  # left over from an earlier run
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(sockaddr)
+        listener.listen()
+        return listener
+    return socket.create_server(sockaddr, family=family)
+
+
+def _connect(address: str, timeout: float) -> socket.socket:
+    """Connect to the coordinator, retrying until it listens or *timeout* expires."""
+    family, sockaddr = parse_address(address)
+    deadline = time.monotonic() + timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(sockaddr)
+        except (ConnectionRefusedError, FileNotFoundError):
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+            continue
+        if family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+class _Coordinator:
+    """Shared state of a coordinator; every method runs under ``self.lock``."""
+
+    def __init__(self, lines: Iterator[Tuple[int, str]], report: TextIO, journal: Optional[Journal]) -> None:
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.source = lines
+        self.exhausted = False
+        self.report = report
+        self.journal = journal
+        self.failures = 0
+        self.ids = itertools.count(1)
+        self.pending: Deque[Tuple[int, str]] = deque()
+        self.workers: Dict[int, socket.socket] = {}
+        self.outstanding: Dict[int, Dict[int, str]] = {}
+        self.parked: Dict[int, int] = {}  # worker -> lines wanted, waiting for work
+        self.stealing: Optional[int] = None  # victim of the steal in progress
+        self.dry: set = set()  # workers that had nothing left to steal
+        self.error: Optional[BaseException] = None
+
+    def _take(self, want: int) -> List[Tuple[int, str]]:
+        taken: List[Tuple[int, str]] = []
+        while len(taken) < want:
+            if self.pending:
+                taken.append(self.pending.popleft())
+                continue
+            if self.exhausted:
+                break
+            try:
+                taken.append(next(self.source))
+            except StopIteration:
+                self.exhausted = True
+        return taken
+
+    def _tell(self, worker: int, message: Dict[str, Any]) -> None:
+        try:
+            _send(self.workers[worker], message)
+        except OSError as exc:
+            # Its own handler sees the connection drop and re-queues its lines
+            logger.debug("Could not reach worker %d: %s", worker, exc)
+
+    def _serve(self, worker: int, want: int) -> bool:
+        """Send *worker* a chunk if there is work; ``False`` if there is none right now."""
+        items = self._take(want)
+        if not items:
+            return False
+        self.outstanding[worker].update(items)
+        self.dry.discard(worker)
+        self._tell(worker, {"op": "chunk", "items": items})
+        return True
+
+    def check_finished(self) -> None:
+        if not self.pending:
+            self.pending.extend(self._take(1))
+        if not self.pending and not any(self.outstanding.values()):
+            for worker in self.workers:
+                self._tell(worker, {"op": "done"})
+            self.finished.set()
+
+    def _reassign(self) -> None:
+        """Give pending lines to parked workers, stealing more if some stay idle."""
+        for worker, want in list(self.parked.items()):
+            if not self._serve(worker, want):
+                break
+            del self.parked[worker]
+        if not self.parked or self.stealing is not None:
+            return
+        candidates = [w for w in self.outstanding if w not in self.parked and w not in self.dry and len(self.outstanding[w]) > 1]
+        if candidates:
+            victim = max(candidates, key=lambda w: len(self.outstanding[w]))
+            self.stealing = victim
+            self._tell(victim, {"op": "steal", "count": max(self.parked.values())})
+
+    def join(self, sock: socket.socket) -> int:
+        worker = next(self.ids)
+        self.workers[worker] = sock
+        self.outstanding[worker] = {}
+        return worker
+
+    def pull(self, worker: int, want: int) -> None:
+        if not self._serve(worker, want):
+            self.parked[worker] = want
+            self._reassign()
+            self.check_finished()
+
+    def result(self, worker: int, entry: Dict[str, Any]) -> None:
+        index = entry.pop("index")
+        line = self.outstanding[worker].pop(index, None)
+        if line is None:  # pragma: no cover - a line is only ever assigned to one worker
+            logger.warning("Ignoring result for line %s, which worker %d does not hold", index, worker)
+            return
+        if entry["status"] != "ok":
+            self.failures += 1
+        if self.journal is not None:
+            self.journal.record(index, line, entry["status"], entry.get("result"))
+        _write(self.report, {"index": index, "line": line, **entry, "worker": worker})
+        if self.parked:
+            self._reassign()
+        self.check_finished()
+
+    def returned(self, worker: int, items: List[List[Any]]) -> None:
+        if self.stealing == worker:
+            self.stealing = None
+        if not items:
+            self.dry.add(worker)
+        for index, _ in items:
+            self.outstanding[worker].pop(index, None)
+        self.pending.extendleft((index, line) for index, line in reversed(items))
+        logger.debug("Stole %d line(s) from worker %d", len(items), worker)
+        self._reassign()
+
+    def leave(self, worker: int) -> None:
+        lost = self.outstanding.pop(worker, {})
+        self.workers.pop(worker, None)
+        self.parked.pop(worker, None)
+        self.dry.discard(worker)
+        if self.stealing == worker:
+            self.stealing = None
+        if lost:
+            logger.warning("Worker %d disconnected; re-queueing %d line(s)", worker, len(lost))
+            self.pending.extendleft(reversed(sorted(lost.items())))
+            self._reassign()
+        self.check_finished()
+
+
+def _messages(sock: socket.socket, worker: int) -> Iterator[Dict[str, Any]]:
+    """Messages from *worker* until it disconnects (or sends something unreadable)."""
+    try:
+        with sock.makefile("rb") as stream:
+            for raw in stream:
+                yield json.loads(raw)
+    except (OSError, ValueError) as exc:
+        logger.warning("Worker %d: %s", worker, exc)
+
+
+def _handle(state: _Coordinator, sock: socket.socket) -> None:
+    with state.lock:
+        worker = state.join(sock)
+    try:
+        for message in _messages(sock, worker):
+            op = message.pop("op")
+            with state.lock:
+                if op == "pull":
+                    state.pull(worker, message["want"])
+                elif op == "results":
+                    for entry in message["results"]:
+                        state.result(worker, entry)
+                elif op == "returned":
+                    state.returned(worker, message["items"])
+                elif op == "hello":
+                    logger.info("Worker %d connected: %s (%d job(s))", worker, message.get("name"), message.get("jobs", 0))
+    except Exception as exc:  # noqa: BLE001 - e.g. the report or journal failed: stop the run
+        state.error = exc
+        state.finished.set()
+    finally:
+        with state.lock:
+            state.leave(worker)
+        sock.close()
+
+
+def run_coordinator(
+    lines: Iterable[str],
+    address: str,
+    report: TextIO,
+    journal: Optional[Journal] = None,
+    ready: Optional[Callable[[], None]] = None,
+) -> int:
+    """Hand the command lines in *lines* out to workers until all are reported.
+
+    Parameters
+    ----------
+    address : str
+        ``HOST:PORT`` or ``unix:PATH`` to listen on.
+    report : TextIO
+        Receives one ``--batch`` report entry per line, plus ``worker``.
+    journal : Journal, optional
+        As for :pyfunc:`~dynamic_cli_builder.batch.run_batch`.
+    ready : callable, optional
+        Called once the coordinator is listening.
+
+    Returns
+    -------
+    int
+        Number of lines that failed to parse or whose action raised.
+    """
+    skipped: Counter = Counter()
+    state = _Coordinator(_numbered(lines, journal, skipped), report, journal)
+    listener = _listen(address)
+    listener.settimeout(0.1)
+    handlers: List[threading.Thread] = []
+    logger.info("Coordinator listening on %s", address)
+    if ready is not None:
+        ready()
+    try:
+        with state.lock:
+            state.check_finished()  # nothing to do at all
+        while not state.finished.is_set():
+            try:
+                sock, _ = listener.accept()
+            except socket.timeout:
+                continue
+            sock.settimeout(None)
+            handler = threading.Thread(target=_handle, args=(state, sock), name="dcb-coordinator", daemon=True)
+            handler.start()
+            handlers.append(handler)
+    finally:
+        listener.close()
+        if listener.family == socket.AF_UNIX:
+            try:
+                os.unlink(parse_address(address)[1])
+            except OSError:
+                pass
+        with state.lock:
+            for sock in state.workers.values():
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+    for handler in handlers:
+        handler.join(timeout=5)
+    if state.error is not None:
+        raise state.error
+    report.flush()
+    if skipped:
+        logger.info("Skipped %d line(s) already completed according to the journal", skipped["journal"])
+    logger.info("Distributed batch finished with %d failure(s)", state.failures)
+    return state.failures
+
+
+class _Inbox:
+    """Lines received by a worker and not yet handed to its scheduler."""
+
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.items: Deque[Tuple[int, str]] = deque()
+        self.done = False
+        self.pulling = False
+        self.lost = False
+        self.running = 0  # handed to the scheduler, result not sent yet
+
+
+def _receive(sock: socket.socket, inbox: _Inbox, send: Callable[[Dict[str, Any]], None]) -> None:
+    try:
+        with sock.makefile("rb") as stream:
+            for raw in stream:
+                message = json.loads(raw)
+                op = message["op"]
+                returned: Optional[List[Tuple[int, str]]] = None
+                with inbox.cond:
+                    if op == "chunk":
+                        inbox.items.extend((index, line) for index, line in message["items"])
+                        inbox.pulling = False
+                    elif op == "steal":
+                        # Give back up to half of the lines not started yet, from the back
+                        count = min(message["count"], (len(inbox.items) + 1) // 2)
+                        returned = [inbox.items.pop() for _ in range(count)][::-1]
+                    elif op == "done":
+                        inbox.done = True
+                    inbox.cond.notify_all()
+                if returned is not None:
+                    send({"op": "returned", "items": returned})
+    except (OSError, ValueError) as exc:
+        logger.debug("Coordinator connection closed: %s", exc)
+    with inbox.cond:
+        inbox.lost = not inbox.done
+        inbox.done = True
+        inbox.cond.notify_all()
+
+
+def run_worker(
+    address: str,
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    jobs: int = 4,
+    parser: str = "argparse",
+    prefetch: Optional[int] = None,
+    connect_timeout: float = 10.0,
+) -> int:
+    """Run command lines pulled from the coordinator at *address* until it says done.
+
+    Parameters
+    ----------
+    jobs : int
+        Worker threads of this process's scheduler.
+    parser : {"argparse", "fast"}
+        Parser engine used for every line.
+    prefetch : int, optional
+        Lines requested per pull (default ``2 * jobs``); the next pull is sent
+        when half of them are left.
+    connect_timeout : float
+        Seconds to keep retrying while the coordinator is not listening yet.
+
+    Returns
+    -------
+    int
+        Number of lines this worker ran (or failed to parse).
+    """
+    spec = as_spec(config)
+    cli = make_parser(spec, parser)
+    want = prefetch or 2 * jobs
+    low = want // 2
+    sock = _connect(address, connect_timeout)
+    send_lock = threading.Lock()
+
+    def send(message: Dict[str, Any]) -> None:
+        with send_lock:
+            _send(sock, message)
+
+    inbox = _Inbox()
+    receiver = threading.Thread(target=_receive, args=(sock, inbox, send), name="dcb-worker-receive", daemon=True)
+    receiver.start()
+    send({"op": "hello", "name": f"{socket.gethostname()}:{os.getpid()}", "jobs": jobs})
+    handled = 0
+    results: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        # The scheduler asks for more work after handing over each round of
+        # completions, so results are sent once per round rather than per line
+        if results:
+            send({"op": "results", "results": results})
+            results.clear()
+
+    def _parsed() -> Iterator[Optional[Tuple[int, Any]]]:
+        nonlocal handled
+        while True:
+            flush()
+            with inbox.cond:
+                pull = not inbox.done and not inbox.pulling and len(inbox.items) <= low
+                inbox.pulling = inbox.pulling or pull
+            if pull:
+                send({"op": "pull", "want": want})
+            with inbox.cond:
+                # Only block when nothing is running: results must keep flowing
+                while not inbox.items and not inbox.done and not inbox.running:
+                    inbox.cond.wait()
+                if inbox.lost:
+                    return
+                if inbox.items:
+                    index, line = inbox.items.popleft()
+                elif inbox.done:
+                    return
+                else:
+                    index = None
+            if index is None:
+                yield None
+                continue
+            handled += 1
+            parsed_args, message = _parse_line(cli, line)
+            if parsed_args is None:
+                results.append({"index": index, "status": "error", "error": message, "attempts": 0})
+                continue
+            with inbox.cond:
+                inbox.running += 1
+            yield index, parsed_args
+
+    try:
+        for outcome in Scheduler(spec, ACTIONS, jobs, lookahead=jobs).run(_parsed()):
+            with inbox.cond:
+                inbox.running -= 1
+                if inbox.lost:
+                    continue
+            results.append({"index": outcome.key, **_outcome_entry(outcome)})
+        flush()
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        receiver.join(timeout=5)
+    if inbox.lost:
+        raise ConnectionError(f"Lost connection to coordinator at {address}")
+    logger.info("Worker finished after %d line(s)", handled)
+    return handled
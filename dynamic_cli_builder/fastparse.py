@@ -0,0 +1,273 @@
+"""Spec-driven argv parser, an optional faster alternative to ``argparse``.
+
+:class:`FastParser` parses the same command lines as the parser returned by
+:pyfunc:`~dynamic_cli_builder.builder.build_cli` and produces an identical
+:class:`argparse.Namespace`, but works straight from the compiled
+:class:`~dynamic_cli_builder.spec.ConfigSpec`: one dict lookup per flag, the
+spec's precomputed converters, and no ``add_argument`` objects. A command's
+flag table is only built the first time that command is parsed, so the cost
+of constructing a parser no longer grows with the number of commands.
+
+It handles the common forms only: global options before the command name,
+then ``--name value`` / ``--name=value`` pairs, optionally ending in
+``--help``, whose text is rendered from that command's parser alone (see
+:pymod:`~dynamic_cli_builder.helpcache`). Anything else — an error, an
+abbreviated option, a value that looks like an option — is handed to the
+``argparse`` parser (built on first need), so error messages, help output and
+exit codes are exactly those of ``argparse``.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dynamic_cli_builder.builder import GLOBAL_OPTIONS, build_cli
+from dynamic_cli_builder.helpcache import render_command_help
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+__all__ = ["PARSER_ENGINES", "FastParser", "make_parser"]
+
+PARSER_ENGINES = ("argparse", "fast")
+
+# argparse treats these as values rather than options unless they name one
+# (the built parsers have no options that look like negative numbers)
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+_HELP_FLAGS = ("-h", "--help")
+
+# Default values that may be shared between namespaces
+_IMMUTABLE = (str, int, float, bool, type(None), tuple, frozenset)
+
+_Opt = Tuple[str, Optional[Callable[[str], Any]], Optional[tuple], bool]  # dest, converter, choices, takes value
+
+
+def _dest(flags: Sequence[str]) -> str:
+    """The attribute name ``argparse`` derives from *flags*."""
+    long_flags = [flag for flag in flags if flag.startswith("--")]
+    return (long_flags or list(flags))[0].lstrip("-").replace("-", "_")
+
+
+def _is_positional(raw: str, flags: Sequence[str]) -> bool:
+    """Whether a parser with option strings *flags* reads *raw* as a positional.
+
+    Mirrors ``ArgumentParser._parse_optional`` for the default prefix chars
+    with abbreviations allowed: a token naming an option — exactly, before an
+    ``=``, or as an abbreviation, even an ambiguous one — is an option, even if
+    it looks like a negative number or contains a space.
+    """
+    if raw[:1] != "-" or raw == "-":
+        return True
+    if raw in flags or raw.partition("=")[0] in flags:
+        return False
+    if raw[1] == "-":
+        prefix = raw.partition("=")[0]
+        if any(flag.startswith(prefix) for flag in flags):
+            return False
+    elif any(flag == raw[:2] or flag.startswith(raw) for flag in flags):
+        return False
+    return _NEGATIVE_NUMBER.match(raw) is not None or " " in raw
+
+
+class _InvalidValue(Exception):
+    """A converter rejected a value; reported through the command's subparser."""
+
+    def __init__(self, command: str, message: str) -> None:
+        super().__init__(message)
+        self.command = command
+        self.message = message
+
+
+class _HelpRequested(Exception):
+    """``COMMAND ... --help``: answered by rendering that command's parser only."""
+
+    def __init__(self, command: str) -> None:
+        super().__init__(command)
+        self.command = command
+
+
+class _Command:
+    """Flag table and defaults of one command."""
+
+    __slots__ = ("options", "flags", "defaults", "lazy_defaults", "required")
+
+    def __init__(self, command: Any) -> None:
+        self.options: Dict[str, _Opt] = {}
+        self.defaults: Dict[str, Any] = {}
+        self.lazy_defaults: List[Tuple[str, Callable[[str], Any], str]] = []
+        self.required: List[str] = []
+        for arg in command.args:
+            dest = _dest((arg.flag,))
+            self.options[arg.flag] = (dest, arg.converter, arg.choices, True)
+            if arg.required:
+                self.required.append(dest)
+            if isinstance(arg.default, str):
+                # argparse runs string defaults through the type converter
+                try:
+                    value = arg.converter(arg.default)
+                except Exception:  # noqa: BLE001 - argparse reports it on parse
+                    self.lazy_defaults.append((dest, arg.converter, arg.default))
+                    continue
+                if isinstance(value, _IMMUTABLE):
+                    self.defaults[dest] = value
+                else:
+                    self.lazy_defaults.append((dest, arg.converter, arg.default))
+            else:
+                self.defaults[dest] = arg.default
+        self.flags = tuple(self.options) + _HELP_FLAGS
+
+
+class FastParser:
+    """Parse argv for *config* without building ``argparse`` parsers.
+
+    Exposes :meth:`parse_args` like :class:`argparse.ArgumentParser`, so it can
+    be used wherever the result of ``build_cli`` is.
+    """
+
+    def __init__(self, config: Dict[str, Any] | ConfigSpec) -> None:
+        self.spec = as_spec(config)
+        self._globals: Dict[str, _Opt] = {}
+        self._global_defaults: Dict[str, Any] = {}
+        for flags, options in GLOBAL_OPTIONS:
+            dest = _dest(flags)
+            store_true = options.get("action") == "store_true"
+            choices = options.get("choices")
+            for flag in flags:
+                self._globals[flag] = (dest, None, tuple(choices) if choices else None, not store_true)
+            self._global_defaults[dest] = False if store_true else options.get("default")
+        self._global_flags = tuple(self._globals) + _HELP_FLAGS
+        self._commands: Dict[str, _Command] = {}
+        self._argparse: Optional[argparse.ArgumentParser] = None
+
+    def _command(self, name: str) -> Optional[_Command]:
+        table = self._commands.get(name)
+        if table is None:
+            command = self.spec.command(name)
+            if command is None:
+                return None
+            table = self._commands[name] = _Command(command)
+        return table
+
+    def fallback(self) -> argparse.ArgumentParser:
+        """The equivalent ``argparse`` parser, built on first use."""
+        if self._argparse is None:
+            self._argparse = build_cli(self.spec)
+        return self._argparse
+
+    def _subparser(self, name: str) -> argparse.ArgumentParser:
+        for action in self.fallback()._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                return action.choices[name]
+        raise LookupError(name)  # pragma: no cover - build_cli always adds subparsers
+
+    def parse_args(self, args: Optional[Sequence[str]] = None, namespace: Optional[argparse.Namespace] = None) -> argparse.Namespace:
+        argv = sys.argv[1:] if args is None else list(args)
+        try:
+            values = None if namespace is not None else self._parse(argv)
+        except _InvalidValue as exc:
+            self._subparser(exc.command).error(exc.message)
+        except _HelpRequested as exc:
+            sys.stdout.write(render_command_help(self.spec, exc.command) or "")
+            sys.exit(0)
+        if values is None:
+            return self.fallback().parse_args(argv, namespace)
+        parsed = argparse.Namespace()
+        parsed.__dict__.update(values)
+        return parsed
+
+    def _parse(self, argv: List[str]) -> Optional[Dict[str, Any]]:
+        """Return the namespace contents, or ``None`` to defer to argparse."""
+        values = dict(self._global_defaults)
+        count = len(argv)
+        i = 0
+        while i < count:
+            token = argv[i]
+            if token[:1] != "-":
+                break
+            option = self._globals.get(token)
+            explicit = option is None
+            if option is None:
+                flag, eq_sign, raw = token.partition("=")
+                option = self._globals.get(flag) if eq_sign and flag[:2] == "--" else None
+                if option is None:
+                    return None
+            dest, _, choices, takes_value = option
+            if not takes_value:
+                if explicit:
+                    return None
+                values[dest] = True
+            else:
+                if not explicit:
+                    i += 1
+                    if i == count or not _is_positional(argv[i], self._global_flags):
+                        return None
+                    raw = argv[i]
+                if choices is not None and raw not in choices:
+                    return None
+                values[dest] = raw
+            i += 1
+        if i == count:
+            return None
+
+        name = argv[i]
+        command = self._command(name)
+        if command is None:
+            return None
+        values["command"] = name
+        values.update(command.defaults)
+        options = command.options
+        seen = set()
+        i += 1
+        while i < count:
+            token = argv[i]
+            option = options.get(token)
+            if option is None and token in _HELP_FLAGS and i == count - 1:
+                raise _HelpRequested(name)
+            if option is None:
+                flag, eq_sign, raw = token.partition("=")
+                option = options.get(flag) if eq_sign and flag[:2] == "--" else None
+                if option is None:
+                    return None
+            else:
+                flag = token
+                i += 1
+                # argparse classifies every token with the top-level parser
+                # before the subparser sees it
+                if i == count or not (_is_positional(argv[i], command.flags) and _is_positional(argv[i], self._global_flags)):
+                    return None
+                raw = argv[i]
+            dest, converter, choices, _ = option
+            try:
+                value = converter(raw)  # type: ignore[misc]
+            except argparse.ArgumentTypeError as exc:
+                # Report it the way argparse would instead of converting (and
+                # logging the validation failure) a second time
+                raise _InvalidValue(name, f"argument {flag}: {exc}") from exc
+            except Exception:  # noqa: BLE001 - argparse reports it
+                return None
+            if choices is not None and value not in choices:
+                return None
+            values[dest] = value
+            seen.add(dest)
+            i += 1
+
+        for dest in command.required:
+            if dest not in seen:
+                return None
+        for dest, converter, default in command.lazy_defaults:
+            if dest not in seen:
+                try:
+                    values[dest] = converter(default)
+                except Exception:  # noqa: BLE001 - argparse reports it
+                    return None
+        return values
+
+
+def make_parser(config: Dict[str, Any] | ConfigSpec, engine: str = "argparse") -> argparse.ArgumentParser | FastParser:
+    """Return the parser for *config* using *engine* (``"argparse"`` or ``"fast"``)."""
+    if engine == "fast":
+        return FastParser(config)
+    if engine == "argparse":
+        return build_cli(config)
+    raise ValueError(f"Unknown parser engine '{engine}'; use one of {', '.join(PARSER_ENGINES)}")
@@ -2,12 +2,50 @@
 
 Introspects a Python module (typically the actions file) to produce a
 Dynamic CLI Builder configuration (YAML/JSON compatible dict).
+
+Regenerating a config file is incremental (:class:`IncrementalGenerator`):
+
+* generated commands are cached by a hash of each function's source
+  (:class:`SignatureCache`), so only changed functions are introspected again;
+* YAML is written from per-command fragments cached by content, so unchanged
+  commands are not dumped again, and nothing is imported when no source file
+  changed since the last run;
+* :pyfunc:`merge_config` carries hand edits of the existing file (``rules``,
+  ``choices``, ``schedule``, edited help texts, ...) over into the result.
 """
 from __future__ import annotations
 
+import hashlib
+import importlib.machinery
+import importlib.util
 import inspect
+import json
+import linecache
+import logging
+import os
+import stat
+import sys
+import sysconfig
+import tempfile
+import threading
+from pathlib import Path
 from types import ModuleType
-from typing import Any, Dict, Optional, get_origin, get_args
+from typing import Any, Collection, Container, Dict, List, Optional, TextIO, Tuple, get_origin, get_args
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generated commands or the cache layout change
+_STATE_VERSION = 1
+
+# Keys written by the generator; any other key in an existing config is hand-written
+_GENERATED_TOP = frozenset({"description", "commands"})
+_GENERATED_COMMAND = frozenset({"name", "description", "args", "action"})
+_GENERATED_ARG = frozenset({"name", "type", "help", "default", "required"})
+
+# Installed code (stdlib, site-packages) is neither tracked nor re-imported
+_INSTALLED = tuple(
+    sorted({os.path.join(path, "") for path in map(sysconfig.get_path, ("stdlib", "platstdlib", "purelib", "platlib")) if path})
+)
 
 
 def _infer_type_name(annotation: Any) -> str:
@@ -31,7 +69,7 @@ def _infer_type_name(annotation: Any) -> str:
     return "json"
 
 
-def _build_command(name: str, func: Any) -> Dict[str, Any]:
+def _build_command(name: str, func: Any, resources: Container[str] = ()) -> Dict[str, Any]:
     sig = inspect.signature(func)
     doc = (func.__doc__ or "").strip().splitlines()[0] if func.__doc__ else ""
     args = []
@@ -39,6 +77,9 @@ def _build_command(name: str, func: Any) -> Dict[str, Any]:
         if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
             # skip *args/**kwargs
             continue
+        if param.name in resources:
+            # injected from RESOURCES, not a command-line argument
+            continue
         arg: Dict[str, Any] = {
             "name": param.name,
             "type": _infer_type_name(param.annotation),
@@ -58,24 +99,104 @@ def _build_command(name: str, func: Any) -> Dict[str, Any]:
     }
 
 
-def generate_config(module: ModuleType, actions_mapping: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def _source_key(name: str, func: Any, resources: Collection[str]) -> Optional[str]:
+    """Hash of everything :pyfunc:`_build_command` reads from *func*, or ``None``.
+
+    That is the source lines of the function's code, plus its docstring,
+    parameter names and the evaluated defaults and annotations, which may
+    come from names defined elsewhere (a docstring-only body spans just the
+    ``def`` line). Decorated functions are keyed by the function they wrap.
+    Callables without Python source (classes, partials, builtins) get no key
+    and are always introspected.
+    """
+    doc = getattr(func, "__doc__", None)
+    func = inspect.unwrap(func, stop=lambda f: hasattr(f, "__signature__"))
+    code = getattr(func, "__code__", None)
+    if code is None or not hasattr(code, "co_lines") or hasattr(func, "__signature__"):
+        return None
+    lines = linecache.getlines(code.co_filename)
+    if not lines:
+        return None
+    last = max((line for _, _, line in code.co_lines() if line is not None), default=code.co_firstlineno)
+    digest = hashlib.blake2b("".join(lines[code.co_firstlineno - 1:last]).encode("utf-8"), digest_size=16)
+    extra = (
+        _STATE_VERSION,
+        name,
+        sorted(resources),
+        doc,
+        code.co_varnames[: code.co_argcount + code.co_kwonlyargcount],
+        code.co_posonlyargcount,
+        code.co_flags,
+        func.__defaults__,
+        func.__kwdefaults__,
+        getattr(func, "__annotations__", None),
+    )
+    digest.update(repr(extra).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SignatureCache:
+    """Generated commands keyed by a hash of each function's source.
+
+    ``entries`` holds the commands used by the latest
+    :pyfunc:`generate_config` call (JSON-serialisable ones only, so they can
+    be stored), and ``introspected`` counts the functions that had to be
+    introspected.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self._previous = dict(entries or {})
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.introspected = 0
+
+    def command(self, name: str, func: Any, resources: Collection[str] = ()) -> Dict[str, Any]:
+        key = _source_key(name, func, resources)
+        command = None if key is None else self.entries.get(key) or self._previous.get(key)
+        if command is None:
+            self.introspected += 1
+            command = _build_command(name, func, resources)
+            if key is not None and _json_safe(command):
+                self.entries[key] = command
+        else:
+            self.entries[key] = command  # type: ignore[index]
+        return command
+
+
+def _json_safe(value: Any) -> bool:
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def generate_config(
+    module: ModuleType,
+    actions_mapping: Optional[Dict[str, Any]] = None,
+    cache: Optional[SignatureCache] = None,
+) -> Dict[str, Any]:
     """Generate a config dict from a module.
 
     If ``actions_mapping`` is provided, uses its keys as command names and
     values as callables. Otherwise, discovers top-level callables not starting
-    with an underscore.
+    with an underscore. Parameters named after an entry of the module's
+    ``RESOURCES`` are injected at run time and get no argument; the resource
+    factories themselves are not commands. With a ``cache``, functions whose
+    source did not change since it was filled are not introspected again.
     """
+    resources = getattr(module, "RESOURCES", None) or {}
+    factories = [id(factory) for factory in resources.values()]
+    build = _build_command if cache is None else cache.command
     commands = []
     if actions_mapping:
         for name, func in actions_mapping.items():
             if callable(func):
-                commands.append(_build_command(name, func))
+                commands.append(build(name, func, resources))
     else:
         for name, obj in module.__dict__.items():
-            if name.startswith("_"):
+            if name.startswith("_") or id(obj) in factories:
                 continue
             if callable(obj):
-                commands.append(_build_command(name, obj))
+                commands.append(build(name, obj, resources))
 
     return {
         "description": f"Generated config from {getattr(module, '__name__', 'module')}",
@@ -83,15 +204,388 @@ def generate_config(module: ModuleType, actions_mapping: Optional[Dict[str, Any]
     }
 
 
-def dump_config(cfg: Dict[str, Any], fmt: str = "yaml") -> str:
+def _merge_entry(
+    new: Dict[str, Any], old: Dict[str, Any], base: Optional[Dict[str, Any]], generated: Container[str]
+) -> Dict[str, Any]:
+    """*new* with the hand edits of *old*, in *old*'s key order.
+
+    Keys the generator never writes are kept from *old*. A generated key is
+    kept only if it differs from what was generated last time (*base*).
+    """
+    merged: Dict[str, Any] = {}
+    for key, value in old.items():
+        if key not in generated:
+            merged[key] = value
+        elif base is not None and (key not in base or base[key] != value):
+            merged[key] = value  # edited or added by hand
+        elif key in new:
+            merged[key] = new[key]
+    for key, value in new.items():
+        merged.setdefault(key, value)
+    return merged
+
+
+def _by(entries: Any, key: str) -> Dict[Any, Dict[str, Any]]:
+    index: Dict[Any, Dict[str, Any]] = {}
+    for entry in entries or ():
+        if isinstance(entry, dict):
+            index.setdefault(entry.get(key), entry)
+    return index
+
+
+def merge_config(
+    generated: Dict[str, Any], existing: Dict[str, Any], base: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Carry the hand edits of an *existing* config over into a *generated* one.
+
+    Commands are matched by ``action`` and arguments by ``name``; commands
+    and arguments that are no longer generated are dropped. Keys the
+    generator does not write (``rules``, ``choices``, ``schedule``, ...) are
+    always kept. Generated keys (``help``, ``type``, ``default``, ...) keep
+    their existing value when it differs from *base*, the config generated
+    last time; without a *base* they are regenerated.
+    """
+    old_commands = _by(existing.get("commands"), "action")
+    base_commands = _by((base or {}).get("commands"), "action")
+    commands = []
+    for command in generated["commands"]:
+        old = old_commands.get(command["action"])
+        if old is None:
+            commands.append(command)
+            continue
+        previous = base_commands.get(command["action"]) if base is not None else None
+        merged = _merge_entry(command, old, previous, _GENERATED_COMMAND - {"args"})
+        old_args = _by(old.get("args"), "name")
+        base_args = _by((previous or {}).get("args"), "name")
+        merged["args"] = [
+            _merge_entry(arg, old_args[arg["name"]], base_args.get(arg["name"]) if previous else None, _GENERATED_ARG)
+            if arg["name"] in old_args
+            else arg
+            for arg in command["args"]
+        ]
+        commands.append(merged)
+    merged_top = _merge_entry(generated, existing, base, _GENERATED_TOP - {"commands"})
+    merged_top["commands"] = commands
+    return merged_top
+
+
+def dump_config(cfg: Dict[str, Any], fmt: str = "yaml", fragments: Optional[Dict[str, str]] = None) -> str:
+    """Serialise *cfg* as YAML or JSON.
+
+    YAML is assembled from one fragment per command (the same text a single
+    dump produces). Pass ``fragments``, a dict of previously rendered
+    commands keyed by content digest, to reuse them; it is replaced by the
+    fragments of this output.
+    """
     fmt = fmt.lower()
     if fmt == "json":
-        import json
-
         return json.dumps(cfg, indent=2)
     elif fmt in ("yaml", "yml"):
         import yaml
 
-        return yaml.safe_dump(cfg, sort_keys=False)
+        commands = cfg.get("commands")
+        if not commands or not isinstance(commands, list) or list(cfg)[-1] != "commands":
+            return yaml.safe_dump(cfg, sort_keys=False)
+        previous = dict(fragments or {})
+        rendered: Dict[str, str] = {}
+        parts = [yaml.safe_dump({k: v for k, v in cfg.items() if k != "commands"}, sort_keys=False) if len(cfg) > 1 else ""]
+        parts.append("commands:\n")
+        for command in commands:
+            key = hashlib.blake2b(repr(command).encode("utf-8"), digest_size=16).hexdigest()
+            text = rendered.get(key) or previous.get(key)
+            if text is None:
+                text = yaml.safe_dump([command], sort_keys=False)
+            rendered[key] = text
+            parts.append(text)
+        if fragments is not None:
+            fragments.clear()
+            fragments.update(rendered)
+        return "".join(parts)
     raise ValueError("Unsupported format. Use 'yaml' or 'json'.")
 
+
+def load_module(path: str | Path) -> Tuple[ModuleType, bytes]:
+    """Execute the Python file at *path* as module ``actions``; returns it with the source bytes.
+
+    The module is compiled from source every time (``--watch`` may re-import
+    within the one-second resolution of a ``.pyc``), and ``linecache`` is
+    primed with exactly the executed source so source hashes match the code.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Module file not found: {path}")
+    source = path.read_bytes()
+    code = compile(source, str(path), "exec", dont_inherit=True)
+    _prime_linecache(str(path), source)
+    module = ModuleType("actions")
+    module.__file__ = str(path)
+    exec(code, module.__dict__)
+    return module, source
+
+
+def _prime_linecache(filename: str, source: bytes) -> None:
+    # No mtime: ``checkcache`` leaves the entry alone, so lines always match the executed code
+    text = source.decode("utf-8", errors="replace")
+    linecache.cache[filename] = (len(text), None, text.splitlines(True), filename)
+
+
+class _SourceLoader(importlib.machinery.SourceFileLoader):
+    """Loads a module from its source file, never from a cached ``.pyc``."""
+
+    source = b""
+
+    def get_code(self, fullname: str) -> Any:
+        self.source = self.get_data(self.path)
+        _prime_linecache(self.path, self.source)
+        return compile(self.source, self.path, "exec", dont_inherit=True)
+
+
+def _modules_by_file() -> Dict[str, Tuple[str, ModuleType]]:
+    index: Dict[str, Tuple[str, ModuleType]] = {}
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if isinstance(filename, str):
+            index.setdefault(os.path.abspath(filename), (name, module))
+    return index
+
+
+def _reload_modules(paths: Container[str]) -> Dict[str, str]:
+    """Re-execute the imported modules defined in *paths* from source.
+
+    The actions file is compiled afresh by :pyfunc:`load_module`, but the
+    modules it imports functions from would otherwise stay in ``sys.modules``
+    with their old code. Returns the digest of the source each one ran.
+    """
+    stale = [(name, filename) for filename, (name, _) in _modules_by_file().items() if filename in paths]
+    for name, _ in stale:
+        del sys.modules[name]
+    digests: Dict[str, str] = {}
+    for name, filename in stale:
+        if name in sys.modules:
+            continue  # imported again by a module reloaded before it
+        loader = _SourceLoader(name, filename)
+        spec = importlib.util.spec_from_file_location(name, filename, loader=loader)
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        sys.modules[name] = module
+        try:
+            loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        digests[filename] = _digest(loader.source)
+    return digests
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _file_digest(path: str | Path) -> Optional[str]:
+    try:
+        return _digest(Path(path).read_bytes())
+    except OSError:
+        return None
+
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "dynamic_cli_builder" / "generate"
+
+
+def _write_atomic(path: Path, data: bytes, shared: bool = False) -> None:
+    """Replace *path* with *data*; ``shared`` files keep their mode (or get the umask's), not 0600."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if shared:
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class IncrementalGenerator:
+    """Regenerates one config file from one actions file, reusing the last run.
+
+    The state of the last run (source digests, cached signatures and YAML
+    fragments, what was generated and what was written) is kept in
+    ``cache_dir``. When neither the source files that define commands nor
+    the output changed, :pyfunc:`run` returns without importing anything.
+    Otherwise it imports the actions, introspects only changed functions,
+    merges the hand edits of the existing output (:pyfunc:`merge_config`)
+    and rewrites the output if its content changed. Modules that only
+    provide type aliases or constants to the actions are not tracked.
+    """
+
+    def __init__(
+        self, actions_file: str | Path, output: str | Path, fmt: str = "yaml", cache_dir: str | Path | None = None
+    ) -> None:
+        self.actions_file = Path(actions_file).resolve()
+        self.output = Path(output)
+        self.fmt = fmt.lower()
+        key = _digest(f"{self.actions_file}\0{self.output.resolve()}".encode("utf-8"))
+        self.state_path = Path(cache_dir or _default_cache_dir()) / f"{key}.json"
+        self.introspected = 0
+        self.commands = 0
+        self._state: Optional[Dict[str, Any]] = None
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self._state is None:
+            try:
+                state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                state = {}
+            self._state = state if state.get("version") == _STATE_VERSION and state.get("format") == self.fmt else {}
+        return self._state
+
+    def _store_state(self, state: Dict[str, Any]) -> None:
+        self._state = state
+        try:
+            _write_atomic(self.state_path, json.dumps(state).encode("utf-8"))
+        except (OSError, TypeError, ValueError) as exc:
+            # Values YAML allows but JSON does not (dates, ...), read-only home: start over next time
+            logger.debug("Could not write generator state %s: %s", self.state_path, exc)
+            self._state = {}
+            try:
+                self.state_path.unlink()
+            except OSError:
+                pass
+
+    def sources(self) -> List[str]:
+        """Files whose changes trigger a regeneration."""
+        return sorted(set(self._load_state().get("sources", ())) | {str(self.actions_file)})
+
+    def up_to_date(self) -> bool:
+        """Whether the output is what the current sources would generate."""
+        state = self._load_state()
+        if not state or _file_digest(self.output) != state["output"]:
+            return False
+        return all(_file_digest(path) == digest for path, digest in state["sources"].items())
+
+    def _existing(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.output.read_bytes()
+        except FileNotFoundError:
+            return None
+        if state and _digest(data) == state["output"]:
+            return state["written"]  # untouched since written: no need to parse it
+        # Refuse to overwrite a file that cannot be read back, it may hold hand edits
+        if self.output.suffix == ".json":
+            try:
+                existing = json.loads(data)
+            except ValueError as exc:
+                raise ValueError(f"Cannot merge into {self.output}: {exc}") from exc
+        else:
+            import yaml
+
+            try:
+                existing = yaml.safe_load(data)
+            except yaml.YAMLError as exc:
+                raise ValueError(f"Cannot merge into {self.output}: {exc}") from exc
+        return existing if isinstance(existing, dict) else None
+
+    def run(self) -> bool:
+        """Bring the output up to date; ``True`` if it was rewritten."""
+        if self.up_to_date():
+            self.introspected = 0
+            return False
+        state = self._load_state()
+        linecache.checkcache()
+        actions_file = str(self.actions_file)
+        before = dict(sys.modules)
+        reloaded = _reload_modules({path for path in state.get("sources", ()) if path != actions_file})
+        module, source = load_module(self.actions_file)
+        cache = SignatureCache(state.get("signatures"))
+        generated = generate_config(module, getattr(module, "ACTIONS", None), cache)
+        self.introspected = cache.introspected
+        self.commands = len(generated["commands"])
+
+        existing = self._existing(state)
+        cfg = merge_config(generated, existing, state.get("generated")) if existing else generated
+        fragments = dict(state.get("fragments", {}))
+        content = dump_config(cfg, self.fmt, fragments).encode("utf-8")
+
+        # Digests of the code that actually ran; a module imported before this
+        # run (and not reloaded) gets none, so the next run re-imports it
+        sources: Dict[str, Optional[str]] = {actions_file: _digest(source)}
+        loaded = _modules_by_file()
+        for func in (getattr(module, "ACTIONS", None) or module.__dict__).values():
+            code = getattr(inspect.unwrap(func) if callable(func) else func, "__code__", None)
+            filename = getattr(code, "co_filename", None)
+            if not filename or not os.path.isfile(filename) or filename.startswith(_INSTALLED):
+                continue
+            filename = os.path.abspath(filename)
+            if filename in sources:
+                continue
+            if filename in reloaded:
+                sources[filename] = reloaded[filename]
+            else:
+                name, imported = loaded.get(filename, (None, None))
+                executed = imported is not None and before.get(name) is not imported  # type: ignore[arg-type]
+                sources[filename] = _file_digest(filename) if executed else None
+
+        written = content != (self.output.read_bytes() if self.output.exists() else None)
+        if written:
+            _write_atomic(self.output, content, shared=True)
+        self._store_state(
+            {
+                "version": _STATE_VERSION,
+                "format": self.fmt,
+                "sources": sources,
+                "output": _digest(content),
+                "signatures": cache.entries,
+                "fragments": fragments,
+                "generated": generated,
+                "written": cfg,
+            }
+        )
+        return written
+
+    def watch(self, interval: float = 0.5, stop: Optional[threading.Event] = None, log: Optional[TextIO] = None) -> None:
+        """Regenerate whenever a source file changes, until *stop* is set.
+
+        Errors (say, a half-saved actions file) are reported to *log* and the
+        watch goes on.
+        """
+        log = log or sys.stderr
+        stop = stop or threading.Event()
+
+        def _stamps(paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+            stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    stamps[path] = None
+                else:
+                    stamps[path] = (st.st_mtime_ns, st.st_size)
+            return stamps
+
+        seen: Optional[Dict[str, Optional[Tuple[int, int]]]] = None
+        while True:
+            paths = self.sources()
+            current = _stamps(paths)
+            if current != seen:
+                seen = current
+                try:
+                    if self.run():
+                        print(
+                            f"Regenerated {self.output} ({self.introspected} of {self.commands} functions introspected)",
+                            file=log,
+                            flush=True,
+                        )
+                except Exception as exc:  # noqa: BLE001 - keep watching
+                    print(f"Error: {exc}", file=log, flush=True)
+                if self.sources() != paths:
+                    seen = _stamps(self.sources())
+            if stop.wait(interval):
+                return
@@ -0,0 +1,178 @@
+"""Pre-rendered ``--help`` text.
+
+Rendering help through ``argparse`` means building the parser for every
+command and letting ``HelpFormatter`` wrap all of its text, which for large
+configs costs far more than printing the result. Help is therefore rendered
+once and reused:
+
+* :pyfunc:`render_command_help` renders one command's help from a parser for
+  that command alone (identical to the subparser's ``--help``), and
+  :pyfunc:`render_help` the top-level help from the full parser.
+* :class:`HelpCache` keeps rendered text on disk, keyed by a digest of the
+  config file's bytes, so ``dcb COMMAND --help`` is answered by hashing the
+  config and reading one small file: the config is not parsed, no parser is
+  built and the actions are not imported.
+* Bundles store the help of every command, rendered at build time (see
+  :pyfunc:`~dynamic_cli_builder.bundle.build_bundle`).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from dynamic_cli_builder.builder import GLOBAL_OPTIONS, add_command_arguments, build_cli
+from dynamic_cli_builder.loader import load_config
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HelpCache", "command_from_argv", "render_all", "render_command_help", "render_help"]
+
+# Bump when the layout of rendered help changes
+_HELP_FORMAT = 1
+
+# Rendered entries kept per config file, and config files kept per cache
+# directory; the oldest go first when a write would exceed them
+_MAX_ENTRIES = 64
+_MAX_FILES = 16
+
+# Global options that consume the following token
+_VALUE_FLAGS = frozenset(
+    flag for flags, options in GLOBAL_OPTIONS if options.get("action") != "store_true" for flag in flags
+)
+
+
+def render_help(config: Dict[str, Any] | ConfigSpec, prog: Optional[str] = None) -> str:
+    """Top-level help of the CLI built from *config*."""
+    parser = build_cli(config)
+    if prog is not None:
+        parser.prog = prog
+    return parser.format_help()
+
+
+def render_command_help(config: Dict[str, Any] | ConfigSpec, name: str, prog: Optional[str] = None) -> Optional[str]:
+    """Help of command *name* (``None`` if there is no such command).
+
+    Only that command's parser is built; the text is the same as
+    ``build_cli(config).parse_args([name, "--help"])`` prints.
+    """
+    command = as_spec(config).command(name)
+    if command is None:
+        return None
+    if prog is None:
+        prog = os.path.basename(sys.argv[0])
+    parser = argparse.ArgumentParser(prog=f"{prog} {name}", description=command.description)
+    add_command_arguments(parser, command)
+    return parser.format_help()
+
+
+def render_all(config: Dict[str, Any] | ConfigSpec, prog: str) -> Dict[str, str]:
+    """Help for the whole CLI: ``""`` maps to the top level, each command name to its own."""
+    spec = as_spec(config)
+    rendered = {"": render_help(spec, prog)}
+    for command in spec.commands:
+        rendered[command.name] = render_command_help(spec, command.name, prog)  # type: ignore[assignment]
+    return rendered
+
+
+def command_from_argv(tokens: Sequence[str]) -> Optional[str]:
+    """The command name in *tokens*, skipping the global options before it."""
+    skip = False
+    for token in tokens:
+        if skip:
+            skip = False
+        elif token[:1] != "-":
+            return token
+        else:
+            skip = token in _VALUE_FLAGS
+    return None
+
+
+def _terminal_columns() -> int:
+    # What argparse.HelpFormatter wraps to
+    return shutil.get_terminal_size().columns
+
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "dynamic_cli_builder" / "help"
+
+
+class HelpCache:
+    """On-disk help text for one config file.
+
+    Entries are keyed by program name, terminal width and command, in a file
+    named after a digest of the config's bytes (plus the Python version and
+    the global options), so editing the config simply starts a new file.
+    Rendering happens on a miss, for the requested command only. Each write
+    keeps the newest ``_MAX_ENTRIES`` entries of the file and the
+    ``_MAX_FILES`` most recently written files of the cache directory.
+    """
+
+    def __init__(self, config_file: str | Path, cache_dir: str | Path | None = None) -> None:
+        self.config_file = Path(config_file)
+        digest = hashlib.blake2b(self.config_file.read_bytes(), digest_size=16)
+        digest.update(repr((_HELP_FORMAT, sys.version_info[:2], GLOBAL_OPTIONS)).encode("utf-8"))
+        self.path = Path(cache_dir or _default_cache_dir()) / f"{digest.hexdigest()}.json"
+        self._entries: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _store(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError as exc:  # read-only home etc.: just render next time
+            logger.debug("Could not write help cache %s: %s", self.path, exc)
+            return
+        self._prune_files()
+
+    def _prune_files(self) -> None:
+        """Remove all but the ``_MAX_FILES`` newest files, e.g. those of earlier config versions."""
+        stamped = []
+        for path in self.path.parent.glob("*.json"):
+            try:
+                stamped.append((path.stat().st_mtime_ns, path))
+            except OSError:  # removed concurrently
+                continue
+        stamped.sort(reverse=True)
+        for _, path in stamped[_MAX_FILES:]:
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.debug("Could not remove stale help cache %s: %s", path, exc)
+
+    def get(self, command: Optional[str], prog: Optional[str] = None) -> Optional[str]:
+        """Help for *command* (``None``: top level); ``None`` if the command does not exist."""
+        if prog is None:
+            prog = os.path.basename(sys.argv[0])
+        key = f"{prog}\0{_terminal_columns()}\0{command or ''}"
+        entries = self._load()
+        text = entries.get(key)
+        if text is None:
+            config = load_config(self.config_file)
+            text = render_help(config, prog) if command is None else render_command_help(config, command, prog)
+            if text is None:
+                return None
+            entries[key] = text
+            for stale in list(entries)[: max(len(entries) - _MAX_ENTRIES, 0)]:
+                del entries[stale]
+            self._store()
+        return text
@@ -0,0 +1,145 @@
+"""Append-only journal of batch progress (``--batch ... --resume``).
+
+Every finished batch line is appended to the journal as one compact JSON
+object: the line number, a digest of the line's text, the status and a digest
+of the action's result::
+
+    {"i": 17, "h": "9c1e4f0a2b7d3e55", "s": "ok", "d": "5b0e1c..."}
+
+With ``--resume`` the journal is read back and every line recorded as ``ok``
+(same number, same text) is skipped; failed lines run again.
+
+Each record is handed to the OS with one ``write`` as soon as it is made, so
+a crashed or killed process loses nothing. ``fsync`` — the expensive part —
+is batched: it runs every *sync_every* records or *sync_interval* seconds and
+on close. After a power loss at most that last batch of lines runs again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Journal", "default_journal_path", "line_digest", "result_digest"]
+
+
+def line_digest(line: str) -> str:
+    """Short, stable digest identifying the text of a batch line."""
+    return hashlib.blake2b(line.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# Reused encoder: ``json.dumps`` with non-default options builds a new one per call
+_ENCODER = json.JSONEncoder(default=str, sort_keys=True)
+
+
+def result_digest(result: Any) -> str:
+    """Digest of an action result (its JSON form, ``str`` for anything else)."""
+    try:
+        data = _ENCODER.encode(result)
+    except (TypeError, ValueError):
+        data = repr(result)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Journal:
+    """Journal file for one batch run.
+
+    Parameters
+    ----------
+    path : str or Path
+        Journal location; created if missing.
+    resume : bool
+        Load the completed entries and append to the file. Otherwise the
+        journal is started afresh.
+    sync_every, sync_interval : int, float
+        ``fsync`` after this many records or seconds, whichever comes first.
+
+    Not thread-safe: :pyfunc:`~dynamic_cli_builder.batch.run_batch` records
+    from the single thread that collects outcomes.
+    """
+
+    def __init__(self, path: str | Path, resume: bool = False, sync_every: int = 1000, sync_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.completed: Set[Tuple[int, str]] = set()
+        end = 0
+        if resume:
+            self.completed, end = self._load()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (0 if resume else os.O_TRUNC)
+        self._fd = os.open(self.path, flags, 0o644)
+        if resume and os.fstat(self._fd).st_size > end:
+            # Drop a record torn by a crash, or the next one would be appended onto it
+            os.ftruncate(self._fd, end)
+        self.sync_every = max(sync_every, 1)
+        self.sync_interval = sync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _load(self) -> Tuple[Set[Tuple[int, str]], int]:
+        """Completed entries, and the size of the journal up to its last whole record."""
+        completed: Set[Tuple[int, str]] = set()
+        end = 0
+        try:
+            with open(self.path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # torn tail, truncated before appending
+                    end += len(raw)
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        # A record cut short by a crash; that line simply runs again
+                        continue
+                    if entry.get("s") == "ok":
+                        completed.add((entry["i"], entry["h"]))
+        except FileNotFoundError:
+            pass
+        logger.info("Journal %s: %d completed line(s)", self.path, len(completed))
+        return completed, end
+
+    def done(self, index: int, line: str) -> bool:
+        """Whether line *index* with this exact text already completed successfully."""
+        return bool(self.completed) and (index, line_digest(line)) in self.completed
+
+    def record(self, index: int, line: str, status: str, result: Any = None) -> None:
+        """Append the outcome of line *index*."""
+        # Every field is an int or a fixed word/hex string, so no JSON escaping is needed
+        if status == "ok":
+            record = f'{{"i":{index:d},"h":"{line_digest(line)}","s":"ok","d":"{result_digest(result)}"}}\n'
+        else:
+            record = f'{{"i":{index:d},"h":"{line_digest(line)}","s":"{status}"}}\n'
+        os.write(self._fd, record.encode("ascii"))
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force recorded entries to stable storage."""
+        if self._unsynced:
+            os.fsync(self._fd)
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.sync()
+            os.close(self._fd)
+            self._fd = None  # type: ignore[assignment]
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def default_journal_path(batch_file: str) -> Optional[Path]:
+    """Journal path used for *batch_file* when ``--journal`` is not given (``None`` for stdin)."""
+    if batch_file == "-":
+        return None
+    return Path(f"{batch_file}.journal")
@@ -11,7 +11,8 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, Optional, List
 
 import json
-import yaml
+
+from dynamic_cli_builder.schema import ConfigError, ConfigValidationError, config_validator  # noqa: F401
 
 def _discover_default(paths: Iterable[Path]) -> Optional[Path]:
     for p in paths:
@@ -20,16 +21,8 @@ def _discover_default(paths: Iterable[Path]) -> Optional[Path]:
     return None
 
 
-def load_config(config_file: str | Path | None = None) -> Dict[str, Any]:
-    """Load a configuration file (YAML or JSON).
-
-    Parameters
-    ----------
-    config_file : str | Path | None, optional
-        Path to configuration file. If *None*, the loader will search for
-        ``config.yaml``, ``config.yml`` or ``config.json`` in the current
-        working directory.
-    """
+def find_config(config_file: str | Path | None = None) -> Path:
+    """Return the config file :pyfunc:`load_config` would read, without reading it."""
     if config_file is None:
         config_file = _discover_default(
             [Path("config.yaml"), Path("config.yml"), Path("config.json")]
@@ -41,10 +34,25 @@ def load_config(config_file: str | Path | None = None) -> Dict[str, Any]:
 
     if not config_file.exists():
         raise FileNotFoundError(config_file)
+    return config_file
+
 
+def load_config(config_file: str | Path | None = None) -> Dict[str, Any]:
+    """Load a configuration file (YAML or JSON).
+
+    Parameters
+    ----------
+    config_file : str | Path | None, optional
+        Path to configuration file. If *None*, the loader will search for
+        ``config.yaml``, ``config.yml`` or ``config.json`` in the current
+        working directory.
+    """
+    config_file = find_config(config_file)
     suffix = config_file.suffix.lower()
     with config_file.open("r", encoding="utf-8") as f:
         if suffix in {".yml", ".yaml"}:
+            import yaml  # deferred: only YAML configs pay for the import
+
             cfg = yaml.safe_load(f)
         if suffix == ".json":
             cfg = json.load(f)
@@ -56,41 +64,28 @@ def load_config(config_file: str | Path | None = None) -> Dict[str, Any]:
 
 
 def _validate_config_structure(cfg: Dict[str, Any]) -> None:
-    """Basic structural validation of the configuration dictionary.
+    """Structural validation of the configuration dictionary.
+
+    Delegates to the compiled :pydata:`~dynamic_cli_builder.schema.CONFIG_SCHEMA`
+    validator, which reports every violation (with its JSON path) at once.
 
-    Raises ValueError with a human-readable message on invalid structures.
+    Raises
+    ------
+    ConfigValidationError
+        A :class:`ValueError` subclass whose message lists all errors.
     """
-    if not isinstance(cfg, dict):
-        raise ValueError("Config root must be a mapping (dict)")
-
-    commands = cfg.get("commands")
-    if not isinstance(commands, list) or not commands:
-        raise ValueError("'commands' must be a non-empty list")
-
-    for idx, cmd in enumerate(commands):
-        if not isinstance(cmd, dict):
-            raise ValueError(f"commands[{idx}] must be a mapping")
-        for key in ("name", "description", "args", "action"):
-            if key not in cmd:
-                raise ValueError(f"commands[{idx}] missing required key '{key}'")
-        if not isinstance(cmd["name"], str) or not cmd["name"]:
-            raise ValueError(f"commands[{idx}].name must be a non-empty string")
-        if not isinstance(cmd["description"], str):
-            raise ValueError(f"commands[{idx}].description must be a string")
-        if not isinstance(cmd["action"], str) or not cmd["action"]:
-            raise ValueError(f"commands[{idx}].action must be a non-empty string")
-
-        args = cmd["args"]
-        if not isinstance(args, list):
-            raise ValueError(f"commands[{idx}].args must be a list")
-        for aidx, arg in enumerate(args):
-            if not isinstance(arg, dict):
-                raise ValueError(f"commands[{idx}].args[{aidx}] must be a mapping")
-            if "name" not in arg or "type" not in arg:
-                raise ValueError(f"commands[{idx}].args[{aidx}] requires 'name' and 'type'")
-            if not isinstance(arg["name"], str) or not isinstance(arg["type"], str):
-                raise ValueError(f"commands[{idx}].args[{aidx}].name/type must be strings")
-            if "rules" in arg and not isinstance(arg["rules"], dict):
-                raise ValueError(f"commands[{idx}].args[{aidx}].rules must be a mapping if present")
-            if "choices" in arg and not isinstance(arg["choices"], list):
-                raise ValueError(f"commands[{idx}].args[{aidx}].choices must be a list if present")
+    errors = config_validator().errors(cfg)
+    if not errors:
+        errors = _reference_errors(cfg)
+    if errors:
+        raise ConfigValidationError(errors)
+
+
+def _reference_errors(cfg: Dict[str, Any]) -> List[ConfigError]:
+    """Cross-field checks the schema cannot express (on a structurally valid config)."""
+    errors: List[ConfigError] = []
+    for i, command in enumerate(cfg["commands"]):
+        pipe_arg = command.get("pipe_arg")
+        if pipe_arg is not None and pipe_arg not in {arg["name"] for arg in command["args"]}:
+            errors.append(ConfigError(f"$.commands[{i}].pipe_arg", f"'{pipe_arg}' is not an argument of '{command['name']}'"))
+    return errors
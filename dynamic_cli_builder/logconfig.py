@@ -0,0 +1,146 @@
+"""Process-wide logging setup for *Dynamic CLI Builder*.
+
+:pyfunc:`configure_logging` installs a single root handler the first time it
+is called and afterwards only adjusts the level, so calling it on every
+``execute_command`` (as the shell, pipeline and sweep modes do) costs a level
+comparison rather than a handler rebuild.
+
+Two optional modes keep log I/O off the dispatch path:
+
+* ``queue=True`` routes records through a :class:`~logging.handlers.QueueHandler`
+  to a :class:`~logging.handlers.QueueListener` thread. Only the message
+  interpolation happens in the calling thread; timestamps, format strings,
+  tracebacks and the actual write run in the background.
+* ``fmt="json"`` emits one JSON object per record for structured log sinks.
+
+Records below the configured level are discarded by :pymod:`logging` before
+any formatting takes place.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue as _queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+__all__ = ["LOG_FORMATS", "JsonFormatter", "configure_logging"]
+
+LOG_FORMATS = ("text", "json")
+_TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stdlib version runs the full formatter in the caller. Here only the
+    ``msg % args`` interpolation is done eagerly (so later mutation of the
+    arguments cannot change the message); everything else is deferred.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _State:
+    """What :pyfunc:`configure_logging` installed, if anything."""
+
+    __slots__ = ("handler", "listener", "fmt", "queue", "foreign")
+
+    def __init__(self) -> None:
+        self.handler: Optional[logging.Handler] = None
+        self.listener: Optional[QueueListener] = None
+        self.fmt: Optional[str] = None
+        self.queue = False
+        self.foreign = False
+
+
+_STATE = _State()
+
+
+# configure_logging runs from sweep/scheduler worker threads too; reentrant
+# because switching modes tears down from inside configure_logging
+_LOCK = threading.RLock()
+
+
+def _teardown() -> None:
+    with _LOCK:
+        root = logging.getLogger()
+        if _STATE.listener is not None:
+            _STATE.listener.stop()
+        if _STATE.handler is not None:
+            root.removeHandler(_STATE.handler)
+        _STATE.__init__()  # type: ignore[misc]
+
+
+def _install(fmt: str, use_queue: bool) -> None:
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(_TEXT_FORMAT))
+    if use_queue:
+        records: "_queue.SimpleQueue[Any]" = _queue.SimpleQueue()
+        handler: logging.Handler = _DeferredQueueHandler(records)
+        _STATE.listener = QueueListener(records, stream_handler, respect_handler_level=True)
+        _STATE.listener.start()
+    else:
+        handler = stream_handler
+    logging.getLogger().addHandler(handler)
+    _STATE.handler = handler
+    _STATE.fmt = fmt
+    _STATE.queue = use_queue
+
+
+def configure_logging(level: str = "WARNING", fmt: str = "text", queue: bool = False) -> None:
+    """Configure the root logger according to *level* string.
+
+    The handler is created once per process. Repeated calls with the same
+    *fmt*/*queue* only update the level; changing either swaps the handler.
+    If the application already attached its own root handlers before the
+    first call, they are left alone (as :pyfunc:`logging.basicConfig` does).
+    """
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unsupported log format '{fmt}'; use one of {', '.join(LOG_FORMATS)}")
+    root = logging.getLogger()
+
+    with _LOCK:
+        if _STATE.handler is None and not _STATE.foreign:
+            if root.handlers:
+                _STATE.foreign = True
+                return
+            _install(fmt, queue)
+        elif _STATE.foreign:
+            return
+        elif (_STATE.fmt, _STATE.queue) != (fmt, queue):
+            _teardown()
+            _install(fmt, queue)
+
+        numeric = getattr(logging, level)
+        if root.level != numeric:
+            root.setLevel(numeric)
+
+
+# Drain the queue before the interpreter tears down stderr
+atexit.register(_teardown)
@@ -0,0 +1,133 @@
+"""Streaming output of action results.
+
+:pyfunc:`write_result` writes whatever an action returned to a text stream.
+Iterables and generators are consumed one item at a time and written in
+small buffered chunks, so a command producing millions of rows runs in
+constant memory and its first rows appear right away. Writes block when the
+reader is slow, which in turn pauses the generator (natural backpressure).
+
+If the reader goes away (``dcb ... | head``) the generator is closed, stdout
+is pointed at ``/dev/null`` so the interpreter's final flush cannot fail
+again, and :class:`BrokenPipeError` propagates to the caller.
+"""
+from __future__ import annotations
+
+import collections.abc
+import csv
+import io
+import json
+import os
+import sys
+import time
+from typing import Any, Iterable, Iterator, List, Optional, TextIO
+
+__all__ = ["OUTPUT_FORMATS", "write_result"]
+
+OUTPUT_FORMATS = ("text", "jsonl", "csv")
+
+_CHUNK_ROWS = 512
+_CHUNK_SECONDS = 0.1
+
+
+def _is_stream(result: Any) -> bool:
+    """Whether *result* should be written item by item."""
+    if isinstance(result, (str, bytes, bytearray, dict)):
+        return False
+    return hasattr(result, "__iter__")
+
+
+def _materialised(result: Any) -> Any:
+    """*result*, with a one-shot iterator (e.g. a generator) consumed into a list.
+
+    Batch and sweep runs report results instead of streaming them, so the
+    iterator's body must run inside the worker call, where its exceptions
+    count as failures.
+    """
+    if isinstance(result, collections.abc.Iterator):
+        return list(result)
+    return result
+
+
+def _format_rows(rows: Iterable[Any], fmt: str) -> Iterator[str]:
+    if fmt == "text":
+        for row in rows:
+            yield f"{row}\n"
+    elif fmt == "jsonl":
+        dumps = json.dumps
+        for row in rows:
+            yield dumps(row, default=str) + "\n"
+    elif fmt == "csv":
+        buf = io.StringIO()
+        writer: Any = None
+        fields: Optional[List[Any]] = None
+        for row in rows:
+            if writer is None:
+                if isinstance(row, dict):
+                    fields = list(row)
+                    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore")
+                    writer.writeheader()
+                else:
+                    writer = csv.writer(buf)
+            if fields is None:
+                writer.writerow(row if isinstance(row, (list, tuple)) else [row])
+            else:
+                writer.writerow(row)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    else:
+        raise ValueError(f"Unsupported output format '{fmt}'; use one of {', '.join(OUTPUT_FORMATS)}")
+
+
+def _silence_stdout() -> None:
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, sys.stdout.fileno())
+    except (AttributeError, OSError, ValueError):  # pragma: no cover - stdout without a real fd
+        pass
+    finally:
+        os.close(devnull)
+
+
+def write_result(result: Any, fmt: str = "text", stream: Optional[TextIO] = None) -> int:
+    """Write *result* to *stream* (stdout by default) and return the row count.
+
+    ``None`` writes nothing; strings, bytes, mappings and other scalars are
+    written as a single row; any other iterable is streamed.
+
+    Raises
+    ------
+    BrokenPipeError
+        When the reading end of the pipe was closed.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}'; use one of {', '.join(OUTPUT_FORMATS)}")
+    if result is None:
+        return 0
+    out = sys.stdout if stream is None else stream
+    rows = result if _is_stream(result) else (result,)
+
+    count = 0
+    chunk: List[str] = []
+    last_flush = time.monotonic()
+    try:
+        for line in _format_rows(rows, fmt):
+            chunk.append(line)
+            count += 1
+            # Flush by size, or by age so slow producers still show progress
+            if len(chunk) >= _CHUNK_ROWS or time.monotonic() - last_flush >= _CHUNK_SECONDS or count == 1:
+                out.write("".join(chunk))
+                out.flush()
+                chunk.clear()
+                last_flush = time.monotonic()
+        if chunk:
+            out.write("".join(chunk))
+        out.flush()
+    except BrokenPipeError:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+        if out is sys.stdout:
+            _silence_stdout()
+        raise
+    return count
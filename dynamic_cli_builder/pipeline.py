@@ -0,0 +1,101 @@
+"""In-process command pipelines.
+
+A pipeline is a command line containing ``|`` tokens, e.g.::
+
+    dcb produce --n 10 '|' double '|' total
+
+Every stage is parsed with the regular parser, except that after the first
+stage a required ``pipe_arg`` may be left out, then the stages run in the
+same process: the Python object returned by one action is handed to the next
+action as an argument, with no text serialisation in between. Generators are
+passed through untouched, so stages that consume and yield lazily stream
+values one at a time instead of materialising whole datasets.
+
+The receiving argument is the command's ``pipe_arg`` when configured,
+otherwise its first argument that was not given on the command line.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Any, Callable, Dict, List, Sequence
+
+from dynamic_cli_builder.builder import build_cli, build_command_cli, execute_command
+from dynamic_cli_builder.helpcache import command_from_argv
+from dynamic_cli_builder.spec import CommandSpec, ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PIPE", "split_pipeline", "run_pipeline"]
+
+PIPE = "|"
+
+
+def split_pipeline(tokens: Sequence[str]) -> List[List[str]]:
+    """Split *tokens* on ``|`` into one token list per stage."""
+    stages: List[List[str]] = [[]]
+    for token in tokens:
+        if token == PIPE:
+            stages.append([])
+        else:
+            stages[-1].append(token)
+    if any(not stage for stage in stages):
+        raise ValueError("Empty pipeline stage: every '|' must sit between two commands")
+    return stages
+
+
+def _pipe_target(command: CommandSpec, parsed_args: argparse.Namespace) -> str:
+    """Return the argument of *command* that receives the upstream value."""
+    if command.pipe_arg:
+        return command.pipe_arg
+    for name in command.arg_names:
+        if getattr(parsed_args, name, None) is None:
+            return name
+    raise ValueError(
+        f"Command '{command.name}' has no free argument to receive piped input; "
+        "leave one unset or configure 'pipe_arg'"
+    )
+
+
+def _stage_parser(
+    spec: ConfigSpec, parser: argparse.ArgumentParser, stage: Sequence[str], idx: int
+) -> argparse.ArgumentParser:
+    """*parser*, unless the stage receives piped input into a required ``pipe_arg``."""
+    command = spec.command(command_from_argv(stage) or "") if idx else None
+    if command is None or command.pipe_arg is None:
+        return parser
+    pipe_arg = command.pipe_arg
+    if not any(arg.required for arg in command.args if arg.name == pipe_arg):
+        return parser
+    return build_command_cli(command, optional=(pipe_arg,))
+
+
+def run_pipeline(
+    stages: Sequence[Sequence[str]],
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    parser: argparse.ArgumentParser | None = None,
+) -> Any:
+    """Run *stages* in-process, feeding each action's result to the next.
+
+    All stages are parsed (and validated) before the first action runs, so a
+    typo in a late stage does not leave earlier side effects behind.
+
+    Returns
+    -------
+    Any
+        The return value of the last stage.
+    """
+    spec = as_spec(config)
+    if parser is None:
+        parser = build_cli(spec)
+    parsed = [_stage_parser(spec, parser, stage, idx).parse_args(list(stage)) for idx, stage in enumerate(stages)]
+
+    result: Any = None
+    for idx, parsed_args in enumerate(parsed):
+        if idx:
+            target = _pipe_target(spec.index[parsed_args.command], parsed_args)
+            logger.debug("Piping %s into %s.%s", type(result).__name__, parsed_args.command, target)
+            setattr(parsed_args, target, result)
+        result = execute_command(parsed_args, spec, ACTIONS)
+    return result
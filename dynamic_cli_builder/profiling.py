@@ -0,0 +1,223 @@
+"""Per-action memory profiling (``--memprofile``).
+
+:pyfunc:`memory_profile` wraps one action call with :pymod:`tracemalloc` and
+RSS readings and produces a :class:`MemoryReport`: peak traced allocation
+during the call, resident set size before/after, and the source lines that
+retained the most memory once the call returned.
+
+Every report is also folded into per-action totals in the process-wide
+:pydata:`TRACKER`, so long-running modes (shell, sweeps, batches) can show how
+RSS evolves across repeated invocations of the same action, which is where
+slow leaks become visible.
+
+Concurrent profiled calls share tracemalloc's counters; run sweeps with
+``--sweep-jobs 1`` when exact per-call peaks matter.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+__all__ = [
+    "MemoryReport",
+    "MemoryTracker",
+    "TRACKER",
+    "current_rss",
+    "format_report",
+    "format_summary",
+    "memory_profile",
+]
+
+_TOP_SITES = 5
+
+
+class MemoryReport(NamedTuple):
+    """Memory figures for one action call (bytes)."""
+
+    action: str
+    peak: int
+    rss_before: Optional[int]
+    rss_after: Optional[int]
+    top: List[Tuple[str, int, int]]  # (file:line, retained bytes, retained blocks)
+
+    @property
+    def rss_delta(self) -> Optional[int]:
+        if self.rss_before is None or self.rss_after is None:
+            return None
+        return self.rss_after - self.rss_before
+
+
+def current_rss() -> Optional[int]:
+    """Return the current resident set size in bytes, if the platform exposes it."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    # Peak rather than current RSS: KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+# Profiled calls may overlap (sweeps); tracing is started by the first one
+# and stopped by the last, unless something else had started it already.
+_lock = threading.Lock()
+_active = 0
+_started_here = False
+
+# Allocations made by the profiler itself are not interesting
+_OWN_FILES = (tracemalloc.__file__, __file__)
+
+
+def _start_tracing() -> None:
+    global _active, _started_here
+    with _lock:
+        if _active == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_here = True
+        _active += 1
+
+
+def _stop_tracing() -> None:
+    global _active, _started_here
+    with _lock:
+        _active -= 1
+        if _active == 0 and _started_here:
+            tracemalloc.stop()
+            _started_here = False
+
+
+class _Profile:
+    """Mutable holder yielded by :pyfunc:`memory_profile`."""
+
+    __slots__ = ("report",)
+
+    def __init__(self) -> None:
+        self.report: Optional[MemoryReport] = None
+
+
+@contextmanager
+def memory_profile(action: str, top: int = _TOP_SITES, tracker: Optional["MemoryTracker"] = None) -> Iterator[_Profile]:
+    """Profile the enclosed block; the report is available on the yielded object afterwards."""
+    profile = _Profile()
+    _start_tracing()
+    rss_before = current_rss()
+    before = tracemalloc.take_snapshot()
+    start_current = tracemalloc.get_traced_memory()[0]
+    reset_peak = getattr(tracemalloc, "reset_peak", None)  # Python 3.9+
+    if reset_peak is not None:
+        reset_peak()
+    try:
+        yield profile
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+        rss_after = current_rss()
+        _stop_tracing()
+
+        # Retained growth per line: what the call left behind, largest first
+        sites = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+            for stat in after.compare_to(before, "lineno")
+            if stat.size_diff > 0 and stat.traceback[0].filename not in _OWN_FILES
+        ][:top]
+        profile.report = MemoryReport(action, max(peak - start_current, 0), rss_before, rss_after, sites)
+        (TRACKER if tracker is None else tracker).record(profile.report)
+
+
+class _ActionStats:
+    """Running totals of one action's reports."""
+
+    __slots__ = ("calls", "max_peak", "rss_first", "rss_last")
+
+    def __init__(self, report: MemoryReport) -> None:
+        self.calls = 0
+        self.max_peak = report.peak
+        self.rss_first = report.rss_before
+        self.rss_last = report.rss_after
+
+
+class MemoryTracker:
+    """Accumulate :class:`MemoryReport` per action across invocations.
+
+    Only running totals are kept, not the reports themselves, so the tracker
+    stays the same size however many calls it sees.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _ActionStats] = {}
+
+    def record(self, report: MemoryReport) -> None:
+        with self._lock:
+            stats = self._stats.get(report.action)
+            if stats is None:
+                stats = self._stats[report.action] = _ActionStats(report)
+            stats.calls += 1
+            stats.max_peak = max(stats.max_peak, report.peak)
+            stats.rss_last = report.rss_after
+
+    def __bool__(self) -> bool:
+        return bool(self._stats)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One entry per action: call count, peak, and RSS growth across calls."""
+        with self._lock:
+            return [
+                {
+                    "action": action,
+                    "calls": stats.calls,
+                    "max_peak": stats.max_peak,
+                    "rss_first": stats.rss_first,
+                    "rss_last": stats.rss_last,
+                    "rss_growth": None if stats.rss_first is None or stats.rss_last is None else stats.rss_last - stats.rss_first,
+                }
+                for action, stats in self._stats.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+TRACKER = MemoryTracker()
+
+
+def _size(n: Optional[int]) -> str:
+    if n is None:
+        return "n/a"
+    sign = "-" if n < 0 else ""
+    value = float(abs(n))
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{sign}{value:.1f} {unit}" if unit != "B" else f"{sign}{int(value)} B"
+        value /= 1024
+    return f"{n} B"  # pragma: no cover
+
+
+def format_report(report: MemoryReport) -> str:
+    """Render *report* as a short human-readable block."""
+    lines = [
+        f"[memprofile] {report.action}: peak {_size(report.peak)}, "
+        f"rss {_size(report.rss_before)} -> {_size(report.rss_after)} ({_size(report.rss_delta)})"
+    ]
+    for site, size, count in report.top:
+        lines.append(f"  {site}: +{_size(size)} in {count} block(s)")
+    return "\n".join(lines)
+
+
+def format_summary(tracker: MemoryTracker = TRACKER) -> str:
+    """Render the RSS growth of every profiled action across its invocations."""
+    return "\n".join(
+        f"[memprofile] {s['action']}: {s['calls']} call(s), max peak {_size(s['max_peak'])}, "
+        f"rss growth {_size(s['rss_growth'])}"
+        for s in tracker.summary()
+    )
@@ -0,0 +1,215 @@
+"""Shared resources injected into actions (``RESOURCES``).
+
+An actions module may define, next to ``ACTIONS``, a ``RESOURCES`` dict of
+factories for things that are expensive to create — database connections,
+HTTP sessions, clients::
+
+    def db():
+        conn = connect(DSN)          # setup, once
+        yield conn
+        conn.close()                 # teardown, at exit
+
+    @resource(scope="thread")
+    def http():
+        return requests.Session()
+
+    def report(day: int, db) -> None:  # ``db`` is injected, ``day`` from the CLI
+        ...
+
+    ACTIONS = {"report": report}
+    RESOURCES = {"db": db, "http": http}
+
+A factory may return the resource, return a context manager (entered on
+setup, exited on teardown) or be a generator (code after ``yield`` is the
+teardown). Resources are created on first use and then reused by every
+invocation in the process — which is what makes shell, sweep and batch runs
+cheaper — or, with ``scope="thread"``, once per worker thread, torn down when
+that thread ends (so when a sweep's or batch's executor finishes).
+
+:pyfunc:`~dynamic_cli_builder.builder.execute_command` passes a resource to
+every action parameter of the same name that is not a CLI argument. The pool
+is process-wide (:pyfunc:`use_resources`) and is torn down at exit.
+"""
+from __future__ import annotations
+
+import atexit
+import inspect
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RESOURCE_SCOPES", "ResourcePool", "current_pool", "resource", "use_resources"]
+
+RESOURCE_SCOPES = ("process", "thread")
+
+
+def resource(scope: str = "process") -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Mark a factory's scope: one instance per ``"process"`` (default) or per ``"thread"``."""
+    if scope not in RESOURCE_SCOPES:
+        raise ValueError(f"Unknown resource scope '{scope}'; use one of {', '.join(RESOURCE_SCOPES)}")
+
+    def _mark(factory: Callable[[], Any]) -> Callable[[], Any]:
+        factory.__dcb_scope__ = scope  # type: ignore[attr-defined]
+        return factory
+
+    return _mark
+
+
+def _setup(factory: Callable[[], Any]) -> Tuple[Any, Optional[Callable[[], None]]]:
+    """Create a resource; return it with its teardown callable (if any)."""
+    made = factory()
+    if inspect.isgenerator(made):
+        value = next(made)
+
+        def _finish() -> None:
+            try:
+                next(made)
+            except StopIteration:
+                return
+            made.close()
+            raise RuntimeError(f"Resource factory {factory.__name__} yielded more than once")
+
+        return value, _finish
+    if hasattr(made, "__enter__") and hasattr(made, "__exit__"):
+        return made.__enter__(), lambda: made.__exit__(None, None, None)
+    return made, None
+
+
+def _run_teardowns(teardowns: List[Tuple[str, Callable[[], None]]]) -> None:
+    """Run *teardowns* most recent first, logging (not raising) errors."""
+    while teardowns:
+        name, teardown = teardowns.pop()
+        try:
+            teardown()
+        except Exception:  # noqa: BLE001 - keep tearing the others down
+            logger.exception("Error tearing down resource %s", name)
+
+
+class _ThreadScope:
+    """The thread-scoped instances of one thread."""
+
+    __slots__ = ("values", "teardowns", "__weakref__")
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.teardowns: List[Tuple[str, Callable[[], None]]] = []
+
+
+class ResourcePool:
+    """Lazily created, shared instances of the factories in *resources*."""
+
+    def __init__(self, resources: Dict[str, Callable[[], Any]]) -> None:
+        for name, factory in resources.items():
+            if not callable(factory):
+                raise ValueError(f"Resource '{name}' must be a callable factory")
+        self.factories = dict(resources)
+        self._lock = threading.Lock()
+        self._teardown_lock = threading.Lock()
+        self._shared: Dict[str, Any] = {}
+        self._local = threading.local()
+        self._teardowns: List[Tuple[str, Callable[[], None]]] = []
+        # Tear down a thread's instances when its _ThreadScope goes with the thread
+        self._finalizers: List[weakref.finalize] = []
+        # (action, CLI argument names) -> names of its parameters that are resources
+        self._wants: Dict[Tuple[Callable[..., Any], Tuple[str, ...]], Tuple[str, ...]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.factories
+
+    def get(self, name: str) -> Any:
+        """Return resource *name*, creating it on first use in its scope."""
+        factory = self.factories[name]
+        if getattr(factory, "__dcb_scope__", "process") == "thread":
+            scope = self._thread_scope()
+            if name not in scope.values:
+                logger.debug("Setting up resource %s for %s", name, threading.current_thread().name)
+                value, teardown = _setup(factory)
+                if teardown is not None:
+                    scope.teardowns.append((name, teardown))
+                scope.values[name] = value
+            return scope.values[name]
+        try:
+            return self._shared[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._shared:
+                logger.debug("Setting up resource %s", name)
+                value, teardown = _setup(factory)
+                if teardown is not None:
+                    with self._teardown_lock:
+                        self._teardowns.append((name, teardown))
+                self._shared[name] = value
+        return self._shared[name]
+
+    def _thread_scope(self) -> _ThreadScope:
+        scope = getattr(self._local, "scope", None)
+        if scope is None:
+            scope = self._local.scope = _ThreadScope()
+            finalizer = weakref.finalize(scope, _run_teardowns, scope.teardowns)
+            with self._teardown_lock:
+                self._finalizers = [f for f in self._finalizers if f.alive]
+                self._finalizers.append(finalizer)
+        return scope
+
+    def wanted_by(self, func: Callable[..., Any], cli_args: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Names of *func*'s parameters that should be injected (CLI arguments win)."""
+        key = (func, cli_args)
+        try:
+            return self._wants[key]
+        except (KeyError, TypeError):
+            pass
+        params: Mapping[str, inspect.Parameter]
+        try:
+            params = inspect.signature(func).parameters
+        except (TypeError, ValueError):  # builtins without a signature
+            params = {}
+        wants = tuple(
+            name for name, param in params.items()
+            if name in self.factories and name not in cli_args
+            and param.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        )
+        try:
+            self._wants[key] = wants
+        except TypeError:  # unhashable callable
+            pass
+        return wants
+
+    def close(self) -> None:
+        """Tear resources down, most recently created first (thread-scoped ones before shared)."""
+        with self._lock, self._teardown_lock:
+            teardowns, self._teardowns = self._teardowns, []
+            finalizers, self._finalizers = self._finalizers, []
+            self._shared.clear()
+            self._local = threading.local()
+        for finalizer in reversed(finalizers):
+            finalizer()
+        _run_teardowns(teardowns)
+
+
+_CURRENT: Optional[ResourcePool] = None
+
+
+def use_resources(resources: Optional[Dict[str, Callable[[], Any]]]) -> Optional[ResourcePool]:
+    """Make *resources* the process-wide pool (closing the previous one) and return it."""
+    global _CURRENT
+    if _CURRENT is not None:
+        _CURRENT.close()
+    _CURRENT = ResourcePool(resources) if resources else None
+    return _CURRENT
+
+
+def current_pool() -> Optional[ResourcePool]:
+    """The process-wide pool installed by :pyfunc:`use_resources`, if any."""
+    return _CURRENT
+
+
+def _close_current() -> None:
+    if _CURRENT is not None:
+        _CURRENT.close()
+
+
+atexit.register(_close_current)
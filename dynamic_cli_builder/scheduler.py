@@ -0,0 +1,257 @@
+"""Scheduling of many invocations in one process (used by ``--batch``).
+
+:class:`Scheduler` sits between a stream of parsed invocations and
+:pyfunc:`~dynamic_cli_builder.builder.execute_command`. Each command's
+optional ``schedule`` mapping in the config controls how its invocations run:
+
+.. code-block:: yaml
+
+    - name: fetch
+      action: fetch
+      schedule:
+        priority: 10          # higher runs first (default 0)
+        concurrency: 2        # at most 2 fetches at once
+        rate: 5               # token bucket: 5 starts per second ...
+        burst: 10             # ... with bursts of up to 10
+        retries: 3            # retry up to 3 times ...
+        retry_on: [TimeoutError, ConnectionError]   # ... for these exceptions
+        backoff: 0.5          # wait 0.5s, 1s, 2s, ... between attempts
+        max_backoff: 30
+
+Invocations are read lazily into a bounded lookahead window and ordered by
+priority within it. A source that is fed from elsewhere (a distributed worker,
+see :pymod:`~dynamic_cli_builder.distributed`) may yield ``None`` when it has
+nothing ready; it is then asked again shortly while slots are free. A task that is blocked by its command's concurrency cap,
+rate limit or retry backoff does not hold up ready tasks of other commands.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from dynamic_cli_builder.builder import execute_command
+from dynamic_cli_builder.output import _materialised
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CommandPolicy", "Outcome", "Scheduler", "TokenBucket"]
+
+# How soon a source that yielded ``None`` is asked again
+_POLL_INTERVAL = 0.01
+
+
+class TokenBucket:
+    """Classic token bucket: *rate* tokens per second, holding at most *burst*."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int = 1, now: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now: float) -> float:
+        """Take one token; return ``0.0`` on success or the seconds until one is available."""
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class CommandPolicy:
+    """Scheduling settings of one command, built from its ``schedule`` mapping."""
+
+    __slots__ = ("priority", "concurrency", "rate", "burst", "retries", "backoff", "max_backoff", "retry_on")
+
+    def __init__(self, schedule: Optional[Mapping[str, Any]] = None) -> None:
+        schedule = schedule or {}
+        self.priority: int = schedule.get("priority", 0)
+        self.concurrency: Optional[int] = schedule.get("concurrency")
+        self.rate: Optional[float] = schedule.get("rate")
+        self.burst: int = schedule.get("burst", 1)
+        self.retries: int = schedule.get("retries", 0)
+        self.backoff: float = schedule.get("backoff", 1.0)
+        self.max_backoff: float = schedule.get("max_backoff", 60.0)
+        self.retry_on = frozenset(schedule.get("retry_on", ()))
+
+    def should_retry(self, exc: BaseException, attempts: int) -> bool:
+        """Whether a task that raised *exc* on attempt number *attempts* runs again."""
+        if attempts > self.retries or not isinstance(exc, Exception):
+            return False
+        # Match by class name (``TimeoutError``) or qualified name, including base classes
+        return any(
+            cls.__name__ in self.retry_on or f"{cls.__module__}.{cls.__qualname__}" in self.retry_on
+            for cls in type(exc).__mro__
+        )
+
+    def delay(self, attempts: int) -> float:
+        """Backoff before attempt ``attempts + 1``: ``backoff * 2 ** (attempts - 1)``, capped."""
+        return min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+
+
+class Outcome(NamedTuple):
+    """Final result of one scheduled invocation (after any retries)."""
+
+    key: Any
+    status: str  # "ok" or "error"
+    result: Any
+    error: Optional[BaseException]
+    attempts: int
+    elapsed_ms: float
+
+
+class _Task:
+    __slots__ = ("key", "args", "command", "policy", "attempts", "not_before", "elapsed")
+
+    def __init__(self, key: Any, args: argparse.Namespace, policy: CommandPolicy) -> None:
+        self.key = key
+        self.args = args
+        self.command: str = args.command
+        self.policy = policy
+        self.attempts = 0
+        self.not_before = 0.0
+        self.elapsed = 0.0
+
+
+class Scheduler:
+    """Run parsed invocations on a thread pool under per-command policies.
+
+    Parameters
+    ----------
+    config : dict or ConfigSpec
+        Provides each command's ``schedule`` policy.
+    jobs : int
+        Worker threads, i.e. the global concurrency limit.
+    lookahead : int
+        How many queued-but-not-finished invocations are held at once;
+        priorities are honoured within this window.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any] | ConfigSpec,
+        ACTIONS: Dict[str, Callable[..., Any]],
+        jobs: int = 4,
+        lookahead: int = 1024,
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("--batch-jobs must be at least 1")
+        self.spec = as_spec(config)
+        self.actions = ACTIONS
+        self.jobs = jobs
+        self.lookahead = max(lookahead, jobs)
+        self.policies = {command.name: CommandPolicy(command.schedule) for command in self.spec.commands}
+        self.buckets = {
+            name: TokenBucket(policy.rate, policy.burst)
+            for name, policy in self.policies.items()
+            if policy.rate is not None
+        }
+
+    def _call(self, task: _Task) -> Any:
+        start = time.perf_counter()
+        try:
+            return _materialised(execute_command(task.args, self.spec, self.actions))
+        finally:
+            task.elapsed += time.perf_counter() - start
+
+    def _dispatch(
+        self,
+        queue: List[Tuple[int, int, _Task]],
+        running: Dict[Future, _Task],
+        in_flight: Counter,
+        pool: ThreadPoolExecutor,
+    ) -> Optional[float]:
+        """Start every ready task that fits; return seconds until a blocked one may be ready."""
+        held: List[Tuple[int, int, _Task]] = []
+        wake: Optional[float] = None
+        now = time.monotonic()
+        while queue and len(running) < self.jobs:
+            entry = heapq.heappop(queue)
+            task = entry[2]
+            policy = task.policy
+            wait_for = task.not_before - now
+            if wait_for <= 0:
+                if policy.concurrency is not None and in_flight[task.command] >= policy.concurrency:
+                    held.append(entry)  # woken by a completion, not by time
+                    continue
+                bucket = self.buckets.get(task.command)
+                wait_for = bucket.take(now) if bucket is not None else 0.0
+            if wait_for > 0:
+                held.append(entry)
+                wake = wait_for if wake is None else min(wake, wait_for)
+                continue
+            task.attempts += 1
+            in_flight[task.command] += 1
+            running[pool.submit(self._call, task)] = task
+        for entry in held:
+            heapq.heappush(queue, entry)
+        return wake
+
+    def run(self, items: Iterable[Optional[Tuple[Any, argparse.Namespace]]]) -> Iterator[Outcome]:
+        """Schedule ``(key, parsed_args)`` pairs, yielding an :class:`Outcome` as each one finishes.
+
+        *items* may yield ``None`` for "nothing available yet".
+        """
+        source = iter(items)
+        exhausted = False
+        order = itertools.count()
+        queue: List[Tuple[int, int, _Task]] = []
+        running: Dict[Future, _Task] = {}
+        in_flight: Counter = Counter()
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while True:
+                starved = False
+                while not exhausted and len(queue) + len(running) < self.lookahead:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if item is None:
+                        starved = True
+                        break
+                    key, parsed_args = item
+                    policy = self.policies.get(parsed_args.command) or CommandPolicy()
+                    task = _Task(key, parsed_args, policy)
+                    heapq.heappush(queue, (-policy.priority, next(order), task))
+
+                wake = self._dispatch(queue, running, in_flight, pool)
+                if starved and len(running) < self.jobs:
+                    wake = _POLL_INTERVAL if wake is None else min(wake, _POLL_INTERVAL)
+                if not running:
+                    if not queue:
+                        if exhausted:
+                            return
+                        continue
+                    time.sleep(wake or 0.0)
+                    continue
+
+                done, _ = wait(list(running), timeout=wake, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    in_flight[task.command] -= 1
+                    exc = future.exception()
+                    elapsed_ms = task.elapsed * 1000
+                    if exc is None:
+                        yield Outcome(task.key, "ok", future.result(), None, task.attempts, elapsed_ms)
+                    elif task.policy.should_retry(exc, task.attempts):
+                        delay = task.policy.delay(task.attempts)
+                        logger.info("Retrying %s (attempt %d) in %.3fs after %r", task.command, task.attempts + 1, delay, exc)
+                        task.not_before = time.monotonic() + delay
+                        heapq.heappush(queue, (-task.policy.priority, next(order), task))
+                    else:
+                        yield Outcome(task.key, "error", None, exc, task.attempts, elapsed_ms)
@@ -0,0 +1,303 @@
+"""Declarative configuration schema and its compiled validator.
+
+The config format is described once as plain data (:pydata:`CONFIG_SCHEMA`,
+a small JSON-Schema-like dialect) and compiled into plain Python functions by
+:pyfunc:`compile_schema`. The compiled validator walks a config exactly once
+and collects *every* problem together with its JSON path instead of stopping
+at the first one.
+
+Named ``definitions`` (``command``, ``arg``) can be validated on their own via
+:pymeth:`Validator.definition`, so callers that already know which subtree
+changed only need to re-check that subtree.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, NamedTuple
+
+__all__ = [
+    "CONFIG_SCHEMA",
+    "ConfigError",
+    "ConfigValidationError",
+    "Validator",
+    "compile_schema",
+    "config_validator",
+]
+
+
+class ConfigError(NamedTuple):
+    """A single schema violation located by a JSON *path*."""
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+class ConfigValidationError(ValueError):
+    """Raised when a config violates the schema; carries all :class:`ConfigError`."""
+
+    def __init__(self, errors: List[ConfigError]) -> None:
+        self.errors = list(errors)
+        super().__init__("\n".join(str(e) for e in self.errors))
+
+
+ARG_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["name", "type"],
+    "properties": {
+        "name": {"type": "string"},
+        "type": {"type": "string"},
+        "rules": {"type": "object", "message": "must be a mapping if present"},
+        "choices": {"type": "array", "message": "must be a list if present"},
+    },
+}
+
+SCHEDULE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "message": "must be a mapping if present",
+    "properties": {
+        "priority": {"type": "integer"},
+        "concurrency": {"type": "integer", "minimum": 1},
+        "rate": {"type": "number", "exclusiveMinimum": 0},
+        "burst": {"type": "integer", "minimum": 1},
+        "retries": {"type": "integer", "minimum": 0},
+        "backoff": {"type": "number", "minimum": 0},
+        "max_backoff": {"type": "number", "minimum": 0},
+        "retry_on": {"type": "array", "items": {"type": "string", "minLength": 1}},
+    },
+}
+
+COMMAND_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["name", "description", "args", "action"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "description": {"type": "string"},
+        "action": {"type": "string", "minLength": 1},
+        "args": {"type": "array", "items": {"$ref": "arg"}},
+        "pipe_arg": {"type": "string", "minLength": 1},
+        "schedule": {"$ref": "schedule"},
+    },
+}
+
+CONFIG_SCHEMA: Dict[str, Any] = {
+    "definitions": {"arg": ARG_SCHEMA, "schedule": SCHEDULE_SCHEMA, "command": COMMAND_SCHEMA},
+    "type": "object",
+    "message": "config root must be a mapping (dict)",
+    "properties": {
+        "description": {"type": "string"},
+        "commands": {
+            "type": "array",
+            "minItems": 1,
+            "message": "must be a non-empty list",
+            "items": {"$ref": "command"},
+        },
+    },
+    "required": ["commands"],
+}
+
+# Schema type name -> python types accepted for it. ``bool`` is a subclass of
+# ``int`` and is therefore rejected explicitly for ``number``/``integer``.
+_TYPES: Dict[str, tuple] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "null": (type(None),),
+}
+
+_TYPE_WORDS = {
+    "object": "a mapping",
+    "array": "a list",
+    "string": "a string",
+    "boolean": "a boolean",
+    "integer": "an integer",
+    "number": "a number",
+    "null": "null",
+}
+
+_Check = Callable[[Any, str, List[ConfigError]], None]
+
+_MISSING = object()
+
+
+class _Emitter:
+    """Generate the source of one validation function from a schema node.
+
+    Every check is inlined (including ``$ref`` definitions, unless they are
+    recursive), and JSON paths are only formatted on the error branch, so the
+    happy path costs little more than the ``isinstance`` checks themselves.
+    """
+
+    def __init__(self, definitions: Dict[str, Dict[str, Any]]) -> None:
+        self.definitions = definitions
+        self.lines: List[str] = []
+        self.counter = 0
+
+    def _new_var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _error(self, indent: str, path: str, message: str) -> None:
+        self.lines.append(f"{indent}errors.append(ConfigError(f{path!r}, {message!r}))")
+
+    def emit(self, schema: Dict[str, Any], var: str, path: str, indent: str, stack: tuple) -> None:
+        if "$ref" in schema:
+            name = schema["$ref"]
+            if name in stack:
+                self.lines.append(f"{indent}_check_{name}({var}, f{path!r}, errors)")
+            else:
+                self.emit(self.definitions[name], var, path, indent, stack + (name,))
+            return
+
+        type_names = schema.get("type")
+        if type_names is not None:
+            if isinstance(type_names, str):
+                type_names = [type_names]
+            py_types = [t.__name__ if t is not type(None) else "NoneType" for n in type_names for t in _TYPES[n]]
+            types_expr = py_types[0] if len(py_types) == 1 else f"({', '.join(py_types)})"
+            condition = f"not isinstance({var}, {types_expr})"
+            if "bool" not in py_types and {"int", "float"} & set(py_types):
+                condition += f" or {var} is True or {var} is False"
+            self.lines.append(f"{indent}if {condition}:")
+            self._error(
+                indent + "    ",
+                path,
+                schema.get("message") or "must be " + " or ".join(_TYPE_WORDS[n] for n in type_names),
+            )
+            else_at = len(self.lines)
+            self.lines.append(f"{indent}else:")
+            indent += "    "
+
+        if "minLength" in schema:
+            min_length = schema["minLength"]
+            self.lines.append(f"{indent}if len({var}) < {min_length!r}:")
+            self._error(
+                indent + "    ",
+                path,
+                schema.get("message")
+                or ("must be a non-empty string" if min_length == 1 else f"must have at least {min_length} characters"),
+            )
+
+        if "minimum" in schema:
+            minimum = schema["minimum"]
+            self.lines.append(f"{indent}if {var} < {minimum!r}:")
+            self._error(indent + "    ", path, schema.get("message") or f"must be at least {minimum}")
+
+        if "exclusiveMinimum" in schema:
+            minimum = schema["exclusiveMinimum"]
+            self.lines.append(f"{indent}if {var} <= {minimum!r}:")
+            self._error(indent + "    ", path, schema.get("message") or f"must be greater than {minimum}")
+
+        if "minItems" in schema:
+            min_items = schema["minItems"]
+            self.lines.append(f"{indent}if len({var}) < {min_items!r}:")
+            self._error(indent + "    ", path, schema.get("message") or f"must contain at least {min_items} item(s)")
+
+        properties = schema.get("properties", {})
+        required = schema.get("required", ())
+        for key in required:
+            if key not in properties:
+                self.lines.append(f"{indent}if {key!r} not in {var}:")
+                self._error(indent + "    ", path, f"missing required key '{key}'")
+
+        for key, sub in properties.items():
+            child = self._new_var("v")
+            self.lines.append(f"{indent}{child} = {var}.get({key!r}, _MISSING)")
+            if key in required:
+                # Presence and type are checked from the same lookup
+                self.lines.append(f"{indent}if {child} is _MISSING:")
+                self._error(indent + "    ", path, f"missing required key '{key}'")
+                self.lines.append(f"{indent}else:")
+            else:
+                self.lines.append(f"{indent}if {child} is not _MISSING:")
+            before = len(self.lines)
+            self.emit(sub, child, f"{path}.{_escape(key)}", indent + "    ", stack)
+            if len(self.lines) == before:
+                self.lines.append(f"{indent}    pass")
+
+        if "items" in schema:
+            idx, child = self._new_var("i"), self._new_var("v")
+            self.lines.append(f"{indent}for {idx}, {child} in enumerate({var}):")
+            before = len(self.lines)
+            self.emit(schema["items"], child, f"{path}[{{{idx}}}]", indent + "    ", stack)
+            if len(self.lines) == before:
+                self.lines.append(f"{indent}    pass")
+
+        if type_names is not None and len(self.lines) == else_at + 1:
+            # Type check only: drop the empty ``else:`` branch
+            self.lines.pop()
+
+
+def _escape(key: str) -> str:
+    return key.replace("{", "{{").replace("}", "}}")
+
+
+def _build(name: str, schema: Dict[str, Any], definitions: Dict[str, Dict[str, Any]], namespace: Dict[str, Any]) -> _Check:
+    emitter = _Emitter(definitions)
+    # Builtins and helpers are bound as defaults so the body only uses fast locals
+    emitter.lines.append(
+        f"def _check_{name}(value, path, errors, isinstance=isinstance, len=len, "
+        "enumerate=enumerate, ConfigError=ConfigError, _MISSING=_MISSING):"
+    )
+    stack = (name,) if name in definitions else ()
+    emitter.emit(schema, "value", "{path}", "    ", stack)
+    emitter.lines.append("    return None")
+    exec(compile("\n".join(emitter.lines), f"<schema:{name}>", "exec"), namespace)  # noqa: S102
+    return namespace[f"_check_{name}"]
+
+
+class Validator:
+    """Compiled form of a schema; cheap to call repeatedly."""
+
+    __slots__ = ("_check", "_refs")
+
+    def __init__(self, check: _Check, refs: Dict[str, _Check]) -> None:
+        self._check = check
+        self._refs = refs
+
+    def errors(self, value: Any, path: str = "$") -> List[ConfigError]:
+        """Return every schema violation found in *value* (empty when valid)."""
+        errors: List[ConfigError] = []
+        self._check(value, path, errors)
+        return errors
+
+    def validate(self, value: Any, path: str = "$") -> None:
+        """Raise :class:`ConfigValidationError` listing all violations in *value*."""
+        errors = self.errors(value, path)
+        if errors:
+            raise ConfigValidationError(errors)
+
+    def definition(self, name: str) -> "Validator":
+        """Return a validator for the named definition (e.g. ``"command"``).
+
+        Use it with the subtree's own path, e.g.
+        ``validator.definition("command").errors(cmd, "$.commands[3]")``.
+        """
+        return Validator(self._refs[name], self._refs)
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compile *schema* (and its ``definitions``) into a :class:`Validator`.
+
+    Each node is translated to straight-line Python source and compiled once;
+    the resulting functions are what :meth:`Validator.errors` calls.
+    """
+    definitions = schema.get("definitions", {})
+    namespace: Dict[str, Any] = {"ConfigError": ConfigError, "_MISSING": _MISSING, "NoneType": type(None)}
+    refs = {name: _build(name, sub, definitions, namespace) for name, sub in definitions.items()}
+    return Validator(_build("root", schema, definitions, namespace), refs)
+
+
+_CONFIG_VALIDATOR: Validator | None = None
+
+
+def config_validator() -> Validator:
+    """Return the process-wide compiled validator for :pydata:`CONFIG_SCHEMA`."""
+    global _CONFIG_VALIDATOR
+    if _CONFIG_VALIDATOR is None:
+        _CONFIG_VALIDATOR = compile_schema(CONFIG_SCHEMA)
+    return _CONFIG_VALIDATOR
@@ -0,0 +1,169 @@
+"""Resident interactive shell (REPL) for *Dynamic CLI Builder*.
+
+The shell loads the config, builds the parser and imports ``ACTIONS`` once and
+then reads command lines in a loop, so a session of many commands only pays
+the startup cost a single time. When :pymod:`readline` is available the shell
+keeps a history file and tab-completes command names and ``--arg`` flags from
+the in-memory command index.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from dynamic_cli_builder.builder import build_cli, execute_command
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["run_shell", "ShellCompleter"]
+
+_EXIT_WORDS = {"exit", "quit"}
+_BUILTINS = ("help", "exit", "quit")
+_DEFAULT_HISTORY = Path("~/.dcb_history")
+
+
+class ShellCompleter:
+    """Readline completer backed by the config's command index."""
+
+    def __init__(self, config: Dict[str, Any] | ConfigSpec, global_flags: List[str]) -> None:
+        self.commands: Dict[str, List[str]] = {
+            command.name: [arg.flag for arg in command.args] for command in as_spec(config).commands
+        }
+        self.global_flags = sorted(global_flags)
+        self._matches: List[str] = []
+
+    def candidates(self, line: str, text: str) -> List[str]:
+        """Return completions for *text*, the word being typed at the end of *line*."""
+        words = line.split()
+        if line.endswith(" ") or not words:
+            words.append("")
+        prior = words[:-1]
+        command = next((w for w in prior if w in self.commands), None)
+        if command is not None:
+            # Global options are only accepted before the command word
+            pool = [f for f in self.commands[command] if f not in prior]
+        elif prior and prior[0] == "help":
+            pool = list(self.commands)
+        else:
+            pool = [*self.commands, *_BUILTINS, *self.global_flags]
+        return sorted(c for c in pool if c.startswith(text))
+
+    def complete(self, text: str, state: int) -> Optional[str]:
+        """``readline`` completer protocol."""
+        if state == 0:
+            import readline
+
+            self._matches = self.candidates(readline.get_line_buffer(), text)
+        return self._matches[state] if state < len(self._matches) else None
+
+
+def _setup_readline(completer: ShellCompleter, history_file: Optional[Path]) -> Optional[Callable[[], None]]:
+    """Install completion/history; return a callback that saves history."""
+    try:
+        import readline
+    except ImportError:  # pragma: no cover - e.g. Windows without pyreadline
+        return None
+
+    readline.set_completer(completer.complete)
+    readline.set_completer_delims(" \t\n")
+    readline.parse_and_bind("tab: complete")
+    if history_file is None:
+        return None
+    try:
+        readline.read_history_file(str(history_file))
+    except (FileNotFoundError, OSError):
+        pass
+
+    def _save() -> None:
+        try:
+            readline.write_history_file(str(history_file))
+        except OSError as exc:  # pragma: no cover - read-only home etc.
+            logger.warning("Could not write shell history %s: %s", history_file, exc)
+
+    return _save
+
+
+def run_shell(
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    prompt: str = "dcb> ",
+    history_file: str | Path | None = _DEFAULT_HISTORY,
+    timing: bool = True,
+) -> None:
+    """Run a read-eval-print loop dispatching each line to :pyfunc:`execute_command`.
+
+    Parameters
+    ----------
+    config : dict
+        Loaded configuration; parsed once into an ``argparse`` parser.
+    ACTIONS : dict[str, Callable[..., Any]]
+        Mapping of *action name* to callable.
+    prompt : str
+        Prompt printed before each line.
+    history_file : str | Path | None
+        Readline history location (``~/.dcb_history`` by default); ``None``
+        disables history persistence.
+    timing : bool
+        Print the wall time of every command to stderr.
+    """
+    spec = as_spec(config)
+    parser = build_cli(spec)
+    parser.prog = ""
+    global_flags = [
+        opt for action in parser._actions for opt in action.option_strings if opt.startswith("--")
+    ]
+    completer = ShellCompleter(spec, global_flags)
+    history = Path(os.path.expanduser(str(history_file))) if history_file is not None else None
+    save_history = _setup_readline(completer, history) if sys.stdin.isatty() else None
+
+    try:
+        while True:
+            try:
+                line = input(prompt)
+            except EOFError:
+                print()
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line in _EXIT_WORDS:
+                break
+
+            try:
+                tokens = shlex.split(line)
+            except ValueError as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                continue
+            if tokens[0] == "help":
+                tokens = [*tokens[1:], "--help"]
+
+            start = time.perf_counter()
+            try:
+                parsed_args = parser.parse_args(tokens)
+                execute_command(parsed_args, spec, ACTIONS)
+            except SystemExit:
+                # argparse already printed usage/help or the parse error
+                continue
+            except KeyboardInterrupt:
+                print("Interrupted", file=sys.stderr)
+                continue
+            except Exception as exc:  # noqa: BLE001 - keep the session alive
+                print(f"Error: {exc}", file=sys.stderr)
+                continue
+            if timing:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                print(f"[{parsed_args.command}: {elapsed_ms:.1f} ms]", file=sys.stderr)
+    finally:
+        if save_history is not None:
+            save_history()
+
@@ -0,0 +1,309 @@
+"""Compiled, immutable representation of a loaded configuration.
+
+:pyfunc:`compile_config` turns the nested dicts returned by
+:pyfunc:`~dynamic_cli_builder.loader.load_config` into :class:`ConfigSpec`,
+:class:`CommandSpec` and :class:`ArgSpec` objects. They use ``__slots__``
+(no per-instance ``__dict__``), intern their names, precompute each
+argument's validating converter and coerced choices, and index commands by
+name, so the builder's hot paths do attribute access instead of repeated
+string-key lookups. Mappings they hold (``rules``, ``schedule``, ``index``)
+are read-only views.
+
+The dict form stays the interchange format: every public function still
+accepts a plain config dict, and :meth:`ConfigSpec.to_dict` converts back to
+the dict the spec was compiled from (same keys, original values).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from dynamic_cli_builder.validators import validate_arg
+
+__all__ = ["ArgSpec", "CommandSpec", "ConfigSpec", "compile_config", "as_spec"]
+
+def _str2bool(val: str) -> bool:
+    truthy = {"1", "true", "t", "yes", "y", "on"}
+    falsy = {"0", "false", "f", "no", "n", "off"}
+    v = val.strip().lower()
+    if v in truthy:
+        return True
+    if v in falsy:
+        return False
+    raise argparse.ArgumentTypeError(f"Invalid boolean value: {val}")
+
+
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": _str2bool,
+    # For complex types, expect JSON literals (e.g. '[1,2]' or '{"a":1}')
+    "json": lambda s: json.loads(s),
+    "list": lambda s: json.loads(s),
+    "dict": lambda s: json.loads(s),
+}
+
+
+def _type_converter(type_name: str) -> Callable[[str], Any]:
+    """Return a safe converter function for a configured type name."""
+    return _CONVERTERS.get(type_name, str)
+
+
+def _make_converter(rules: Mapping[str, Any] | None, to_type: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Build a converter that validates (if rules present) and then coerces."""
+    def _convert(raw: str) -> Any:
+        # Always validate against string input first
+        if rules is not None:
+            validate_arg(raw, rules)
+        # Then coerce to target type
+        try:
+            return to_type(raw)
+        except Exception as exc:  # pragma: no cover - argparse surfaces message
+            raise argparse.ArgumentTypeError(str(exc)) from exc
+    return _convert
+
+
+# Converters are pure functions of (type, rules), so args sharing both share
+# one closure instead of each carrying its own.
+_CONVERTER_CACHE: Dict[Any, Callable[[str], Any]] = {}
+
+
+def _converter_for(type_name: str, rules: Mapping[str, Any] | None) -> Callable[[str], Any]:
+    try:
+        key = (type_name, None if rules is None else tuple(sorted(rules.items())))
+        hash(key)
+    except TypeError:  # unhashable rule values: no sharing
+        return _make_converter(rules, _type_converter(type_name))
+    converter = _CONVERTER_CACHE.get(key)
+    if converter is None:
+        converter = _CONVERTER_CACHE[key] = _make_converter(rules, _type_converter(type_name))
+    return converter
+
+
+def _extra(data: Dict[str, Any], known: frozenset) -> Mapping[str, Any] | None:
+    """Keys of *data* the spec has no slot for (kept for :meth:`to_dict`)."""
+    if data.keys() <= known:
+        return None
+    return MappingProxyType({k: v for k, v in data.items() if k not in known})
+
+
+def _frozen(mapping: Optional[Dict[str, Any]]) -> Optional[Mapping[str, Any]]:
+    return None if mapping is None else MappingProxyType(dict(mapping))
+
+
+def _thawed(value: Any) -> Any:
+    return dict(value) if isinstance(value, MappingProxyType) else value
+
+
+# Key layouts of the compiled dicts, shared between specs: to_dict writes the
+# keys the source had, in its order
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _shape(data: Dict[str, Any]) -> Tuple[str, ...]:
+    keys = tuple(data)
+    return _SHAPES.setdefault(keys, keys)
+
+
+_ARG_KEYS = frozenset(("name", "type", "help", "required", "default", "choices", "rules"))
+_COMMAND_KEYS = frozenset(("name", "description", "args", "action", "pipe_arg", "schedule"))
+_CONFIG_KEYS = frozenset(("description", "commands"))
+
+# Specs are frozen through ``__setattr__``; their own ``__init__`` writes the
+# slots through the base implementation instead.
+_set = object.__setattr__
+
+
+class _Frozen:
+    """Base for slotted value objects that reject mutation after ``__init__``."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"  # type: ignore[attr-defined]
+
+    def _source_value(self, key: str) -> Any:
+        extra = self.extra  # type: ignore[attr-defined]
+        if extra is not None and key in extra:
+            return extra[key]
+        return _thawed(getattr(self, key))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the config-dict form this spec was compiled from."""
+        return {key: self._source_value(key) for key in self.keys}  # type: ignore[attr-defined]
+
+
+class ArgSpec(_Frozen):
+    """One ``--name value`` option of a command."""
+
+    __slots__ = (
+        "name", "type", "help", "required", "default", "choices", "rules",
+        "flag", "converter", "extra", "keys", "source_choices",
+    )
+
+    name: str
+    type: str
+    help: Optional[str]
+    required: bool
+    default: Any
+    choices: Optional[Tuple[Any, ...]]
+    rules: Optional[Mapping[str, Any]]
+    flag: str
+    converter: Callable[[str], Any]
+    extra: Optional[Mapping[str, Any]]
+    keys: Tuple[str, ...]
+    source_choices: Optional[Tuple[Any, ...]]
+
+    def __init__(self, arg: Dict[str, Any]) -> None:
+        get = arg.get
+        type_name = get("type", "str")
+        rules = _frozen(get("rules"))
+        choices = get("choices")
+        source_choices = None
+
+        # Coerce choices to the same type argparse will compare against
+        if choices is not None:
+            target_type = _type_converter(type_name)
+            coerced = []
+            for c in choices:
+                try:
+                    coerced.append(target_type(c) if isinstance(c, str) else c)
+                except Exception:  # keep original if cannot coerce
+                    coerced.append(c)
+            if coerced != list(choices):
+                # Only kept when coercion changed them, for to_dict
+                source_choices = tuple(choices)
+            choices = tuple(coerced)
+
+        name = sys.intern(arg["name"])
+        _set(self, "name", name)
+        _set(self, "type", sys.intern(type_name))
+        _set(self, "help", get("help"))
+        _set(self, "required", get("required", False))
+        _set(self, "default", get("default"))
+        _set(self, "choices", choices)
+        _set(self, "rules", rules)
+        _set(self, "flag", sys.intern("--" + name))
+        _set(self, "converter", _converter_for(type_name, rules))
+        _set(self, "extra", _extra(arg, _ARG_KEYS))
+        _set(self, "keys", _shape(arg))
+        _set(self, "source_choices", source_choices)
+
+    def _source_value(self, key: str) -> Any:
+        if key == "choices" and self.choices is not None:
+            return list(self.source_choices if self.source_choices is not None else self.choices)
+        return super()._source_value(key)
+
+
+class CommandSpec(_Frozen):
+    """A sub-command and its arguments."""
+
+    __slots__ = ("name", "description", "action", "args", "arg_names", "pipe_arg", "schedule", "extra", "keys")
+
+    name: str
+    description: str
+    action: Optional[str]
+    args: Tuple[ArgSpec, ...]
+    arg_names: Tuple[str, ...]
+    pipe_arg: Optional[str]
+    schedule: Optional[Mapping[str, Any]]
+    extra: Optional[Mapping[str, Any]]
+    keys: Tuple[str, ...]
+
+    def __init__(self, command: Dict[str, Any]) -> None:
+        args = tuple(ArgSpec(arg) for arg in command["args"])
+        action = command.get("action")
+        _set(self, "name", sys.intern(command["name"]))
+        _set(self, "description", command["description"])
+        _set(self, "action", sys.intern(action) if action is not None else None)
+        _set(self, "args", args)
+        _set(self, "arg_names", tuple(arg.name for arg in args))
+        pipe_arg = command.get("pipe_arg")
+        if pipe_arg is not None and pipe_arg not in self.arg_names:
+            raise ValueError(f"Command '{self.name}': pipe_arg '{pipe_arg}' is not one of its arguments")
+        _set(self, "pipe_arg", pipe_arg)
+        _set(self, "schedule", _frozen(command.get("schedule")))
+        _set(self, "extra", _extra(command, _COMMAND_KEYS))
+        _set(self, "keys", _shape(command))
+
+    def _source_value(self, key: str) -> Any:
+        if key == "args":
+            return [arg.to_dict() for arg in self.args]
+        return super()._source_value(key)
+
+
+class ConfigSpec(_Frozen):
+    """A whole configuration: description plus name-indexed commands."""
+
+    __slots__ = ("description", "commands", "index", "extra", "keys")
+
+    description: str
+    commands: Tuple[CommandSpec, ...]
+    index: Mapping[str, CommandSpec]
+    extra: Optional[Mapping[str, Any]]
+    keys: Tuple[str, ...]
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        commands = tuple(CommandSpec(command) for command in config["commands"])
+        _set(self, "description", config.get("description", "Dynamic CLI"))
+        _set(self, "commands", commands)
+        _set(self, "index", MappingProxyType({command.name: command for command in commands}))
+        _set(self, "extra", _extra(config, _CONFIG_KEYS))
+        _set(self, "keys", _shape(config))
+
+    def command(self, name: str) -> Optional[CommandSpec]:
+        """Return the command called *name* (``None`` if unknown)."""
+        return self.index.get(name)
+
+    def __iter__(self) -> Iterator[CommandSpec]:
+        return iter(self.commands)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __repr__(self) -> str:
+        return f"ConfigSpec(commands={len(self.commands)})"
+
+    def _source_value(self, key: str) -> Any:
+        if key == "commands":
+            return [command.to_dict() for command in self.commands]
+        return super()._source_value(key)
+
+
+def compile_config(config: Dict[str, Any]) -> ConfigSpec:
+    """Compile a (validated) config dict into a :class:`ConfigSpec`."""
+    return ConfigSpec(config)
+
+
+# Single-entry cache so callers that keep passing the same dict to
+# execute_command & co. compile it only once. Keyed by identity alone: the
+# reference held here keeps the id from being reused.
+_LAST: Tuple[Any, Any] = (None, None)
+
+
+def as_spec(config: Dict[str, Any] | ConfigSpec) -> ConfigSpec:
+    """Return *config* as a :class:`ConfigSpec`, compiling dicts on demand.
+
+    The spec of the most recently passed dict is reused while the same dict
+    object is passed again; after mutating that dict, pass the result of
+    :pyfunc:`compile_config` instead.
+    """
+    global _LAST
+    if isinstance(config, ConfigSpec):
+        return config
+    cached_config, cached_spec = _LAST
+    if cached_config is config:
+        return cached_spec
+    spec = ConfigSpec(config)
+    _LAST = (config, spec)
+    return spec
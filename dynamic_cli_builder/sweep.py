@@ -0,0 +1,187 @@
+"""Parameter sweeps: run one command over a grid of argument values.
+
+``dcb --sweep region=eu,us --sweep day=1,2 report --kind daily`` expands the
+swept values into their cartesian product (or, with ``--sweep-mode zip``,
+into position-wise pairs) and dispatches every combination through
+:pyfunc:`~dynamic_cli_builder.builder.execute_command` on a bounded thread
+pool. Each distinct value is validated once with the argument's configured
+rules/type/choices, before anything runs. One JSON object per combination is
+written to the report as it completes (JSON lines).
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Sequence, TextIO, Tuple
+
+from dynamic_cli_builder.builder import build_cli, build_command_cli, execute_command
+from dynamic_cli_builder.helpcache import command_from_argv
+from dynamic_cli_builder.output import _materialised
+from dynamic_cli_builder.spec import ConfigSpec, as_spec
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["parse_sweep", "expand_sweep", "run_sweep"]
+
+SWEEP_MODES = ("product", "zip")
+
+
+def parse_sweep(items: Sequence[str]) -> Dict[str, List[str]]:
+    """Parse ``NAME=V1,V2,...`` (or ``NAME=[json, list]``) sweep definitions."""
+    sweep: Dict[str, List[str]] = {}
+    for item in items:
+        name, sep, raw = item.partition("=")
+        name = name.strip().lstrip("-")
+        if not sep or not name or not raw:
+            raise ValueError(f"Invalid sweep '{item}': expected NAME=V1,V2,...")
+        if raw.lstrip().startswith("["):
+            try:
+                values = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid sweep '{item}': {exc}") from exc
+            sweep[name] = [v if isinstance(v, str) else json.dumps(v) for v in values]
+        else:
+            sweep[name] = raw.split(",")
+    return sweep
+
+
+def expand_sweep(values: Dict[str, List[Any]], mode: str = "product") -> Iterator[Dict[str, Any]]:
+    """Yield one ``{name: value}`` mapping per combination, lazily."""
+    names = list(values)
+    if mode == "product":
+        combos: Iterator[Tuple[Any, ...]] = itertools.product(*(values[n] for n in names))
+    elif mode == "zip":
+        lengths = {len(values[n]) for n in names}
+        if len(lengths) > 1:
+            raise ValueError("--sweep-mode zip requires every swept argument to have the same number of values")
+        combos = zip(*(values[n] for n in names))
+    else:
+        raise ValueError(f"Unknown sweep mode '{mode}'; use one of {', '.join(SWEEP_MODES)}")
+    for combo in combos:
+        yield dict(zip(names, combo))
+
+
+def _convert_values(spec: ConfigSpec, command_name: str, sweep: Dict[str, List[str]]) -> Dict[str, List[Any]]:
+    """Validate/convert each distinct swept value exactly once."""
+    command = spec.index[command_name]
+    by_name = {arg.name: arg for arg in command.args}
+    errors: List[str] = []
+    converted: Dict[str, List[Any]] = {}
+    for name, raws in sweep.items():
+        arg = by_name.get(name)
+        if arg is None:
+            errors.append(f"'{name}' is not an argument of '{command_name}'")
+            continue
+        seen: Dict[str, Any] = {}
+        for raw in raws:
+            if raw in seen:
+                continue
+            try:
+                value = arg.converter(raw)
+            except argparse.ArgumentTypeError as exc:
+                errors.append(f"{arg.flag} {raw!r}: {exc}")
+                continue
+            if arg.choices is not None and value not in arg.choices:
+                errors.append(f"{arg.flag} {raw!r}: not one of {list(arg.choices)}")
+                continue
+            seen[raw] = value
+        converted[name] = [seen[raw] for raw in raws if raw in seen]
+    if errors:
+        raise ValueError("Invalid sweep values:\n" + "\n".join(errors))
+    return converted
+
+
+def _run_one(
+    base: argparse.Namespace,
+    combo: Dict[str, Any],
+    spec: ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+) -> Tuple[Any, float]:
+    parsed_args = copy.copy(base)
+    for name, value in combo.items():
+        setattr(parsed_args, name, value)
+    start = time.perf_counter()
+    result = _materialised(execute_command(parsed_args, spec, ACTIONS))
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_sweep(
+    tokens: Sequence[str],
+    sweep: Dict[str, List[str]],
+    config: Dict[str, Any] | ConfigSpec,
+    ACTIONS: Dict[str, Callable[..., Any]],
+    report: TextIO,
+    mode: str = "product",
+    jobs: int = 4,
+) -> int:
+    """Run the command in *tokens* once per sweep combination.
+
+    Parameters
+    ----------
+    tokens : sequence of str
+        The command line (``COMMAND --arg value ...``) shared by every run;
+        swept arguments may be omitted from it.
+    sweep : dict[str, list[str]]
+        Raw values per argument name, see :pyfunc:`parse_sweep`.
+    report : TextIO
+        Receives one JSON object per combination as each one completes.
+    mode : {"product", "zip"}
+        How to combine the value lists.
+    jobs : int
+        Maximum number of combinations running at once.
+
+    Returns
+    -------
+    int
+        Number of combinations whose action raised.
+    """
+    if jobs < 1:
+        raise ValueError("--sweep-jobs must be at least 1")
+    spec = as_spec(config)
+    command = spec.command(command_from_argv(tokens) or "")
+    if command is None:
+        build_cli(spec).parse_args(tokens)  # reports the missing or unknown command
+        raise ValueError("No command to sweep")
+    # Every swept value is checked (and all errors reported) before parsing the rest
+    values = _convert_values(spec, command.name, sweep)
+    # The swept arguments are not required on the command line
+    base = build_command_cli(command, optional=sweep).parse_args(tokens)
+    combos = enumerate(expand_sweep(values, mode))
+
+    failures = 0
+    pending: Dict[Future, Tuple[int, Dict[str, Any]]] = {}
+
+    def _record(future: Future) -> None:
+        nonlocal failures
+        index, combo = pending.pop(future)
+        entry: Dict[str, Any] = {"index": index, "args": combo}
+        try:
+            result, elapsed_ms = future.result()
+            entry.update(status="ok", result=result, elapsed_ms=round(elapsed_ms, 3))
+        except Exception as exc:  # noqa: BLE001 - reported per combination
+            failures += 1
+            entry.update(status="error", error=f"{type(exc).__name__}: {exc}")
+        report.write(json.dumps(entry, default=str) + "\n")
+
+    # Keep a bounded window of submitted combinations so huge grids are
+    # never materialised up front.
+    window = jobs * 2
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for index, combo in combos:
+            pending[pool.submit(_run_one, base, combo, spec, ACTIONS)] = (index, combo)
+            if len(pending) >= window:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    _record(future)
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                _record(future)
+    report.flush()
+    logger.info("Sweep finished with %d failure(s)", failures)
+    return failures
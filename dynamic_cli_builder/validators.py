@@ -8,14 +8,14 @@ from __future__ import annotations
 import argparse
 import logging
 import re
-from typing import Any, Dict
+from typing import Any, Mapping
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["validate_arg"]
 
 
-def validate_arg(value: str, rules: Dict[str, Any]) -> str:  # noqa: D401
+def validate_arg(value: str, rules: Mapping[str, Any]) -> str:  # noqa: D401
     """Validate *value* against *rules* and return the original value.
 
     Supported rule keys
@@ -30,7 +30,8 @@ def validate_arg(value: str, rules: Dict[str, Any]) -> str:  # noqa: D401
     argparse.ArgumentTypeError
         If *value* does not satisfy any rule.
     """
-    logger.debug("Validating argument %s with rules %s", value, rules)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Validating argument %s with rules %s", value, rules)
 
     if "regex" in rules and not re.match(rules["regex"], value):
         logger.error("Value %s does not match regex %s", value, rules["regex"])
@@ -0,0 +1,370 @@
+"""Pre-warmed fork server ("zygote") for isolated invocations.
+
+``dcb --zygote unix:/tmp/app.sock`` starts a server that imports the
+package, loads and compiles the config and builds the parser once (and with
+``--preload`` also imports the actions). Each invocation is then requested
+with the thin client::
+
+    python -m dynamic_cli_builder.zygote unix:/tmp/app.sock COMMAND --arg value
+
+The client sends its argv, working directory and environment together with
+its stdin, stdout and stderr file descriptors (``SCM_RIGHTS`` over the Unix
+socket). The server forks a child per request, which takes over those
+descriptors, runs the command and exits. The server then sends the child's
+exit status to the client, which exits with it. Every invocation therefore
+runs in a fresh process, like a cold ``dcb COMMAND``, but starts from the
+parent's already-initialised memory (shared copy-on-write) instead of
+importing and parsing everything again.
+
+``RESOURCES`` are never created in the server: each child opens its own on
+first use. The client forwards ``SIGINT``, ``SIGTERM`` and ``SIGHUP`` to the
+child, and a child whose client disconnects is sent ``SIGTERM``.
+
+This module imports only the standard library at the top so that the client
+starts quickly; the server side imports the builder when it is used.
+"""
+from __future__ import annotations
+
+import array
+import json
+import os
+import signal
+import socket
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["request", "serve_zygote"]
+
+# Header: 4-byte big-endian length, then JSON {"argv", "cwd", "env"}
+_LENGTH = 4
+_STDIO = (0, 1, 2)
+_FORWARDED_SIGNALS = ("SIGINT", "SIGTERM", "SIGHUP")
+
+
+def _socket_path(address: str) -> str:
+    """The socket path of ``unix:PATH`` (or of a bare path)."""
+    path = address[len("unix:"):] if address.startswith("unix:") else address
+    if not path or (":" in address and not address.startswith("unix:")):
+        raise ValueError(f"Invalid zygote address '{address}'; use unix:PATH")
+    return path
+
+
+def _exit_code(status: int) -> int:
+    """Shell-style exit code from a ``waitpid`` status."""
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+# -- client -------------------------------------------------------------------
+
+def request(address: str, argv: Sequence[str], stdio: Sequence[int] = _STDIO) -> int:
+    """Run *argv* in a child of the zygote at *address*; return its exit code.
+
+    The child reads and writes the descriptors in *stdio* directly.
+    """
+    fds: List[int] = []
+    opened: List[int] = []
+    for fd in stdio:
+        try:
+            os.fstat(fd)
+        except OSError:  # closed stdio: give the child /dev/null instead
+            fd = os.open(os.devnull, os.O_RDWR)
+            opened.append(fd)
+        fds.append(fd)
+    header = json.dumps({"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}).encode("utf-8")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(_socket_path(address))
+        sock.sendmsg(
+            [len(header).to_bytes(_LENGTH, "big"), header],
+            [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))],
+        )
+        for fd in opened:
+            os.close(fd)
+        with sock.makefile("rb") as replies:
+            pid = json.loads(replies.readline())["pid"]
+            previous = {}
+            for name in _FORWARDED_SIGNALS:
+                signum = getattr(signal, name, None)
+                if signum is not None:
+                    previous[signum] = signal.signal(signum, lambda signum, frame: os.kill(pid, signum))
+            try:
+                reply = replies.readline()
+            finally:
+                for signum, handler in previous.items():
+                    signal.signal(signum, handler)
+        if not reply:
+            raise ConnectionError("zygote closed the connection before the command finished")
+        return int(json.loads(reply)["status"])
+    finally:
+        sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """``python -m dynamic_cli_builder.zygote unix:PATH COMMAND [ARGS...]``."""
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] in ("-h", "--help"):
+        print("usage: python -m dynamic_cli_builder.zygote unix:PATH COMMAND [ARGS...]", file=sys.stderr)
+        sys.exit(0 if args else 2)
+    try:
+        status = request(args[0], args[1:])
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(status)
+
+
+# -- server -------------------------------------------------------------------
+
+def _receive_request(conn: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    """Read one request and the descriptors passed with it."""
+    fds = array.array("i")
+    data, ancdata, _, _ = conn.recvmsg(65536, socket.CMSG_SPACE(len(_STDIO) * fds.itemsize))
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[: len(payload) - len(payload) % fds.itemsize])
+    try:
+        while len(data) < _LENGTH or len(data) < _LENGTH + int.from_bytes(data[:_LENGTH], "big"):
+            more = conn.recv(65536)
+            if not more:
+                raise ConnectionError("incomplete request")
+            data += more
+        header = json.loads(data[_LENGTH:_LENGTH + int.from_bytes(data[:_LENGTH], "big")])
+        if len(fds) != len(_STDIO):
+            raise ValueError(f"expected {len(_STDIO)} descriptors, got {len(fds)}")
+    except Exception:
+        for fd in fds:
+            os.close(fd)
+        raise
+    return header, list(fds)
+
+
+def _run_child(
+    header: Dict[str, Any],
+    fds: List[int],
+    cli: Any,
+    config: Any,
+    load_actions: Callable[[], Tuple[Dict[str, Callable[..., Any]], Optional[Dict[str, Callable[..., Any]]]]],
+    preloaded: Optional[Tuple[Dict[str, Callable[..., Any]], Optional[Dict[str, Callable[..., Any]]]]],
+) -> int:
+    """Body of a forked child: become the client's process and run its command."""
+    import traceback
+
+    from dynamic_cli_builder.builder import execute_command
+    from dynamic_cli_builder.logconfig import _teardown as _logging_teardown
+    from dynamic_cli_builder.output import _silence_stdout
+    from dynamic_cli_builder.resources import use_resources
+
+    for target, fd in zip(_STDIO, fds):
+        os.dup2(fd, target)
+    for fd in set(fds):
+        if fd not in _STDIO:
+            os.close(fd)
+    os.chdir(header["cwd"])
+    os.environ.clear()
+    os.environ.update(header["env"])
+    sys.argv = [sys.argv[0], *header["argv"]]
+    try:
+        parsed_args = cli.parse_args(header["argv"])
+        actions, resources = preloaded if preloaded is not None else load_actions()
+        use_resources(resources)
+        execute_command(parsed_args, config, actions)
+        sys.stdout.flush()  # a closed pipe should surface here, not in the cleanup
+        return 0
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into `head`): exit like a SIGPIPE'd process, as `dcb` does
+        _silence_stdout()
+        return 128 + getattr(signal, "SIGPIPE", 13)
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return exc.code or 0
+        print(exc.code, file=sys.stderr)
+        return 1
+    except (FileNotFoundError, ImportError, AttributeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        traceback.print_exc()
+        return 128 + signal.SIGINT
+    except BaseException:  # noqa: BLE001 - report like an uncaught exception would
+        traceback.print_exc()
+        return 1
+    finally:
+        # The child leaves with os._exit, which skips atexit handlers
+        use_resources(None)
+        _logging_teardown()
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def _stop(signum: int, frame: Any) -> None:
+    raise SystemExit(0)
+
+
+def serve_zygote(
+    address: str,
+    config: Any,
+    load_actions: Callable[[], Tuple[Dict[str, Callable[..., Any]], Optional[Dict[str, Callable[..., Any]]]]],
+    preload: bool = False,
+    parser: str = "argparse",
+    ready: Optional[Callable[[], None]] = None,
+) -> None:
+    """Serve invocations on ``unix:PATH`` by forking pre-warmed children until interrupted.
+
+    Parameters
+    ----------
+    config : dict or ConfigSpec
+        Compiled once here; the children inherit the spec and the parser.
+    load_actions : callable
+        Returns ``(ACTIONS, RESOURCES)``. Called once in the server when
+        *preload* is true, otherwise in every child.
+    parser : {"argparse", "fast"}
+        Parser engine, built before the first fork.
+    ready : callable, optional
+        Called once the server is listening.
+
+    Must run in the main thread: children are reaped on ``SIGCHLD``, and
+    ``SIGTERM`` stops the server (running children are left to finish).
+    """
+    import logging
+    import selectors
+
+    from dynamic_cli_builder.fastparse import make_parser
+    from dynamic_cli_builder.spec import as_spec
+
+    if not hasattr(os, "fork"):
+        raise ValueError("--zygote needs a platform with fork()")
+    logger = logging.getLogger(__name__)
+    spec = as_spec(config)
+    cli = make_parser(spec, parser)
+    preloaded = load_actions() if preload else None
+
+    path = _socket_path(address)
+    # Bound under a temporary name and moved into place once listening (over
+    # any socket left by an earlier server), so a client that sees the path
+    # never gets "connection refused"
+    pending = f"{path}.tmp"
+    if os.path.exists(pending):
+        os.unlink(pending)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(pending)
+    listener.listen(64)
+    os.replace(pending, path)
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    previous_wakeup = signal.set_wakeup_fd(wake_w)
+    previous_sigchld = signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    previous_sigterm = signal.signal(signal.SIGTERM, _stop)
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    selector.register(wake_r, selectors.EVENT_READ)
+    children: Dict[int, socket.socket] = {}
+
+    def _fork(conn: socket.socket) -> None:
+        conn.settimeout(5)
+        try:
+            header, fds = _receive_request(conn)
+        except (OSError, ValueError) as exc:
+            logger.warning("Rejected zygote request: %s", exc)
+            conn.close()
+            return
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                selector.close()
+                os.close(wake_r)
+                os.close(wake_w)
+                for sock in (listener, conn, *children.values()):
+                    sock.close()
+                code = _run_child(header, fds, cli, spec, load_actions, preloaded)
+            finally:
+                os._exit(code)
+        for fd in fds:
+            os.close(fd)
+        children[pid] = conn
+        try:
+            conn.sendall(json.dumps({"pid": pid}).encode("ascii") + b"\n")
+        except OSError:
+            pass
+        conn.setblocking(False)
+        selector.register(conn, selectors.EVENT_READ, pid)
+
+    def _reap() -> None:
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = children.pop(pid, None)
+            if conn is None:
+                continue
+            try:
+                selector.unregister(conn)
+            except KeyError:  # its client already went away
+                pass
+            try:
+                conn.setblocking(True)
+                conn.sendall(json.dumps({"status": _exit_code(status)}).encode("ascii") + b"\n")
+            except OSError:
+                pass
+            conn.close()
+
+    logger.info("Zygote %d listening on %s", os.getpid(), address)
+    if ready is not None:
+        ready()
+    try:
+        while True:
+            for key, _ in selector.select():
+                if key.fileobj is listener:
+                    conn, _ = listener.accept()
+                    _fork(conn)
+                elif key.fileobj == wake_r:
+                    try:
+                        while os.read(wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    _reap()
+                else:
+                    # The client went away before its command finished
+                    try:
+                        gone = not key.fileobj.recv(1)  # type: ignore[union-attr]
+                    except BlockingIOError:
+                        gone = False
+                    except OSError:
+                        gone = True
+                    if gone:
+                        selector.unregister(key.fileobj)
+                        try:
+                            os.kill(key.data, signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+    finally:
+        signal.set_wakeup_fd(previous_wakeup)
+        signal.signal(signal.SIGCHLD, previous_sigchld)
+        signal.signal(signal.SIGTERM, previous_sigterm)
+        selector.close()
+        listener.close()
+        os.close(wake_r)
+        os.close(wake_w)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import importlib
+import json
 import os
 import sys
 
@@ -133,6 +134,39 @@ def test_main_module_exec(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsy
     sys.path[:] = sys_path_orig
 
 
+def test_command_args_named_like_runner_options(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    from dynamic_cli_builder.__main__ import main
+
+    (tmp_path / "actions.py").write_text(
+        "ACTIONS = {'run': lambda batch, sweep, check: print(f'run {batch} {sweep} {check}')}\n", encoding="utf-8"
+    )
+    (tmp_path / "config.yaml").write_text(
+        "commands:\n"
+        "  - name: run\n"
+        "    description: r\n"
+        "    args: [{name: batch, type: str}, {name: sweep, type: str}, {name: check, type: str}]\n"
+        "    action: run\n",
+        encoding="utf-8",
+    )
+    runner = ["-c", str(tmp_path / "config.yaml"), "-a", str(tmp_path / "actions.py")]
+    main([*runner, "-v", "ERROR", "run", "--batch", "5", "--sweep", "x"])
+    assert capsys.readouterr().out == "run 5 x None\n"
+
+    report = tmp_path / "report.jsonl"
+    main([*runner, "--sweep", "check=a,b", "--sweep-report", str(report), "run", "--batch", "q"])
+    entries = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert sorted((entry["status"], entry["args"]["check"]) for entry in entries) == [("ok", "a"), ("ok", "b")]
+    assert sorted(capsys.readouterr().out.splitlines()) == ["run q None a", "run q None b"]
+
+    # Runner options are not abbreviated: --conf is left to the command's parser
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        main(["-a", str(tmp_path / "actions.py"), "--conf", str(tmp_path / "config.yaml"), "run"])
+    assert "invalid choice" in capsys.readouterr().err
+
+
 # ---------------------------------------------------------------------------
 # cli shim re-exports
 # ---------------------------------------------------------------------------
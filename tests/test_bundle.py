@@ -0,0 +1,90 @@
+"""Tests for single-file zipapp bundles."""
+from __future__ import annotations
+
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from dynamic_cli_builder.bundle import ACTIONS_PYC, CONFIG_DATA, HELP_DATA, MANIFEST, build_bundle, load_bundle
+
+
+def _write_sources(tmp_path: Path) -> None:
+    (tmp_path / "actions.py").write_text(
+        "def greet(name: str, times: int = 1) -> None:\n"
+        "    print(' '.join([f'Hi {name}!'] * times))\n"
+        "ACTIONS = {'greet': greet}\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "config.yaml").write_text(
+        "description: bundled\n"
+        "commands:\n"
+        "  - name: greet\n"
+        "    description: Say hi\n"
+        "    args:\n"
+        "      - {name: name, type: str, required: true}\n"
+        "      - {name: times, type: int, default: 1, rules: {min: 1, max: 3}}\n"
+        "    action: greet\n",
+        encoding="utf-8",
+    )
+
+
+def test_bundle_layout(tmp_path: Path) -> None:
+    _write_sources(tmp_path)
+    out = build_bundle(tmp_path / "app.pyz", tmp_path / "config.yaml", tmp_path / "actions.py")
+    names = set(zipfile.ZipFile(out).namelist())
+    assert {"__main__.py", MANIFEST, CONFIG_DATA, ACTIONS_PYC} <= names
+    assert "dynamic_cli_builder/__main__.pyc" in names
+    assert not any(n.endswith(".py") and n != "__main__.py" for n in names)
+
+
+def test_bundle_runs_without_sources(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_sources(src)
+    out = build_bundle(tmp_path / "app.pyz", src / "config.yaml", src / "actions.py")
+    for f in src.iterdir():
+        f.unlink()
+
+    proc = subprocess.run(
+        [sys.executable, str(out), "greet", "--name", "Ada", "--times", "2"],
+        cwd=str(tmp_path), capture_output=True, text=True, check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "Hi Ada! Hi Ada!"
+
+    # Rules from the pre-validated config are still enforced
+    proc = subprocess.run(
+        [sys.executable, str(out), "greet", "--name", "Ada", "--times", "9"],
+        cwd=str(tmp_path), capture_output=True, text=True, check=False,
+    )
+    assert proc.returncode == 2 and "greater than maximum" in proc.stderr
+
+
+def test_build_bundle_validates_config(tmp_path: Path) -> None:
+    _write_sources(tmp_path)
+    (tmp_path / "config.yaml").write_text("commands: []\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        build_bundle(tmp_path / "app.pyz", tmp_path / "config.yaml", tmp_path / "actions.py")
+
+
+def test_load_bundle_outside_archive() -> None:
+    assert load_bundle() is None
+
+
+def test_bundle_help_is_prerendered_and_skips_actions(tmp_path: Path) -> None:
+    _write_sources(tmp_path)
+    actions = tmp_path / "actions.py"
+    actions.write_text("import sys\nprint('ACTIONS IMPORTED', file=sys.stderr)\n" + actions.read_text(), encoding="utf-8")
+    out = build_bundle(tmp_path / "app.pyz", tmp_path / "config.yaml", actions)
+    assert HELP_DATA in zipfile.ZipFile(out).namelist()
+
+    proc = subprocess.run(
+        [sys.executable, str(out), "greet", "--help"],
+        cwd=str(tmp_path), capture_output=True, text=True, check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.startswith("usage: app.pyz greet [-h] --name NAME")
+    assert "ACTIONS IMPORTED" not in proc.stderr
@@ -0,0 +1,117 @@
+"""Tests for distributed batch runs (``--coordinator`` / ``--worker``)."""
+from __future__ import annotations
+
+import io
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from dynamic_cli_builder.distributed import parse_address, run_coordinator, run_worker
+
+CONFIG: Dict[str, Any] = {
+    "commands": [
+        {"name": "work", "description": "d", "args": [{"name": "n", "type": "int", "required": True}], "action": "work"},
+    ]
+}
+
+ACTIONS_PY = """
+import os
+import time
+
+def work(n: int):
+    time.sleep(0.05)
+    return [n * n, os.getpid()]
+
+ACTIONS = {"work": work}
+"""
+
+
+def _coordinate(lines: List[str], address: str) -> Dict[str, Any]:
+    """Start a coordinator thread; ``outcome["report"]`` is filled in when it returns."""
+    outcome: Dict[str, Any] = {}
+    listening = threading.Event()
+
+    def _run() -> None:
+        report = io.StringIO()
+        outcome["failures"] = run_coordinator(lines, address, report, ready=listening.set)
+        outcome["report"] = [json.loads(line) for line in report.getvalue().splitlines()]
+
+    outcome["thread"] = threading.Thread(target=_run, daemon=True)
+    outcome["thread"].start()
+    assert listening.wait(5)
+    return outcome
+
+
+def test_parse_address() -> None:
+    assert parse_address("unix:/tmp/dcb.sock") == (socket.AF_UNIX, "/tmp/dcb.sock")
+    assert parse_address("127.0.0.1:7070") == (socket.AF_INET, ("127.0.0.1", 7070))
+    assert parse_address(":7070") == (socket.AF_INET, ("0.0.0.0", 7070))
+    assert parse_address("[::1]:7070") == (socket.AF_INET6, ("::1", 7070))
+    with pytest.raises(ValueError, match="HOST:PORT"):
+        parse_address("localhost")
+
+
+def test_worker_processes(tmp_path: Path) -> None:
+    (tmp_path / "config.json").write_text(json.dumps(CONFIG))
+    (tmp_path / "actions.py").write_text(ACTIONS_PY)
+    address = f"unix:{tmp_path / 'dcb.sock'}"
+    lines = [f"work --n {i}" for i in range(60)] + ["work --n nope"]
+    outcome = _coordinate(lines, address)
+    command = [sys.executable, "-m", "dynamic_cli_builder", "--worker", address, "--batch-jobs", "2"]
+    env = {"PYTHONPATH": str(Path(__file__).resolve().parents[1]), "PATH": "/usr/bin:/bin"}
+    workers = [subprocess.Popen(command, cwd=tmp_path, env=env, stderr=subprocess.DEVNULL) for _ in range(3)]
+    for worker in workers:
+        assert worker.wait(timeout=30) == 0
+    outcome["thread"].join(10)
+
+    report = outcome["report"]
+    assert outcome["failures"] == 1
+    assert sorted(entry["index"] for entry in report) == list(range(1, 62))
+    ok = [entry for entry in report if entry["status"] == "ok"]
+    assert all(entry["result"][0] == int(entry["line"].split()[-1]) ** 2 for entry in ok)
+    assert next(entry for entry in report if entry["status"] == "error")["error"] == "invalid command line"
+
+
+def test_idle_worker_steals_unstarted_lines(tmp_path: Path) -> None:
+    address = f"unix:{tmp_path / 'dcb.sock'}"
+    outcome = _coordinate([f"work --n {i}" for i in range(10)], address)
+    first_started = threading.Event()
+
+    def slow(n: int) -> int:
+        first_started.set()
+        time.sleep(0.3)
+        return n
+
+    # One thread that grabs every line up front, then a second worker that has to steal
+    greedy = threading.Thread(target=run_worker, args=(address, CONFIG, {"work": slow}), kwargs={"jobs": 1, "prefetch": 10})
+    greedy.start()
+    assert first_started.wait(5)
+    assert run_worker(address, CONFIG, {"work": lambda n: n}, jobs=1) > 0
+    greedy.join(10)
+    outcome["thread"].join(10)
+
+    workers = {entry["index"]: entry["worker"] for entry in outcome["report"]}
+    assert sorted(workers) == list(range(1, 11))
+    assert workers[1] == 1 and set(workers.values()) == {1, 2}
+
+
+def test_lines_of_a_vanished_worker_are_reassigned(tmp_path: Path) -> None:
+    address = f"unix:{tmp_path / 'dcb.sock'}"
+    outcome = _coordinate([f"work --n {i}" for i in range(5)], address)
+
+    quitter = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    quitter.connect(parse_address(address)[1])
+    quitter.sendall(b'{"op": "pull", "want": 3}\n')
+    assert json.loads(quitter.makefile("rb").readline())["op"] == "chunk"
+    quitter.close()
+
+    assert run_worker(address, CONFIG, {"work": lambda n: n}, jobs=2) == 5
+    outcome["thread"].join(10)
+    assert sorted(entry["result"] for entry in outcome["report"]) == list(range(5))
@@ -0,0 +1,144 @@
+"""Conformance of the fast parser engine with the argparse backend."""
+from __future__ import annotations
+
+import contextlib
+import io
+import random
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from dynamic_cli_builder.builder import build_cli
+from dynamic_cli_builder.fastparse import FastParser, make_parser
+
+CONFIG: Dict[str, Any] = {
+    "description": "conformance",
+    "commands": [
+        {
+            "name": "greet",
+            "description": "Greet",
+            "args": [
+                {"name": "name", "type": "str", "required": True, "rules": {"regex": "^[A-Za-z ]+$"}},
+                {"name": "age", "type": "int", "rules": {"min": 0, "max": 150}},
+                {"name": "loud", "type": "bool", "default": "false"},
+            ],
+            "action": "greet",
+        },
+        {
+            "name": "scale",
+            "description": "Scale",
+            "args": [
+                {"name": "factor", "type": "float", "default": 1.0},
+                {"name": "mode", "type": "str", "choices": ["up", "down"], "default": "up"},
+                {"name": "tags", "type": "list", "default": "[]"},
+                {"name": "names", "type": "str"},
+            ],
+            "action": "scale",
+        },
+    ],
+}
+
+CASES: List[List[str]] = [
+    ["greet", "--name", "Ann"],
+    ["greet", "--name=Ann Lee", "--age", "41", "--loud", "yes"],
+    ["greet", "--age", "-3", "--name", "Bo"],
+    ["greet", "--name", "Bo", "--name", "Al"],
+    ["-v", "DEBUG", "--log-format=json", "-im", "--memprofile", "greet", "--name", "X"],
+    ["-log", "--log-queue", "scale"],
+    ["--log-level=ERROR", "scale", "--factor", "-.5", "--mode", "down", "--tags", "[1, 2]"],
+    ["scale", "--names", "a", "--factor="],
+    ["scale", "--nam", "a"],  # abbreviation
+    ["scale", "--na", "a"],  # ambiguous abbreviation
+    ["greet", "--name", "-x"],
+    ["greet", "--name", "--age=1 2"],  # an option, despite the space
+    ["greet", "--name", "--ag=1 2"],
+    ["greet", "--name", "-h x"],
+    ["greet", "--name", "--x y"],  # names no option: a value
+    ["greet", "--name", "--log x"],  # ambiguous in the top-level parser
+    ["scale", "--names", "--log-level=a b"],
+    ["scale", "--factor", "--fa"],
+    ["-v", "--log-format=json x", "scale"],
+    ["-v", "-x y", "scale"],
+    ["greet", "--name", "Ann", "--age", "200"],
+    ["greet", "--name", "4nn"],
+    ["greet", "--age", "1"],
+    ["greet", "--name"],
+    ["greet", "--name", "Ann", "extra"],
+    ["greet", "--name", "Ann", "--memprofile"],
+    ["scale", "--mode", "sideways"],
+    ["scale", "--mode", "--", "up"],
+    ["-v", "LOUD", "scale"],
+    ["-v"],
+    ["--log-queue=1", "scale"],
+    ["nope"],
+    [],
+    ["scale", "--factor", "abc"],
+    ["scale", "--tags", "{bad"],
+    ["-vDEBUG", "scale"],
+    ["scale", "-h"],
+    ["greet", "--name", "Ann", "--help"],
+    ["greet", "--age", "x", "--help"],
+    ["greet", "--help", "--age", "1"],
+    ["--help"],
+]
+
+
+def _outcome(parser: Any, argv: List[str]) -> Tuple[Any, str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            result: Any = vars(parser.parse_args(argv))
+        except SystemExit as exc:
+            result = ("exit", exc.code)
+    return result, out.getvalue(), err.getvalue()
+
+
+@pytest.mark.parametrize("argv", CASES, ids=lambda argv: " ".join(argv) or "<empty>")
+def test_matches_argparse(argv: List[str]) -> None:
+    assert _outcome(FastParser(CONFIG), argv) == _outcome(build_cli(CONFIG), argv)
+
+
+def test_random_token_soup() -> None:
+    rng = random.Random(1234)
+    vocabulary = [
+        "greet", "scale", "--name", "--age", "--loud", "--factor", "--mode", "--tags", "--names",
+        "Ann", "7", "-7", "1.5", "up", "down", "true", "[1]", "-v", "INFO", "-im", "--log-format",
+        "json", "--age=3", "--mode=up", "--", "-", "",
+    ]
+    fast, reference = FastParser(CONFIG), build_cli(CONFIG)
+    for _ in range(400):
+        argv = rng.sample(vocabulary, rng.randint(0, 6))
+        if rng.random() < 0.5:
+            argv.insert(0, rng.choice(["greet", "scale"]))
+        assert _outcome(fast, argv) == _outcome(reference, argv), argv
+
+
+def test_defaults_not_shared_and_commands_compiled_lazily() -> None:
+    parser = FastParser(CONFIG)
+    first, second = parser.parse_args(["scale"]), parser.parse_args(["scale"])
+    assert first.tags == [] and first.tags is not second.tags
+    assert list(parser._commands) == ["scale"]
+    assert parser._argparse is None
+
+
+def test_command_help_without_full_parser() -> None:
+    parser = FastParser(CONFIG)
+    assert _outcome(parser, ["scale", "--help"]) == _outcome(build_cli(CONFIG), ["scale", "--help"])
+    assert parser._argparse is None
+
+
+def test_make_parser() -> None:
+    assert isinstance(make_parser(CONFIG, "fast"), FastParser)
+    with pytest.raises(ValueError):
+        make_parser(CONFIG, "getopt")
+
+
+def test_rejected_value_validated_once(caplog) -> None:
+    argv = ["greet", "--name", "Ann", "--age", "200"]
+    with caplog.at_level("ERROR", logger="dynamic_cli_builder.validators"):
+        fast = _outcome(FastParser(CONFIG), argv)
+    assert len(caplog.records) == 1
+    caplog.clear()
+    with caplog.at_level("ERROR", logger="dynamic_cli_builder.validators"):
+        assert fast == _outcome(build_cli(CONFIG), argv)
+    assert len(caplog.records) == 1
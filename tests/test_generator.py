@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import json
 import sys
 from pathlib import Path
 
@@ -82,3 +83,201 @@ def test_main_generate_stdout(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, c
     main_mod.main(argv)
     out, _ = capsys.readouterr()
     assert "commands:" in out
+
+
+ACTIONS_V1 = '''
+def alpha(x: int):
+    """Alpha"""
+
+def beta(y: str = "b"):
+    """Beta"""
+
+ACTIONS = {"alpha": alpha, "beta": beta}
+'''
+
+
+def test_signature_cache_introspects_only_changed_functions(tmp_path: Path) -> None:
+    from dynamic_cli_builder.generator import SignatureCache, load_module
+
+    actions_py = tmp_path / "actions.py"
+    actions_py.write_text(ACTIONS_V1, encoding="utf-8")
+    module, _ = load_module(actions_py)
+    first = SignatureCache()
+    cfg = generate_config(module, module.ACTIONS, first)
+    assert first.introspected == 2 and cfg == generate_config(module, module.ACTIONS)
+
+    # Same size, same second: must not be served from stale bytecode or source lines
+    actions_py.write_text(ACTIONS_V1.replace("x: int", "x: str"), encoding="utf-8")
+    module, _ = load_module(actions_py)
+    second = SignatureCache(first.entries)
+    cfg = generate_config(module, module.ACTIONS, second)
+    assert second.introspected == 1
+    assert cfg["commands"][0]["args"][0]["type"] == "str"
+
+
+def test_yaml_fragments_match_a_single_dump() -> None:
+    import yaml
+
+    cfg = {
+        "description": "d",
+        "commands": [
+            {"name": f"c{i}", "description": "x" * 100, "args": [{"name": "a", "type": "list", "default": [1, 2]}], "action": f"c{i}"}
+            for i in range(3)
+        ],
+    }
+    fragments: dict = {}
+    assert dump_config(cfg, "yaml", fragments) == yaml.safe_dump(cfg, sort_keys=False)
+    assert len(fragments) == 3
+    cfg["commands"] = cfg["commands"][:1]
+    dump_config(cfg, "yaml", fragments)
+    assert len(fragments) == 1
+
+
+def test_merge_config_keeps_hand_edits() -> None:
+    from dynamic_cli_builder.generator import merge_config
+
+    base = {
+        "description": "Generated",
+        "commands": [
+            {"name": "a", "description": "A", "args": [{"name": "x", "type": "int", "help": "Argument x", "required": True}], "action": "a"},
+            {"name": "gone", "description": "G", "args": [], "action": "gone"},
+        ],
+    }
+    existing = {
+        "description": "My tool",
+        "version": 2,
+        "commands": [
+            {
+                "name": "a",
+                "description": "A",
+                "args": [{"name": "x", "type": "int", "help": "How many", "required": True, "rules": {"min": 1}}],
+                "action": "a",
+                "schedule": {"concurrency": 1},
+            },
+            {"name": "gone", "description": "G", "args": [], "action": "gone"},
+        ],
+    }
+    generated = {
+        "description": "Generated",
+        "commands": [
+            {
+                "name": "a",
+                "description": "A, now documented",
+                "args": [
+                    {"name": "x", "type": "float", "help": "Argument x", "required": True},
+                    {"name": "y", "type": "str", "help": "Argument y", "default": "b"},
+                ],
+                "action": "a",
+            },
+        ],
+    }
+    merged = merge_config(generated, existing, base)
+    assert merged["description"] == "My tool" and merged["version"] == 2
+    (command,) = merged["commands"]
+    assert command["description"] == "A, now documented" and command["schedule"] == {"concurrency": 1}
+    x, y = command["args"]
+    assert x == {"name": "x", "type": "float", "help": "How many", "required": True, "rules": {"min": 1}}
+    assert y["name"] == "y"
+
+    # Without knowing what was generated before, generated fields are regenerated
+    assert merge_config(generated, existing)["commands"][0]["args"][0]["help"] == "Argument x"
+
+
+def test_incremental_generator_keeps_hand_edits(tmp_path: Path) -> None:
+    import yaml
+
+    from dynamic_cli_builder.generator import IncrementalGenerator
+
+    actions_py = tmp_path / "actions.py"
+    actions_py.write_text(ACTIONS_V1, encoding="utf-8")
+    output = tmp_path / "config.yaml"
+    generator = IncrementalGenerator(actions_py, output, cache_dir=tmp_path / "cache")
+    assert generator.run() and generator.introspected == 2
+    assert not generator.run() and generator.up_to_date()
+
+    cfg = yaml.safe_load(output.read_text(encoding="utf-8"))
+    cfg["commands"][1]["args"][0]["choices"] = ["a", "b"]
+    output.write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
+    actions_py.write_text(ACTIONS_V1.replace('"""Alpha"""', '"""Alpha!"""'), encoding="utf-8")
+
+    generator = IncrementalGenerator(actions_py, output, cache_dir=tmp_path / "cache")
+    assert generator.run() and generator.introspected == 1
+    alpha, beta = yaml.safe_load(output.read_text(encoding="utf-8"))["commands"]
+    assert alpha["description"] == "Alpha!"
+    assert beta["args"][0]["choices"] == ["a", "b"]
+
+
+def test_watch_regenerates_on_change(tmp_path: Path) -> None:
+    import io
+    import threading
+    import time
+
+    from dynamic_cli_builder.generator import IncrementalGenerator
+
+    actions_py = tmp_path / "actions.py"
+    actions_py.write_text(ACTIONS_V1, encoding="utf-8")
+    output = tmp_path / "config.json"
+    generator = IncrementalGenerator(actions_py, output, "json", cache_dir=tmp_path / "cache")
+    stop = threading.Event()
+    log = io.StringIO()
+    watcher = threading.Thread(target=generator.watch, kwargs={"interval": 0.02, "stop": stop, "log": log})
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not output.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        actions_py.write_text("def broken(:\n", encoding="utf-8")
+        while "Error:" not in log.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        actions_py.write_text(ACTIONS_V1.replace("beta", "gamma"), encoding="utf-8")
+        while "gamma" not in output.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        watcher.join(5)
+    assert "gamma" in output.read_text(encoding="utf-8")
+    assert log.getvalue().count("Regenerated") == 2 and "Error:" in log.getvalue()
+
+
+def test_watch_reloads_helper_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import io
+    import threading
+    import time
+
+    from dynamic_cli_builder.generator import IncrementalGenerator
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "dcb_watch_helpers", raising=False)
+    helpers_py = tmp_path / "dcb_watch_helpers.py"
+    helpers_py.write_text('def greet(name: str):\n    """Hello"""\n', encoding="utf-8")
+    (tmp_path / "actions.py").write_text("from dcb_watch_helpers import greet\nACTIONS = {'greet': greet}\n", encoding="utf-8")
+    output = tmp_path / "config.json"
+    generator = IncrementalGenerator(tmp_path / "actions.py", output, "json", cache_dir=tmp_path / "cache")
+    stop = threading.Event()
+    log = io.StringIO()
+    watcher = threading.Thread(target=generator.watch, kwargs={"interval": 0.02, "stop": stop, "log": log})
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while "Regenerated" not in log.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        helpers_py.write_text('def greet(name: str, loud: bool = False):\n    """Hello there"""\n', encoding="utf-8")
+        while "loud" not in output.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        watcher.join(5)
+        sys.modules.pop("dcb_watch_helpers", None)
+    (command,) = json.loads(output.read_text(encoding="utf-8"))["commands"]
+    assert command["description"] == "Hello there"
+    assert [arg["name"] for arg in command["args"]] == ["name", "loud"]
+    # The recorded digests match what ran, so a fresh run agrees the output is current
+    assert IncrementalGenerator(tmp_path / "actions.py", output, "json", cache_dir=tmp_path / "cache").up_to_date()
+
+
+def test_main_watch_needs_output(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    import dynamic_cli_builder.__main__ as main_mod
+
+    with pytest.raises(SystemExit):
+        main_mod.main(["--actions", str(_write_actions(tmp_path)), "--generate", "--watch"])
+    assert "--watch needs --generate --output FILE" in capsys.readouterr().err
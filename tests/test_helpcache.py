@@ -0,0 +1,106 @@
+"""Tests for pre-rendered help text."""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from dynamic_cli_builder import helpcache
+from dynamic_cli_builder.__main__ import main
+from dynamic_cli_builder.builder import build_cli
+from dynamic_cli_builder.helpcache import HelpCache, command_from_argv, render_all, render_command_help
+
+CONFIG: Dict[str, Any] = {
+    "description": "help test",
+    "commands": [
+        {
+            "name": f"cmd{i}",
+            "description": f"Command number {i} " * 6,
+            "args": [
+                {"name": "name", "type": "str", "help": "Who to greet " * 8, "required": True},
+                {"name": "mode", "type": "str", "choices": ["a", "b"], "default": "a"},
+            ],
+            "action": "noop",
+        }
+        for i in range(3)
+    ],
+}
+
+
+def _argparse_help(argv: list) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), pytest.raises(SystemExit):
+        build_cli(CONFIG).parse_args(argv)
+    return out.getvalue()
+
+
+def test_rendered_help_matches_argparse() -> None:
+    rendered = render_all(CONFIG, "prog")
+    assert rendered["cmd1"] == render_command_help(CONFIG, "cmd1", "prog")
+    assert render_command_help(CONFIG, "cmd1") == _argparse_help(["cmd1", "--help"])
+    assert render_command_help(CONFIG, "nope") is None
+    assert set(rendered) == {"", "cmd0", "cmd1", "cmd2"}
+
+
+def test_command_from_argv() -> None:
+    assert command_from_argv(["-v", "DEBUG", "--log-queue", "cmd1", "--name", "x"]) == "cmd1"
+    assert command_from_argv(["--log-format", "json"]) is None
+
+
+def test_cache_hit_skips_config_loading(tmp_path: Path, monkeypatch) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG), encoding="utf-8")
+    first = HelpCache(config_file, tmp_path / "cache").get("cmd2", "prog")
+    assert first == render_command_help(CONFIG, "cmd2", "prog")
+
+    def _fail(*_: Any) -> None:
+        raise AssertionError("config was loaded")
+
+    monkeypatch.setattr(helpcache, "load_config", _fail)
+    assert HelpCache(config_file, tmp_path / "cache").get("cmd2", "prog") == first
+
+    # Editing the config invalidates the cache
+    config_file.write_text(json.dumps(CONFIG) + "\n", encoding="utf-8")
+    with pytest.raises(AssertionError):
+        HelpCache(config_file, tmp_path / "cache").get("cmd2", "prog")
+
+
+def test_cache_is_pruned_on_write(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(helpcache, "_MAX_ENTRIES", 2)
+    monkeypatch.setattr(helpcache, "_MAX_FILES", 2)
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG), encoding="utf-8")
+    cache = HelpCache(config_file, tmp_path / "cache")
+    for prog in ("a", "b", "c"):
+        cache.get("cmd2", prog)
+    entries = json.loads(cache.path.read_text(encoding="utf-8"))
+    assert [key.split("\0")[0] for key in entries] == ["b", "c"]
+
+    # Files of earlier config versions go, oldest first
+    paths = [cache.path]
+    for version in range(1, 3):
+        os.utime(paths[-1], ns=(version, version))
+        config_file.write_text(json.dumps(CONFIG) + " " * version, encoding="utf-8")
+        cache = HelpCache(config_file, tmp_path / "cache")
+        cache.get(None, "prog")
+        paths.append(cache.path)
+    assert sorted((tmp_path / "cache").iterdir()) == sorted(paths[1:])
+
+
+def test_runner_command_help_does_not_import_actions(tmp_path: Path, monkeypatch, capsys) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG), encoding="utf-8")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.setattr("sys.argv", ["dcb"])
+    main(["-c", str(config_file), "-a", str(tmp_path / "missing.py"), "-v", "INFO", "cmd0", "--help"])
+    assert capsys.readouterr().out == render_command_help(CONFIG, "cmd0", "dcb")
+    assert list((tmp_path / "xdg" / "dynamic_cli_builder" / "help").glob("*.json"))
+
+    # The runner's own options are still described by plain --help
+    main(["-c", str(config_file), "--help"])
+    assert "--config CONFIG" in capsys.readouterr().out
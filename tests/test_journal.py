@@ -0,0 +1,74 @@
+"""Tests for the resumable batch journal."""
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from dynamic_cli_builder.batch import run_batch
+from dynamic_cli_builder.journal import Journal, result_digest
+
+CONFIG: Dict[str, Any] = {
+    "commands": [
+        {"name": "inc", "description": "d", "args": [{"name": "n", "type": "int"}], "action": "inc"},
+    ]
+}
+
+
+def _run(lines: List[str], journal: Journal, actions: Dict[str, Any]) -> List[Dict[str, Any]]:
+    report = io.StringIO()
+    with journal:
+        run_batch(lines, CONFIG, actions, report, jobs=2, journal=journal)
+    return [json.loads(line) for line in report.getvalue().splitlines()]
+
+
+def test_resume_skips_completed_and_reruns_failures(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.journal"
+    lines = [f"inc --n {i}" for i in range(6)]
+
+    def flaky(n: int) -> int:
+        if n == 4:
+            raise RuntimeError("crash")
+        return n + 1
+
+    first = _run(lines, Journal(path), {"inc": flaky})
+    assert sum(e["status"] == "ok" for e in first) == 5
+
+    records = [json.loads(raw) for raw in path.read_text().splitlines()]
+    assert {r["i"] for r in records} == set(range(1, 7))
+    assert next(r for r in records if r["i"] == 1)["d"] == result_digest(1)
+
+    ran: List[int] = []
+    second = _run(lines, Journal(path, resume=True), {"inc": lambda n: ran.append(n)})
+    assert ran == [4] and [e["index"] for e in second] == [5]
+
+    # Everything is complete now; a changed line is not considered done
+    third = _run(lines[:5] + ["inc --n 99"], Journal(path, resume=True), {"inc": lambda n: n})
+    assert [e["line"] for e in third] == ["inc --n 99"]
+
+
+def test_truncated_tail_and_fresh_start(tmp_path: Path) -> None:
+    path = tmp_path / "j"
+    with Journal(path, sync_every=2) as journal:
+        journal.record(1, "inc --n 1", "ok", 2)
+    with open(path, "a") as f:
+        f.write('{"i": 2, "h": "ab')  # killed mid-write
+    with Journal(path, resume=True) as resumed:
+        assert resumed.done(1, "inc --n 1")
+    with Journal(path) as fresh:
+        assert not fresh.done(1, "inc --n 1")
+    assert path.read_text() == ""
+
+
+def test_resume_after_torn_tail_keeps_new_records(tmp_path: Path) -> None:
+    path = tmp_path / "j"
+    with Journal(path) as journal:
+        journal.record(1, "a", "ok", 1)
+    with open(path, "a") as f:
+        f.write('{"i":2,"h":"0f')  # killed mid-write
+    with Journal(path, resume=True) as resumed:
+        resumed.record(2, "b", "ok", 2)
+    with Journal(path, resume=True) as again:
+        assert again.done(1, "a") and again.done(2, "b")
+    assert all(json.loads(line) for line in path.read_text().splitlines())
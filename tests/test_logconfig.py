@@ -0,0 +1,107 @@
+"""Tests for process-wide logging configuration."""
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+
+from dynamic_cli_builder import logconfig
+from dynamic_cli_builder.logconfig import configure_logging
+
+
+@contextmanager
+def _bare_root() -> Iterator[logging.Logger]:
+    # pytest attaches capture handlers to the root logger during the test
+    # call, so they are removed inside the test body and restored afterwards.
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers.clear()
+    logconfig._teardown()
+    try:
+        yield root
+    finally:
+        logconfig._teardown()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+
+def test_configured_once_then_level_only(capsys) -> None:
+    with _bare_root() as root:
+        configure_logging("INFO")
+        handler = root.handlers[0]
+        configure_logging("DEBUG")
+        configure_logging("ERROR")
+        assert root.handlers == [handler]
+        assert root.level == logging.ERROR
+        logging.getLogger("x").warning("hidden")
+        logging.getLogger("x").error("shown %d", 1)
+    err = capsys.readouterr().err
+    assert "hidden" not in err and "ERROR - shown 1" in err
+
+
+def test_json_format(capsys) -> None:
+    with _bare_root():
+        configure_logging("INFO", fmt="json")
+        logging.getLogger("dcb.test").info("hello %s", "world")
+    record = json.loads(capsys.readouterr().err.strip())
+    assert record["message"] == "hello world"
+    assert record["level"] == "INFO" and record["logger"] == "dcb.test"
+
+
+def test_queue_mode_writes_from_listener(capsys) -> None:
+    with _bare_root() as root:
+        configure_logging("INFO", queue=True)
+        assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+        payload = {"n": 1}
+        logging.getLogger("q").info("payload %s", payload)
+        payload["n"] = 2  # message was captured at call time
+    # leaving the block stopped the listener, draining the queue
+    assert "payload {'n': 1}" in capsys.readouterr().err
+
+
+def test_concurrent_first_calls_install_one_handler(monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+    import time
+
+    install = logconfig._install
+
+    def slow_install(fmt: str, use_queue: bool) -> None:
+        time.sleep(0.01)  # widen the check-then-install window
+        install(fmt, use_queue)
+
+    monkeypatch.setattr(logconfig, "_install", slow_install)
+    barrier = threading.Barrier(8)
+
+    def _configure() -> None:
+        barrier.wait()
+        configure_logging("INFO", queue=True)
+
+    with _bare_root() as root:
+        threads = [threading.Thread(target=_configure) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(root.handlers) == 1
+
+
+def test_switching_mode_replaces_handler() -> None:
+    with _bare_root() as root:
+        configure_logging("INFO")
+        configure_logging("INFO", queue=True)
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+        with pytest.raises(ValueError):
+            configure_logging("INFO", fmt="xml")
+
+
+def test_foreign_handlers_left_alone() -> None:
+    with _bare_root() as root:
+        mine = logging.NullHandler()
+        root.addHandler(mine)
+        configure_logging("DEBUG")
+        assert root.handlers == [mine]
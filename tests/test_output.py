@@ -0,0 +1,104 @@
+"""Tests for streaming action output."""
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from dynamic_cli_builder.output import write_result
+
+
+def test_scalars_and_none() -> None:
+    buf = io.StringIO()
+    assert write_result(None, "text", buf) == 0
+    assert write_result("hello", "text", buf) == 1
+    assert write_result({"a": 1}, "jsonl", buf) == 1
+    assert buf.getvalue() == 'hello\n{"a": 1}\n'
+
+
+def test_generator_streams_lazily() -> None:
+    pulled: List[int] = []
+
+    class Recorder(io.StringIO):
+        def write(self, s: str) -> int:
+            # The first row is written before the generator is drained
+            pulled.append(len(produced))
+            return super().write(s)
+
+    produced: List[int] = []
+
+    def rows() -> Iterator[int]:
+        for i in range(2000):
+            produced.append(i)
+            yield i
+
+    buf = Recorder()
+    assert write_result(rows(), "text", buf) == 2000
+    assert pulled[0] == 1
+    assert buf.getvalue().splitlines()[-1] == "1999"
+
+
+@pytest.mark.parametrize(
+    ("rows", "expected"),
+    [
+        ([{"a": 1, "b": "x"}, {"a": 2, "b": "y,z"}], 'a,b\r\n1,x\r\n2,"y,z"\r\n'),
+        ([(1, 2), [3, 4], 5], "1,2\r\n3,4\r\n5\r\n"),
+    ],
+)
+def test_csv(rows, expected: str) -> None:
+    buf = io.StringIO()
+    write_result(iter(rows), "csv", buf)
+    assert buf.getvalue() == expected
+
+
+def test_jsonl_rows() -> None:
+    buf = io.StringIO()
+    write_result(({"i": i} for i in range(3)), "jsonl", buf)
+    assert buf.getvalue() == '{"i": 0}\n{"i": 1}\n{"i": 2}\n'
+
+
+def test_broken_pipe_closes_generator() -> None:
+    closed = []
+
+    def rows() -> Iterator[int]:
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    class Broken(io.StringIO):
+        def write(self, s: str) -> int:
+            raise BrokenPipeError
+
+    with pytest.raises(BrokenPipeError):
+        write_result(rows(), "text", Broken())
+    assert closed == [True]
+
+
+def test_main_stream_into_head(tmp_path: Path) -> None:
+    (tmp_path / "actions.py").write_text(
+        "import itertools\n"
+        "def count(start: int):\n"
+        "    return itertools.count(start)\n"
+        "ACTIONS = {'count': count}\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "config.yaml").write_text(
+        "commands:\n  - {name: count, description: c, args: [{name: start, type: int}], action: count}\n",
+        encoding="utf-8",
+    )
+    root = Path(__file__).resolve().parents[1]
+    cmd = (
+        f"{sys.executable} -m dynamic_cli_builder -c config.yaml -a actions.py "
+        "--stream jsonl count --start 5 | head -n 3"
+    )
+    proc = subprocess.run(
+        cmd, shell=True, cwd=str(tmp_path), capture_output=True, text=True, timeout=30,
+        env={"PYTHONPATH": str(root), "PATH": "/usr/bin:/bin"},
+    )
+    assert proc.stdout.split() == ["5", "6", "7"]
+    assert "Traceback" not in proc.stderr
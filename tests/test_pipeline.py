@@ -0,0 +1,127 @@
+"""Tests for in-process command pipelines."""
+from __future__ import annotations
+
+import types
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from dynamic_cli_builder.pipeline import run_pipeline, split_pipeline
+
+
+@pytest.fixture()
+def config() -> Dict[str, Any]:
+    return {
+        "description": "pipes",
+        "commands": [
+            {"name": "produce", "description": "Numbers", "args": [{"name": "n", "type": "int"}], "action": "produce"},
+            {
+                "name": "scale",
+                "description": "Multiply",
+                "args": [{"name": "by", "type": "int"}, {"name": "items", "type": "json"}],
+                "action": "scale",
+            },
+            {
+                "name": "total",
+                "description": "Sum",
+                "args": [{"name": "label", "type": "str"}, {"name": "values", "type": "json"}],
+                "action": "total",
+                "pipe_arg": "values",
+            },
+        ],
+    }
+
+
+def test_split_pipeline() -> None:
+    assert split_pipeline(["a", "--x", "1", "|", "b"]) == [["a", "--x", "1"], ["b"]]
+    with pytest.raises(ValueError):
+        split_pipeline(["a", "|"])
+
+
+def test_objects_and_generators_flow_between_stages(config) -> None:
+    produced: List[int] = []
+
+    def produce(n: int) -> Iterator[int]:
+        for i in range(n):
+            produced.append(i)
+            yield i
+
+    def scale(by: int, items: Iterator[int]) -> Iterator[int]:
+        assert isinstance(items, types.GeneratorType)
+        return (i * by for i in items)
+
+    def total(label: str, values: Iterator[int]) -> Dict[str, int]:
+        return {label: sum(values)}
+
+    actions = {"produce": produce, "scale": scale, "total": total}
+    stages = split_pipeline(["produce", "--n", "4", "|", "scale", "--by", "10", "|", "total", "--label", "t"])
+    assert run_pipeline(stages, config, actions) == {"t": 60}
+    assert produced == [0, 1, 2, 3]
+
+
+def test_pipeline_is_lazy(config) -> None:
+    pulled: List[int] = []
+
+    def produce(n: int) -> Iterator[int]:
+        for i in range(n):
+            pulled.append(i)
+            yield i
+
+    actions = {"produce": produce, "scale": lambda by, items: (i * by for i in items)}
+    result = run_pipeline([["produce", "--n", "1000000"], ["scale", "--by", "2"]], config, actions)
+    assert next(result) == 0 and next(result) == 2
+    assert pulled == [0, 1]
+
+
+def test_stage_without_free_arg_errors(config) -> None:
+    actions = {"produce": lambda n: n, "scale": lambda by, items: items}
+    with pytest.raises(ValueError, match="no free argument"):
+        run_pipeline([["produce", "--n", "1"], ["scale", "--by", "1", "--items", "[1]"]], config, actions)
+
+
+def test_unknown_pipe_arg_is_rejected(config) -> None:
+    from dynamic_cli_builder.loader import _validate_config_structure
+    from dynamic_cli_builder.schema import ConfigValidationError
+    from dynamic_cli_builder.spec import compile_config
+
+    config["commands"][2]["pipe_arg"] = "valeus"
+    with pytest.raises(ConfigValidationError, match=r"commands\[2\]\.pipe_arg: 'valeus' is not an argument of 'total'"):
+        _validate_config_structure(config)
+    with pytest.raises(ValueError, match="valeus"):
+        compile_config(config)
+
+
+def test_main_runs_pipeline(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from dynamic_cli_builder.__main__ import main
+
+    (tmp_path / "actions.py").write_text(
+        "def produce(n):\n"
+        "    return (i for i in range(n))\n"
+        "def scale(by, items):\n"
+        "    for i in items:\n"
+        "        yield i * by\n"
+        "ACTIONS = {'produce': produce, 'scale': scale}\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "config.yaml").write_text(
+        "commands:\n"
+        "  - {name: produce, description: p, args: [{name: n, type: int}], action: produce}\n"
+        "  - {name: scale, description: s, args: [{name: by, type: int}, {name: items, type: json}], action: scale}\n",
+        encoding="utf-8",
+    )
+    main([
+        "--config", str(tmp_path / "config.yaml"), "--actions", str(tmp_path / "actions.py"),
+        "produce", "--n", "3", "|", "scale", "--by", "5",
+    ])
+    assert capsys.readouterr().out.split() == ["0", "5", "10"]
+
+
+def test_required_pipe_arg_receives_piped_input(config) -> None:
+    config["commands"][2]["args"][1]["required"] = True
+    actions = {"produce": lambda n: range(n), "total": lambda label, values: {label: sum(values)}}
+    stages = split_pipeline(["produce", "--n", "4", "|", "total", "--label", "t"])
+    assert run_pipeline(stages, config, actions) == {"t": 6}
+    # As the first stage it still has to be given
+    with pytest.raises(SystemExit):
+        run_pipeline([["total", "--label", "t"]], config, actions)
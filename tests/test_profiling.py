@@ -0,0 +1,72 @@
+"""Tests for per-action memory profiling."""
+from __future__ import annotations
+
+import tracemalloc
+import weakref
+from typing import Any, List
+
+from dynamic_cli_builder.builder import build_cli, execute_command
+from dynamic_cli_builder.profiling import MemoryReport, MemoryTracker, current_rss, format_report, memory_profile
+
+_LEAK: List[Any] = []
+
+
+def _allocate() -> None:
+    _LEAK.append(bytearray(2_000_000))
+
+
+def test_peak_and_retained_sites() -> None:
+    tracker = MemoryTracker()
+    with memory_profile("alloc", tracker=tracker) as profile:
+        _allocate()
+    report = profile.report
+    assert report is not None and report.peak >= 2_000_000
+    assert report.top and report.top[0][0].endswith(f"{__file__}:{_allocate.__code__.co_firstlineno + 1}")
+    assert "peak 1.9 MiB" in format_report(report)
+    assert not tracemalloc.is_tracing()
+    _LEAK.clear()
+
+
+def test_tracker_reports_growth_across_calls() -> None:
+    tracker = MemoryTracker()
+    for _ in range(3):
+        with memory_profile("alloc", tracker=tracker):
+            _allocate()
+    (summary,) = tracker.summary()
+    assert summary["calls"] == 3
+    if current_rss() is not None:
+        assert summary["rss_growth"] >= 0
+    _LEAK.clear()
+
+
+def test_tracker_keeps_totals_not_reports() -> None:
+    class Sites(list):  # a list that can be weakly referenced
+        pass
+
+    tracker = MemoryTracker()
+    sites = Sites([("x.py:1", 10, 1)])
+    ref = weakref.ref(sites)
+    for peak, before, after in ((5, 100, 150), (9, 150, 160), (7, 160, 170)):
+        tracker.record(MemoryReport("a", peak, before, after, sites))
+    del sites
+    assert ref() is None
+    assert tracker.summary() == [
+        {"action": "a", "calls": 3, "max_peak": 9, "rss_first": 100, "rss_last": 170, "rss_growth": 70}
+    ]
+
+
+def test_existing_tracing_is_left_running() -> None:
+    tracemalloc.start()
+    try:
+        with memory_profile("noop", tracker=MemoryTracker()):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_memprofile_flag(capsys) -> None:
+    config = {"description": "d", "commands": [{"name": "go", "description": "g", "action": "go", "args": []}]}
+    parsed = build_cli(config).parse_args(["--memprofile", "go"])
+    assert execute_command(parsed, config, {"go": lambda: 42}) == 42
+    assert "[memprofile] go: peak" in capsys.readouterr().err
@@ -0,0 +1,158 @@
+"""Tests for shared ``RESOURCES`` injected into actions."""
+from __future__ import annotations
+
+import io
+import json
+import threading
+from types import ModuleType
+from typing import Any, Dict, List
+
+import pytest
+
+from dynamic_cli_builder.batch import run_batch
+from dynamic_cli_builder.builder import build_cli, execute_command
+from dynamic_cli_builder.generator import generate_config
+from dynamic_cli_builder.resources import ResourcePool, current_pool, resource, use_resources
+
+CONFIG: Dict[str, Any] = {
+    "description": "resources",
+    "commands": [
+        {"name": "get", "description": "get", "args": [{"name": "key", "type": "str", "required": True}], "action": "get"},
+    ],
+}
+
+
+class _Connection:
+    def __init__(self, events: List[str]) -> None:
+        self.events = events
+        events.append("open")
+
+    def __enter__(self) -> "_Connection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.events.append("close")
+
+
+@pytest.fixture(autouse=True)
+def _no_pool() -> Any:
+    yield
+    use_resources(None)
+
+
+def test_factory_kinds_and_teardown_order() -> None:
+    events: List[str] = []
+
+    def plain() -> str:
+        return "plain"
+
+    def gen() -> Any:
+        events.append("gen setup")
+        yield "gen"
+        events.append("gen teardown")
+
+    pool = ResourcePool({"plain": plain, "gen": gen, "conn": lambda: _Connection(events)})
+    assert pool.get("plain") == "plain"
+    assert pool.get("gen") == "gen" and pool.get("gen") == "gen"
+    conn = pool.get("conn")
+    assert isinstance(conn, _Connection) and pool.get("conn") is conn
+    pool.close()
+    assert events == ["gen setup", "open", "close", "gen teardown"]
+
+
+def test_thread_scope() -> None:
+    @resource(scope="thread")
+    def session() -> object:
+        return object()
+
+    pool = ResourcePool({"session": session, "shared": object})
+    seen: List[Any] = []
+
+    def _worker() -> None:
+        seen.append((pool.get("session"), pool.get("shared")))
+
+    threads = [threading.Thread(target=_worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(session) for session, _ in seen}) == 3
+    assert len({id(shared) for _, shared in seen}) == 1
+    with pytest.raises(ValueError, match="Unknown resource scope"):
+        resource(scope="request")
+
+
+def test_thread_scope_torn_down_when_executor_finishes() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    events: List[str] = []
+
+    @resource(scope="thread")
+    def conn() -> Any:
+        yield object()
+        events.append("close")
+
+    pool = ResourcePool({"conn": conn})
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: pool.get("conn"), range(10)))
+    assert 1 <= len(events) <= 2  # one per worker thread that ran, already gone
+    pool.get("conn")
+    pool.close()
+    assert events.count("close") == len(events) and len(events) >= 2
+
+
+def test_wanted_by_depends_on_cli_args() -> None:
+    def act(db: Any = None) -> Any:
+        return db
+
+    pool = ResourcePool({"db": object})
+    assert pool.wanted_by(act, ("db",)) == ()
+    assert pool.wanted_by(act, ()) == ("db",)
+
+
+def test_injected_by_name_and_cli_args_win() -> None:
+    opened: List[str] = []
+
+    def db() -> Any:
+        opened.append("db")
+        yield {"a": 1}
+
+    def get(key: str, db: Dict[str, int]) -> int:
+        return db[key]
+
+    pool = use_resources({"db": db, "key": lambda: "never"})
+    assert current_pool() is pool
+    cli = build_cli(CONFIG)
+    for _ in range(3):
+        assert execute_command(cli.parse_args(["get", "--key", "a"]), CONFIG, {"get": get}) == 1
+    assert opened == ["db"]
+
+
+def test_batch_reuses_one_connection() -> None:
+    events: List[str] = []
+    use_resources({"conn": lambda: _Connection(events)})
+
+    def get(key: str, conn: _Connection) -> int:
+        return id(conn)
+
+    report = io.StringIO()
+    assert run_batch([f"get --key k{i}" for i in range(20)], CONFIG, {"get": get}, report, jobs=4) == 0
+    results = {json.loads(line)["result"] for line in report.getvalue().splitlines()}
+    assert len(results) == 1 and events == ["open"]
+    use_resources(None)
+    assert events == ["open", "close"]
+
+
+def test_generator_skips_resource_parameters() -> None:
+    module = ModuleType("actions")
+
+    def db() -> None:
+        return None
+
+    def get(key: str, db: Any) -> None:
+        return None
+
+    module.__dict__.update(db=db, get=get, RESOURCES={"db": db})
+    commands = generate_config(module)["commands"]
+    assert [command["name"] for command in commands] == ["get"]
+    assert [arg["name"] for arg in commands[0]["args"]] == ["key"]
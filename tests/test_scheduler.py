@@ -0,0 +1,126 @@
+"""Tests for the batch scheduler and ``--batch``."""
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from dynamic_cli_builder.batch import run_batch
+from dynamic_cli_builder.loader import _validate_config_structure
+from dynamic_cli_builder.scheduler import CommandPolicy, Scheduler, TokenBucket
+
+
+def _command(name: str, schedule: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    command: Dict[str, Any] = {
+        "name": name,
+        "description": name,
+        "args": [{"name": "n", "type": "int", "required": True}],
+        "action": name,
+    }
+    if schedule is not None:
+        command["schedule"] = schedule
+    return command
+
+
+def _run(config: Dict[str, Any], actions: Dict[str, Any], lines: List[str], jobs: int = 4) -> List[Dict[str, Any]]:
+    report = io.StringIO()
+    run_batch(lines, config, actions, report, jobs)
+    return [json.loads(line) for line in report.getvalue().splitlines()]
+
+
+def test_token_bucket() -> None:
+    bucket = TokenBucket(rate=2, burst=2, now=0.0)
+    assert bucket.take(0.0) == 0.0 and bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5) == 0.0
+
+
+def test_policy_retry_matching() -> None:
+    policy = CommandPolicy({"retries": 2, "retry_on": ["OSError"], "backoff": 0.1, "max_backoff": 0.15})
+    assert policy.should_retry(ConnectionError(), 1)  # subclass of OSError
+    assert not policy.should_retry(ValueError(), 1)
+    assert not policy.should_retry(OSError(), 3)
+    assert [policy.delay(1), policy.delay(2), policy.delay(3)] == [0.1, 0.15, 0.15]
+
+
+def test_schedule_is_validated() -> None:
+    with pytest.raises(ValueError, match=r"schedule.concurrency: must be at least 1"):
+        _validate_config_structure({"commands": [_command("a", {"concurrency": 0})]})
+    with pytest.raises(ValueError, match=r"schedule.rate: must be greater than 0"):
+        _validate_config_structure({"commands": [_command("a", {"rate": 0})]})
+    with pytest.raises(ValueError, match=r"^--batch-jobs must be at least 1$"):
+        Scheduler({"commands": [_command("a", {})]}, {}, jobs=0)
+
+
+def test_concurrency_cap_and_other_commands_not_blocked() -> None:
+    lock = threading.Lock()
+    active = {"slow": 0, "peak": 0}
+
+    def slow(n: int) -> int:
+        with lock:
+            active["slow"] += 1
+            active["peak"] = max(active["peak"], active["slow"])
+        time.sleep(0.02)
+        with lock:
+            active["slow"] -= 1
+        return n
+
+    config = {"commands": [_command("slow", {"concurrency": 1}), _command("fast")]}
+    entries = _run(config, {"slow": slow, "fast": lambda n: n}, [f"slow --n {i}" for i in range(3)] + ["fast --n 9"])
+    assert active["peak"] == 1
+    assert [e["line"] for e in entries].index("fast --n 9") < 2  # not queued behind the capped command
+    assert all(e["status"] == "ok" for e in entries)
+
+
+def test_priority_order() -> None:
+    seen: List[str] = []
+    config = {"commands": [_command("low"), _command("high", {"priority": 5})]}
+    actions = {"low": lambda n: seen.append(f"low{n}"), "high": lambda n: seen.append(f"high{n}")}
+    _run(config, actions, ["low --n 1", "low --n 2", "high --n 1"], jobs=1)
+    assert seen == ["high1", "low1", "low2"]
+
+
+def test_rate_limit() -> None:
+    config = {"commands": [_command("ping", {"rate": 50, "burst": 1})]}
+    start = time.monotonic()
+    _run(config, {"ping": lambda n: n}, [f"ping --n {i}" for i in range(6)])
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_retries_with_backoff_then_failure_reported() -> None:
+    calls = {"flaky": 0}
+
+    def flaky(n: int) -> str:
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise TimeoutError("slow upstream")
+        return "ok"
+
+    def broken(n: int) -> None:
+        raise KeyError("nope")
+
+    schedule = {"retries": 3, "retry_on": ["TimeoutError"], "backoff": 0.01}
+    config = {"commands": [_command("flaky", schedule), _command("broken", schedule)]}
+    lines = ["# comment", "flaky --n 1", "", "broken --n 1", "broken --n oops"]
+    entries = {e["index"]: e for e in _run(config, {"flaky": flaky, "broken": broken}, lines)}
+    assert entries[2]["status"] == "ok" and entries[2]["attempts"] == 3
+    assert entries[4] == {**entries[4], "status": "error", "attempts": 1}
+    assert entries[4]["error"].startswith("KeyError")
+    assert entries[5]["status"] == "error" and entries[5]["attempts"] == 0
+
+
+def test_generator_results_run_in_the_worker() -> None:
+    def rows(n: int) -> Iterator[int]:
+        for i in range(n):
+            if i == 2:
+                raise ValueError("bad row")
+            yield i
+
+    config = {"commands": [_command("rows")]}
+    entries = {e["index"]: e for e in _run(config, {"rows": rows}, ["rows --n 2", "rows --n 3"])}
+    assert entries[1]["status"] == "ok" and entries[1]["result"] == [0, 1]
+    assert entries[2]["status"] == "error" and entries[2]["error"] == "ValueError: bad row"
@@ -0,0 +1,124 @@
+"""Tests for the compiled config schema validator."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from dynamic_cli_builder.loader import load_config
+from dynamic_cli_builder.schema import (
+    ConfigError,
+    ConfigValidationError,
+    compile_schema,
+    config_validator,
+)
+
+
+def _command(**overrides):
+    cmd = {
+        "name": "greet",
+        "description": "Say hi",
+        "args": [{"name": "name", "type": "str"}],
+        "action": "greet",
+    }
+    cmd.update(overrides)
+    return cmd
+
+
+def test_valid_config_has_no_errors() -> None:
+    assert config_validator().errors({"commands": [_command()]}) == []
+
+
+def test_all_errors_reported_with_paths() -> None:
+    cfg = {
+        "commands": [
+            _command(name="", action=3),
+            _command(args=[{"name": "x"}, {"name": "y", "type": "int", "rules": "min"}]),
+            "oops",
+        ]
+    }
+    errors = config_validator().errors(cfg)
+    assert set(errors) == {
+        ConfigError("$.commands[0].name", "must be a non-empty string"),
+        ConfigError("$.commands[0].action", "must be a string"),
+        ConfigError("$.commands[1].args[0]", "missing required key 'type'"),
+        ConfigError("$.commands[1].args[1].rules", "must be a mapping if present"),
+        ConfigError("$.commands[2]", "must be a mapping"),
+    }
+
+
+@pytest.mark.parametrize(
+    ("cfg", "expected"),
+    [
+        ([], "$: config root must be a mapping (dict)"),
+        ({}, "$: missing required key 'commands'"),
+        ({"commands": []}, "$.commands: must be a non-empty list"),
+    ],
+)
+def test_root_errors(cfg, expected: str) -> None:
+    with pytest.raises(ConfigValidationError) as excinfo:
+        config_validator().validate(cfg)
+    assert str(excinfo.value) == expected
+
+
+def test_definition_validates_subtree_only() -> None:
+    command = config_validator().definition("command")
+    errors = command.errors({"name": "x", "description": "d", "action": "a"}, "$.commands[7]")
+    assert errors == [ConfigError("$.commands[7]", "missing required key 'args'")]
+
+
+def test_compile_custom_schema_rejects_bool_for_number() -> None:
+    validator = compile_schema({"type": "object", "properties": {"n": {"type": "number"}}})
+    assert validator.errors({"n": 1.5}) == []
+    assert validator.errors({"n": True}) == [ConfigError("$.n", "must be a number")]
+
+
+def test_load_config_raises_value_error_with_every_error(tmp_path: Path) -> None:
+    bad = tmp_path / "bad.yaml"
+    bad.write_text(
+        "commands:\n"
+        "  - {name: a, args: [], action: a}\n"
+        "  - {name: b, description: d, args: {}, action: b}\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError) as excinfo:
+        load_config(bad)
+    assert excinfo.value.errors == [
+        ConfigError("$.commands[0]", "missing required key 'description'"),
+        ConfigError("$.commands[1].args", "must be a list"),
+    ]
+
+
+def test_main_check_flag(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from dynamic_cli_builder.__main__ import main
+
+    good = tmp_path / "config.yaml"
+    good.write_text(
+        "commands:\n  - {name: a, description: d, args: [], action: a}\n", encoding="utf-8"
+    )
+    main(["--check", "--config", str(good)])
+    assert "OK: 1 command(s)" in capsys.readouterr().out
+
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("commands:\n  - {name: a}\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        main(["--check", "--config", str(bad)])
+    err = capsys.readouterr().err
+    assert "$.commands[0]: missing required key 'description'" in err
+    assert "$.commands[0]: missing required key 'action'" in err
+
+
+def test_check_after_command_belongs_to_the_command(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from dynamic_cli_builder.__main__ import main
+
+    (tmp_path / "actions.py").write_text(
+        "ACTIONS = {'run': lambda check, batch: print(f'ran {check} {batch}')}\n", encoding="utf-8"
+    )
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        "commands:\n"
+        "  - {name: run, description: r, args: [{name: check, type: str}, {name: batch, type: int}], action: run}\n",
+        encoding="utf-8",
+    )
+    main(["-c", str(config), "-a", str(tmp_path / "actions.py"), "run", "--check", "x", "--batch", "5"])
+    assert capsys.readouterr().out == "ran x 5\n"
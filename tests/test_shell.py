@@ -0,0 +1,71 @@
+"""Tests for the resident interactive shell."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+from dynamic_cli_builder.shell import ShellCompleter, run_shell
+
+
+@pytest.fixture()
+def config() -> Dict[str, Any]:
+    return {
+        "description": "shell demo",
+        "commands": [
+            {
+                "name": "add",
+                "description": "Add",
+                "args": [{"name": "a", "type": "int"}, {"name": "b", "type": "int"}],
+                "action": "add",
+            },
+            {"name": "about", "description": "About", "args": [], "action": "about"},
+        ],
+    }
+
+
+def _feed(monkeypatch: pytest.MonkeyPatch, lines: List[str]) -> None:
+    it = iter(lines)
+
+    def fake_input(prompt: str = "") -> str:
+        try:
+            return next(it)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr("builtins.input", fake_input)
+
+
+def test_shell_runs_commands_in_loop(monkeypatch, config, capsys) -> None:
+    seen: List[int] = []
+    actions = {"add": lambda a, b: seen.append(a + b), "about": lambda: seen.append(0)}
+    _feed(monkeypatch, ["add --a 1 --b 2", "", "# comment", "about", "add --a 'x'", "add --a 5 --b 5", "exit", "about"])
+
+    run_shell(config, actions, history_file=None)
+
+    assert seen == [3, 0, 10]
+    err = capsys.readouterr().err
+    assert "[add:" in err and " ms]" in err
+    assert "invalid" in err  # argparse error for --a 'x' does not end the session
+
+
+def test_shell_reports_action_errors_and_continues(monkeypatch, config, capsys) -> None:
+    def boom() -> None:
+        raise RuntimeError("kaput")
+
+    _feed(monkeypatch, ["about", "help add"])
+    run_shell(config, {"about": boom}, history_file=None, timing=False)
+    captured = capsys.readouterr()
+    assert "Error: kaput" in captured.err
+    assert "--a" in captured.out  # help for the add command
+
+
+def test_completer_candidates(config) -> None:
+    completer = ShellCompleter(config, ["--log-level"])
+    assert completer.candidates("a", "a") == ["about", "add"]
+    assert completer.candidates("add ", "") == ["--a", "--b"]
+    assert completer.candidates("add --a 1 --", "--") == ["--b"]
+    assert completer.candidates("--log-level DEBUG add --", "--") == ["--a", "--b"]
+    assert completer.candidates("--", "--") == ["--log-level"]
+    assert completer.candidates("help ab", "ab") == ["about"]
+    assert completer.candidates("", "ex") == ["exit"]
@@ -0,0 +1,97 @@
+"""Tests for the compiled CommandSpec/ArgSpec config model."""
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict
+
+import pytest
+
+from dynamic_cli_builder.builder import build_cli, execute_command
+from dynamic_cli_builder.spec import ArgSpec, ConfigSpec, as_spec, compile_config
+
+
+@pytest.fixture()
+def config() -> Dict[str, Any]:
+    return {
+        "description": "spec demo",
+        "commands": [
+            {
+                "name": "pick",
+                "description": "Pick one",
+                "args": [
+                    {"name": "opt", "type": "int", "help": "Option", "choices": ["1", 2], "default": 2},
+                    {"name": "tag", "type": "str", "rules": {"regex": "^[a-z]+$"}, "custom": True},
+                ],
+                "action": "pick",
+                "pipe_arg": "tag",
+            }
+        ],
+    }
+
+
+def test_compile_indexes_and_precomputes(config) -> None:
+    spec = compile_config(config)
+    command = spec.command("pick")
+    assert command is spec.index["pick"] and spec.command("nope") is None
+    opt, tag = command.args
+    assert command.arg_names == ("opt", "tag")
+    assert opt.flag == "--opt" and opt.choices == (1, 2)
+    assert opt.converter("1") == 1
+    assert tag.name is sys.intern("tag")
+    with pytest.raises(Exception):
+        tag.converter("NOPE")
+
+
+def test_specs_are_slotted_and_frozen(config) -> None:
+    spec = compile_config(config)
+    arg = spec.commands[0].args[0]
+    assert not hasattr(arg, "__dict__")
+    with pytest.raises(AttributeError):
+        arg.name = "other"  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        spec.description = "x"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        spec.index["other"] = spec.commands[0]  # type: ignore[index]
+    with pytest.raises(TypeError):
+        spec.commands[0].args[1].rules["regex"] = ".*"  # type: ignore[index]
+    # The source dict's rules are copied, not shared
+    config["commands"][0]["args"][1]["rules"]["regex"] = ".*"
+    assert spec.commands[0].args[1].rules["regex"] == "^[a-z]+$"
+
+
+def test_to_dict_round_trip(config) -> None:
+    data = compile_config(config).to_dict()
+    assert data == config and list(data["commands"][0]) == list(config["commands"][0])
+    assert data["commands"][0]["args"][0]["choices"] == ["1", 2]  # as written, not coerced
+    assert type(data["commands"][0]["args"][1]["rules"]) is dict
+    assert compile_config(data).to_dict() == data
+
+
+def test_as_spec_caches_by_identity(config) -> None:
+    spec = as_spec(config)
+    assert isinstance(spec, ConfigSpec)
+    assert as_spec(config) is spec
+    assert as_spec(spec) is spec
+    # The cache is by identity: a mutated dict has to be recompiled
+    config["commands"][0]["description"] = "Changed"
+    assert as_spec(config) is spec
+    assert compile_config(config).command("pick").description == "Changed"
+    assert as_spec(dict(config)).command("pick").description == "Changed"
+
+
+def test_builder_accepts_spec_and_dict(config) -> None:
+    seen = {}
+    actions = {"pick": lambda opt, tag: seen.update(opt=opt, tag=tag)}
+    spec = compile_config(config)
+    for cfg in (spec, config):
+        ns = build_cli(cfg).parse_args(["pick", "--opt", "1", "--tag", "abc"])
+        execute_command(ns, cfg, actions)
+        assert seen == {"opt": 1, "tag": "abc"}
+
+
+def test_argspec_defaults() -> None:
+    arg = ArgSpec({"name": "x"})
+    assert arg.type == "str" and arg.required is False and arg.choices is None
+    assert arg.to_dict() == {"name": "x"}
+    explicit = {"name": "x", "type": "str", "required": False, "default": None}
+    assert ArgSpec(explicit).to_dict() == explicit
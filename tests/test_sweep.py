@@ -0,0 +1,141 @@
+"""Tests for parameter sweeps."""
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from dynamic_cli_builder.sweep import expand_sweep, parse_sweep, run_sweep
+
+
+@pytest.fixture()
+def config() -> Dict[str, Any]:
+    return {
+        "description": "sweeps",
+        "commands": [
+            {
+                "name": "report",
+                "description": "Report",
+                "args": [
+                    {"name": "region", "type": "str", "required": True, "choices": ["eu", "us", "ap"]},
+                    {"name": "day", "type": "int", "rules": {"min": 1, "max": 31}},
+                    {"name": "kind", "type": "str", "default": "daily"},
+                ],
+                "action": "report",
+            }
+        ],
+    }
+
+
+def _lines(buf: io.StringIO) -> List[Dict[str, Any]]:
+    return sorted((json.loads(line) for line in buf.getvalue().splitlines()), key=lambda e: e["index"])
+
+
+def test_parse_and_expand() -> None:
+    sweep = parse_sweep(["region=eu,us", "--day=[1, 2]"])
+    assert sweep == {"region": ["eu", "us"], "day": ["1", "2"]}
+    assert list(expand_sweep(sweep, "zip")) == [{"region": "eu", "day": "1"}, {"region": "us", "day": "2"}]
+    assert len(list(expand_sweep(sweep, "product"))) == 4
+    with pytest.raises(ValueError):
+        parse_sweep(["region"])
+    with pytest.raises(ValueError):
+        list(expand_sweep({"a": [1], "b": [1, 2]}, "zip"))
+
+
+def test_run_sweep_product_report(config) -> None:
+    calls: List[tuple] = []
+    lock = threading.Lock()
+
+    def report(region: str, day: int, kind: str) -> str:
+        with lock:
+            calls.append((region, day, kind))
+        return f"{region}-{day}"
+
+    buf = io.StringIO()
+    failures = run_sweep(
+        ["report", "--kind", "weekly"], parse_sweep(["region=eu,us", "day=1,2,3"]), config, {"report": report}, buf, jobs=3
+    )
+    assert failures == 0
+    assert sorted(calls) == sorted((r, d, "weekly") for r in ("eu", "us") for d in (1, 2, 3))
+    entries = _lines(buf)
+    assert [e["index"] for e in entries] == list(range(6))
+    assert entries[0]["args"] == {"region": "eu", "day": 1}
+    assert entries[0]["status"] == "ok" and entries[0]["result"] == "eu-1"
+
+
+def test_sweep_values_validated_before_dispatch(config) -> None:
+    called = []
+    with pytest.raises(ValueError) as excinfo:
+        run_sweep(
+            ["report"], parse_sweep(["region=eu,mars", "day=1,40"]), config, {"report": lambda **kw: called.append(kw)}, io.StringIO()
+        )
+    assert "mars" in str(excinfo.value) and "40" in str(excinfo.value)
+    assert called == []
+
+    # An invalid first value or a name that is not an argument is reported too, not left to argparse
+    with pytest.raises(ValueError) as excinfo:
+        run_sweep(["report"], parse_sweep(["region=mars,eu", "zone=a"]), config, {"report": lambda **kw: None}, io.StringIO())
+    assert "mars" in str(excinfo.value) and "'zone' is not an argument" in str(excinfo.value)
+    with pytest.raises(ValueError, match="--sweep-jobs"):
+        run_sweep(["report"], parse_sweep(["region=eu"]), config, {"report": lambda **kw: None}, io.StringIO(), jobs=0)
+
+
+def test_sweep_errors_reported_and_concurrency_bounded(config) -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def report(region: str, day: int, kind: str) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        if day == 2:
+            raise RuntimeError("no data")
+
+    buf = io.StringIO()
+    failures = run_sweep(["report"], parse_sweep(["region=eu,us,ap", "day=1,2"]), config, {"report": report}, buf, jobs=2)
+    assert failures == 3
+    assert peak <= 2
+    errors = [e for e in _lines(buf) if e["status"] == "error"]
+    assert {e["args"]["day"] for e in errors} == {2}
+    assert errors[0]["error"] == "RuntimeError: no data"
+
+
+def test_generator_results_are_consumed(config) -> None:
+    def report(region: str, day: int, kind: str) -> Iterator[str]:
+        if region == "us":
+            raise LookupError(region)
+        yield from (region, kind)
+
+    buf = io.StringIO()
+    failures = run_sweep(["report"], parse_sweep(["region=eu,us"]), config, {"report": report}, buf)
+    assert failures == 1
+    entries = _lines(buf)
+    assert entries[0]["result"] == ["eu", "daily"]
+    assert entries[1]["status"] == "error"
+
+
+def test_main_sweep(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from dynamic_cli_builder.__main__ import main
+
+    (tmp_path / "actions.py").write_text("ACTIONS = {'echo': lambda word: word.upper()}\n", encoding="utf-8")
+    (tmp_path / "config.yaml").write_text(
+        "commands:\n  - {name: echo, description: e, args: [{name: word, type: str}], action: echo}\n",
+        encoding="utf-8",
+    )
+    report = tmp_path / "report.jsonl"
+    main([
+        "-c", str(tmp_path / "config.yaml"), "-a", str(tmp_path / "actions.py"),
+        "--sweep", "word=a,b", "--sweep-report", str(report), "echo",
+    ])
+    results = sorted(json.loads(line)["result"] for line in report.read_text(encoding="utf-8").splitlines())
+    assert results == ["A", "B"]
@@ -0,0 +1,140 @@
+"""Tests for the pre-warmed fork server (``--zygote``)."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from dynamic_cli_builder.zygote import request
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+
+CONFIG = """
+commands:
+  - name: show
+    description: d
+    args: [{name: tag, type: str, required: true}]
+    action: show
+  - name: fail
+    description: d
+    args: []
+    action: fail
+  - name: spam
+    description: d
+    args: []
+    action: spam
+"""
+
+ACTIONS = """
+import os
+
+CALLS = []
+
+def show(tag: str):
+    CALLS.append(tag)
+    print(VERSION, tag, len(CALLS), os.getcwd(), os.environ.get("ZYGOTE_TEST"), os.getppid())
+
+def fail():
+    raise ValueError("boom")
+
+def spam():
+    for i in range(100000):
+        print(i)
+
+ACTIONS = {"show": show, "fail": fail, "spam": spam}
+VERSION = "v1"
+"""
+
+
+def _serve(tmp_path: Path, *extra: str) -> Iterator[Tuple[str, subprocess.Popen]]:
+    (tmp_path / "config.yaml").write_text(CONFIG)
+    (tmp_path / "actions.py").write_text(ACTIONS)
+    socket_path = tmp_path / "zygote.sock"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "dynamic_cli_builder", "--zygote", f"unix:{socket_path}", *extra],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(Path(__file__).resolve().parents[1]), "PATH": "/usr/bin:/bin"},
+    )
+    deadline = time.monotonic() + 20
+    while not socket_path.exists():
+        assert server.poll() is None and time.monotonic() < deadline
+        time.sleep(0.02)
+    try:
+        yield f"unix:{socket_path}", server
+    finally:
+        server.terminate()
+        assert server.wait(timeout=10) == 0
+    assert not socket_path.exists()
+
+
+@pytest.fixture
+def preloaded(tmp_path: Path) -> Iterator[Tuple[str, subprocess.Popen]]:
+    yield from _serve(tmp_path, "--preload")
+
+
+@pytest.fixture
+def lazy(tmp_path: Path) -> Iterator[Tuple[str, subprocess.Popen]]:
+    yield from _serve(tmp_path)
+
+
+def _run(address: str, argv: List[str], tmp_path: Path) -> Tuple[int, str, str]:
+    out, err = tmp_path / "out.txt", tmp_path / "err.txt"
+    with open(out, "w") as stdout, open(err, "w") as stderr:
+        code = request(address, argv, (0, stdout.fileno(), stderr.fileno()))
+    return code, out.read_text(), err.read_text()
+
+
+def test_each_invocation_is_a_fresh_child(preloaded, tmp_path: Path, monkeypatch) -> None:
+    address, server = preloaded
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    monkeypatch.setenv("ZYGOTE_TEST", "from-client")
+    for tag in ("a", "b"):
+        code, out, _ = _run(address, ["show", "--tag", tag], tmp_path)
+        # Module state does not leak between invocations; cwd and env are the client's
+        assert code == 0 and out.split() == ["v1", tag, "1", str(work), "from-client", str(server.pid)]
+
+
+def test_exit_status_and_errors(preloaded, tmp_path: Path) -> None:
+    address, _ = preloaded
+    assert _run(address, ["fail"], tmp_path)[::2] == (1, "Error: boom\n")
+    code, _, err = _run(address, ["nope"], tmp_path)
+    assert code == 2 and "invalid choice: 'nope'" in err
+    code, out, _ = _run(address, ["show", "--help"], tmp_path)
+    assert code == 0 and "--tag TAG" in out
+
+
+def test_closed_pipe_exits_like_sigpipe(preloaded, tmp_path: Path) -> None:
+    address, _ = preloaded
+    read_end, write_end = os.pipe()
+    os.close(read_end)  # like `| head -1` after its first line
+    err = tmp_path / "err.txt"
+    try:
+        with open(err, "w") as stderr:
+            code = request(address, ["spam"], (0, write_end, stderr.fileno()))
+    finally:
+        os.close(write_end)
+    assert code == 141 and err.read_text() == ""
+
+
+def test_without_preload_children_import_current_actions(lazy, tmp_path: Path) -> None:
+    address, _ = lazy
+    assert _run(address, ["show", "--tag", "x"], tmp_path)[1].startswith("v1 x")
+    (tmp_path / "actions.py").write_text(ACTIONS.replace('"v1"', '"v2.0"'))
+    assert _run(address, ["show", "--tag", "x"], tmp_path)[1].startswith("v2.0 x")
+
+
+def test_client_command_line(preloaded, tmp_path: Path) -> None:
+    address, _ = preloaded
+    proc = subprocess.run(
+        [sys.executable, "-m", "dynamic_cli_builder.zygote", address, "show", "--tag", "cli"],
+        capture_output=True, text=True, timeout=30,
+        env={"PYTHONPATH": str(Path(__file__).resolve().parents[1]), "PATH": "/usr/bin:/bin"},
+    )
+    assert proc.returncode == 0 and proc.stdout.startswith("v1 cli 1")